@@ -0,0 +1,86 @@
+import copy
+import json
+import random
+import time
+from typing import Callable
+
+import typer
+
+from skyvern.webeye.scraper.scraper import build_economy_element_tree, build_trimmed_element_trees, trim_element_tree
+
+TAG_NAMES = ["div", "span", "a", "input", "button", "svg", "path", "label"]
+
+
+def generate_element(depth: int, max_children: int) -> dict:
+    element = {
+        "id": "".join(random.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=4)),
+        "frame": "main.frame",
+        "frame_index": 0,
+        "interactable": random.random() < 0.3,
+        "tagName": random.choice(TAG_NAMES),
+        "attributes": {
+            "class": "form-control col-md-6",
+            "name": "field",
+            "href": "data:image/png;base64,iVBORw0KGgo=" if random.random() < 0.1 else "https://example.com",
+            "data-testid": "element",
+        },
+        "beforePseudoText": "",
+        "text": random.choice(["", "Submit", "First name", "Please fill in this field"]),
+        "afterPseudoText": "",
+        "children": [],
+        "rect": {"x": 0, "y": 0, "width": 100, "height": 20},
+        "purgeable": False,
+        "keepAllAttr": False,
+    }
+    if depth > 0:
+        element["children"] = [
+            generate_element(depth - 1, max_children) for _ in range(random.randint(0, max_children))
+        ]
+    return element
+
+
+def count_elements(element_tree: list[dict]) -> int:
+    return sum(1 + count_elements(element.get("children", [])) for element in element_tree)
+
+
+def legacy_processing(element_tree: list[dict]) -> None:
+    # the deep copies used before the single-pass processing
+    element_tree_trimmed = trim_element_tree(copy.deepcopy(element_tree))
+    build_economy_element_tree(copy.deepcopy(element_tree_trimmed))
+
+
+def single_pass_processing(element_tree: list[dict]) -> None:
+    build_trimmed_element_trees(element_tree)
+
+
+def benchmark(func: Callable[[list[dict]], None], element_tree: list[dict], rounds: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        func(element_tree)
+    return (time.perf_counter() - start_time) / rounds
+
+
+def main(
+    fixture: str = typer.Option(
+        None, help="Path to a recorded element tree JSON, e.g. a downloaded visible_elements_tree artifact"
+    ),
+    rounds: int = typer.Option(10, help="Number of rounds for each processing"),
+    seed: int = typer.Option(0, help="Random seed for the generated element tree"),
+) -> None:
+    if fixture:
+        with open(fixture, "r") as f:
+            element_tree = json.load(f)
+    else:
+        random.seed(seed)
+        element_tree = [generate_element(depth=6, max_children=4) for _ in range(20)]
+
+    print(f"Number of elements: {count_elements(element_tree)}")
+    legacy_duration = benchmark(legacy_processing, element_tree, rounds)
+    single_pass_duration = benchmark(single_pass_processing, element_tree, rounds)
+    print(f"Deep copy + trim + economy: {legacy_duration * 1000:.2f} ms")
+    print(f"Single pass:                {single_pass_duration * 1000:.2f} ms")
+    print(f"Speedup: {legacy_duration / single_pass_duration:.2f}x")
+
+
+if __name__ == "__main__":
+    typer.run(main)
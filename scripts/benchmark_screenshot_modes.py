@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import typer
+from playwright.async_api import Page, async_playwright
+
+from skyvern.config import settings
+from skyvern.webeye.utils.page import ScreenshotMode, SkyvernFrame
+
+LONG_PAGE_SECTION = """
+<section style="height: 600px; border-bottom: 1px solid #ccc">
+  <h2>Section {index}</h2>
+  <input name="field-{index}" placeholder="Field {index}" />
+  <button>Submit {index}</button>
+  <a href="#section-{index}">Link {index}</a>
+</section>
+"""
+
+
+async def benchmark(page: Page, url: str, mode: ScreenshotMode, draw_boxes: bool, rounds: int) -> tuple[float, int]:
+    num_screenshots = 0
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        screenshots = await SkyvernFrame.take_split_screenshots(page=page, url=url, draw_boxes=draw_boxes, mode=mode)
+        num_screenshots = len(screenshots)
+    return (time.perf_counter() - start_time) / rounds, num_screenshots
+
+
+async def run(url: str | None, sections: int, draw_boxes: bool, rounds: int) -> None:
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch()
+        page = await browser.new_page(viewport={"width": settings.BROWSER_WIDTH, "height": settings.BROWSER_HEIGHT})
+        if url:
+            await page.goto(url)
+        else:
+            url = "about:blank"
+            await page.set_content("".join(LONG_PAGE_SECTION.format(index=index) for index in range(sections)))
+
+        for mode in ScreenshotMode:
+            duration, num_screenshots = await benchmark(page, url, mode, draw_boxes, rounds)
+            print(f"{mode}: {duration * 1000:.0f} ms, {num_screenshots} screenshots")
+        await browser.close()
+
+
+def main(
+    url: str = typer.Option(None, help="The page to benchmark, a generated long page is used if not provided"),
+    sections: int = typer.Option(30, help="Number of sections in the generated long page"),
+    draw_boxes: bool = typer.Option(True, help="Draw the bounding boxes like the scraper does"),
+    rounds: int = typer.Option(3, help="Number of rounds for each mode"),
+) -> None:
+    asyncio.run(run(url, sections, draw_boxes, rounds))
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,27 @@
+import asyncio
+import json
+
+import typer
+
+from skyvern.forge.app import SHAPE_STORE
+
+SEED_BATCH_SIZE = 500
+
+
+async def seed_shape_store(seed_file: str) -> None:
+    # {"skyvern:svg:<hash>": "<shape description>", "skyvern:shape:<hash>": "<shape description>", ...}
+    with open(seed_file) as f:
+        shapes: dict[str, str] = json.load(f)
+
+    items = list(shapes.items())
+    for start in range(0, len(items), SEED_BATCH_SIZE):
+        await SHAPE_STORE.set_many(dict(items[start : start + SEED_BATCH_SIZE]))
+    print(f"Seeded {len(items)} shapes into {type(SHAPE_STORE).__name__}")
+
+
+def main(seed_file: str) -> None:
+    asyncio.run(seed_shape_store(seed_file))
+
+
+if __name__ == "__main__":
+    typer.run(main)
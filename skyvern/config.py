@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from skyvern import constants
@@ -25,6 +27,36 @@ class Settings(BaseSettings):
     MAX_STEPS_PER_TASK_V2: int = 25
     MAX_ITERATIONS_PER_TASK_V2: int = 10
     MAX_NUM_SCREENSHOTS: int = 10
+    # full_page_tiled takes one full page screenshot and slices it, instead of scrolling and capturing page by page
+    SCREENSHOT_MODE: Literal["scrolling", "full_page_tiled"] = "scrolling"
+    # Scrape the page for the next step in the background while the current step is wrapping up (e.g. the user goal check).
+    # The page capture after the last action of a step is then taken from that scrape, so its screenshot has the element boxes
+    ENABLE_SPECULATIVE_SCRAPE: bool = False
+    # Take a viewport screenshot and skip the html dump after an action if the DOM and the url didn't change since the last capture
+    ENABLE_AFTER_ACTION_CHANGE_DETECTION: bool = False
+    # Fill the consecutive input actions on plain text fields with one script and verify them at once,
+    # instead of typing into them one by one with the dropdown and auto-completion detection
+    ENABLE_BATCH_INPUT_ACTIONS: bool = False
+    # Upload the task recording every N seconds in the background instead of after every action, e.g. 30.
+    # 0 uploads it after every action
+    VIDEO_ARTIFACT_SYNC_INTERVAL_SECONDS: int = 0
+    # Reuse the unchanged DOM subtrees from the previous scrape of the same page instead of re-walking them
+    ENABLE_DIFF_SCRAPING: bool = False
+    # Wait until the page is quiet (network, DOM mutations, animations) before scraping instead of a fixed delay
+    ENABLE_PAGE_SETTLE_DETECTION: bool = False
+    PAGE_SETTLE_QUIET_MS: int = 500
+    PAGE_SETTLE_MAX_WAIT_MS: int = 3000
+    # Skip re-injecting domUtils.js into the documents where the same version has already been injected
+    ENABLE_JS_INJECTION_CACHE: bool = True
+    MAX_CONCURRENT_FRAME_SCRAPES: int = 5
+    # Reuse pre-launched chromium contexts (per proxy location) instead of launching a browser for every run
+    ENABLE_BROWSER_POOL: bool = False
+    BROWSER_POOL_MIN_IDLE_CONTEXTS: int = 1
+    BROWSER_POOL_MAX_IDLE_CONTEXTS: int = 4
+    BROWSER_POOL_MAX_USES_PER_CONTEXT: int = 20
+    # Only used by the chromium-headless-shared browser type
+    SHARED_BROWSER_MAX_PROCESSES: int = 2
+    SHARED_BROWSER_MAX_CONTEXTS_PER_PROCESS: int = 20
     # Ratio should be between 0 and 1.
     # If the task has been running for more steps than this ratio of the max steps per run, then we'll log a warning.
     LONG_RUNNING_TASK_WARNING_RATIO: float = 0.95
@@ -61,10 +93,34 @@ class Settings(BaseSettings):
     AWS_S3_BUCKET_ARTIFACTS: str = "skyvern-artifacts"
     AWS_S3_BUCKET_SCREENSHOTS: str = "skyvern-screenshots"
     AWS_S3_BUCKET_BROWSER_SESSIONS: str = "skyvern-browser-sessions"
+    # Queue the artifact rows and insert them in batches instead of one insert per artifact
+    ENABLE_ARTIFACT_BATCHING: bool = False
+    ARTIFACT_BATCH_SIZE: int = 50
+    ARTIFACT_BATCH_FLUSH_INTERVAL_MS: int = 500
+    # Flush inline when the queue is full, so a slow database slows down the producers instead of growing the queue
+    ARTIFACT_QUEUE_MAX_SIZE: int = 500
+    # The artifact types skipped at each capture level are never serialized, see ArtifactCaptureLevel
+    ARTIFACT_CAPTURE_LEVEL: Literal["minimal", "debug", "full"] = "full"
+    # organization_id -> capture level, overrides ARTIFACT_CAPTURE_LEVEL
+    ARTIFACT_CAPTURE_LEVEL_BY_ORGANIZATION: dict[str, Literal["minimal", "debug", "full"]] = {}
+    # Compress the JSON artifacts with zstd, requires the compression extra (the zstandard package).
+    # The presigned urls serve the compressed bytes as is, only turn it on if the artifacts are read through the API
+    ENABLE_ARTIFACT_COMPRESSION: bool = False
 
     # Supported storage types: local, s3
     SKYVERN_STORAGE_TYPE: str = "local"
 
+    # Supported cache types: local, redis. redis works with any server speaking the redis protocol
+    CACHE_TYPE: str = "local"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "skyvern"
+    # the cached values at least this large are compressed with zlib, 0 disables the compression
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024
+    # keep the hot keys in an in-process LRU in front of redis for a short ttl
+    CACHE_ENABLE_LOCAL_TIER: bool = False
+    CACHE_LOCAL_TIER_MAX_ITEMS: int = 1000
+    CACHE_LOCAL_TIER_TTL_SECONDS: int = 60
+
     # S3 bucket settings
     AWS_REGION: str = "us-east-1"
     AWS_S3_BUCKET_UPLOADS: str = "skyvern-uploads"
@@ -87,6 +143,24 @@ class Settings(BaseSettings):
     # Workflow constant parameters
     WORKFLOW_DOWNLOAD_DIRECTORY_PARAMETER_KEY: str = "SKYVERN_DOWNLOAD_DIRECTORY"
     WORKFLOW_WAIT_BLOCK_MAX_SEC: int = 30 * 60
+    # run the root blocks of a workflow as a dependency graph, the blocks not depending on each other and not using the browser run at the same time
+    ENABLE_WORKFLOW_DAG_SCHEDULER: bool = False
+    # how often a running workflow run checks the database for the cancellation or the timeout set by another process.
+    # the ones set by the same process are signaled right away. 0 checks before every block, e.g. 30 checks less often
+    WORKFLOW_RUN_STATUS_POLL_INTERVAL_SECONDS: int = 0
+    # the number of rows in each artifact stored by a streaming file parser block
+    FILE_PARSER_CHUNK_SIZE: int = 1000
+    # the pdf pages are extracted in ranges of this many pages by a process pool
+    PDF_TEXT_EXTRACTION_PAGES_PER_WORKER: int = 20
+    PDF_TEXT_EXTRACTION_MAX_WORKERS: int = 4
+    # the pdf text longer than this is extracted per chunk of pages concurrently, and the results are merged by the llm
+    PDF_PARSER_CHUNK_MAX_TOKENS: int = 50000
+    PDF_PARSER_MAX_CONCURRENT_LLM_CALLS: int = 4
+    # keep the blocks and the actions of the requested workflow run timelines in memory, and only fetch the changed ones
+    # when the timeline is requested again
+    ENABLE_WORKFLOW_RUN_TIMELINE_CACHE: bool = False
+    WORKFLOW_RUN_TIMELINE_CACHE_SIZE: int = 1000
+    WORKFLOW_RUN_TIMELINE_CACHE_TTL_SECONDS: int = 10 * 60
 
     # Saved browser session settings
     BROWSER_SESSION_BASE_PATH: str = f"{constants.REPO_ROOT_DIR}/browser_sessions"
@@ -116,6 +190,27 @@ class Settings(BaseSettings):
     LLM_CONFIG_TEMPERATURE: float = 0
     LLM_CONFIG_SUPPORT_VISION: bool = True  # Whether the model supports vision
     LLM_CONFIG_ADD_ASSISTANT_PREFIX: bool = False  # Whether to add assistant prefix
+    # How the screenshots are encoded before sending them to the LLM, overridden by the screenshot_encoding of the LLM config
+    # Supported formats: png, jpeg, webp. The quality is only used by jpeg and webp
+    LLM_SCREENSHOT_FORMAT: str = "png"
+    LLM_SCREENSHOT_QUALITY: int = 85
+    LLM_SCREENSHOT_MAX_DIMENSION: int | None = None
+    # Drop the near-identical screenshots within this perceptual hash distance (0-64), None disables the dedup
+    LLM_SCREENSHOT_DEDUP_THRESHOLD: int | None = None
+    LLM_SCREENSHOT_ENCODING_MAX_WORKERS: int = 4
+    # Cache the parsed responses of the prompts below, keyed by the model, the prompt, the screenshots and the parameters.
+    # The cache backend is the one set by CacheFactory
+    ENABLE_LLM_RESPONSE_CACHE: bool = False
+    LLM_RESPONSE_CACHE_PROMPT_NAMES: list[str] = [
+        "check-phone-number-format",
+        "parse-input-or-select-context",
+        "custom-select",
+        "svg-convert",
+        "css-shape-convert",
+        "extract-information-from-file-text",
+        "merge-information-extracted-from-file-text",
+    ]
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 24 * 60 * 60
     # LLM PROVIDER SPECIFIC
     ENABLE_OPENAI: bool = False
     ENABLE_ANTHROPIC: bool = False
@@ -253,6 +348,9 @@ class Settings(BaseSettings):
     BITWARDEN_SERVER_PORT: int = 8002
 
     SVG_MAX_LENGTH: int = 100000
+    # Where the SVG and CSS shape descriptions are stored. Supported types: cache, database
+    # database keeps them in the shape_descriptions table, so they survive deploys and are shared by all the workers
+    SHAPE_STORE_TYPE: str = "cache"
 
     ENABLE_LOG_ARTIFACTS: bool = False
     ENABLE_CODE_BLOCK: bool = False
@@ -5,9 +5,10 @@ import os
 import random
 import string
 from asyncio.exceptions import CancelledError
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Tuple, cast
+from typing import Any, Awaitable, Callable, Tuple, cast
 
 import httpx
 import structlog
@@ -82,11 +83,17 @@ from skyvern.webeye.actions.actions import (
     CompleteVerifyResult,
     DecisiveAction,
     ExtractAction,
+    InputTextAction,
     ReloadPageAction,
     TerminateAction,
     UserDefinedError,
     WebAction,
 )
+from skyvern.webeye.actions.batch_input import (
+    fill_input_text_actions_in_batch,
+    find_input_action_batches,
+    handle_batch_filled_input_action,
+)
 from skyvern.webeye.actions.caching import retrieve_action_plan
 from skyvern.webeye.actions.handler import ActionHandler, poll_verification_code
 from skyvern.webeye.actions.models import AgentStepOutput, DetailedAgentStepOutput
@@ -105,6 +112,19 @@ class ActionLinkedNode:
         self.next: ActionLinkedNode | None = None
 
 
+@dataclass
+class SpeculativeScrape:
+    aiotask: asyncio.Task[ScrapedPage]
+    # the step whose last action triggered the scrape
+    step: Step
+    browser_state: BrowserState
+    engine: RunEngine
+    page: Page
+    url: str
+    # record the page capture after the last action of the step from the scraped page
+    record_after_action_artifacts: bool
+
+
 class ForgeAgent:
     def __init__(self) -> None:
         if settings.ADDITIONAL_MODULES:
@@ -116,6 +136,10 @@ class ForgeAgent:
                 modules=settings.ADDITIONAL_MODULES,
             )
         self.async_operation_pool = AsyncOperationPool()
+        # task_id -> the scrape for the next step, started when the previous step is wrapping up
+        self.speculative_scrapes: dict[str, SpeculativeScrape] = {}
+        # task_id -> the background task uploading the recording of the task
+        self.video_artifact_flushers: dict[str, asyncio.Task[None]] = {}
 
     async def create_task_and_step_from_block(
         self,
@@ -253,6 +277,39 @@ class ForgeAgent:
         engine: RunEngine = RunEngine.skyvern_v1,
         cua_response: OpenAIResponse | None = None,
         llm_caller: LLMCaller | None = None,
+    ) -> Tuple[Step, DetailedAgentStepOutput | None, Step | None]:
+        try:
+            return await self._execute_step(
+                organization,
+                task,
+                step,
+                api_key=api_key,
+                close_browser_on_completion=close_browser_on_completion,
+                task_block=task_block,
+                browser_session_id=browser_session_id,
+                complete_verification=complete_verification,
+                engine=engine,
+                cua_response=cua_response,
+                llm_caller=llm_caller,
+            )
+        finally:
+            # clean_up_task is skipped on some paths, e.g. a canceled run or a step run without the continuous
+            # execution. The next step starts the flusher again
+            await self.stop_video_artifact_flusher(task)
+
+    async def _execute_step(
+        self,
+        organization: Organization,
+        task: Task,
+        step: Step,
+        api_key: str | None = None,
+        close_browser_on_completion: bool = True,
+        task_block: BaseTaskBlock | None = None,
+        browser_session_id: str | None = None,
+        complete_verification: bool = True,
+        engine: RunEngine = RunEngine.skyvern_v1,
+        cua_response: OpenAIResponse | None = None,
+        llm_caller: LLMCaller | None = None,
     ) -> Tuple[Step, DetailedAgentStepOutput | None, Step | None]:
         workflow_run: WorkflowRun | None = None
         if task.workflow_run_id:
@@ -949,6 +1006,35 @@ class ForgeAgent:
 
                 element_id_to_action_index[action.element_id] = action_idx
 
+            # scrape the page for the next step in the background once the actions are done, unless the task is ending
+            speculative_scrape_enabled = (
+                settings.ENABLE_SPECULATIVE_SCRAPE
+                and engine not in CUA_ENGINES
+                and not any(isinstance(action, (DecisiveAction, ExtractAction)) for action in actions)
+            )
+            page_capture_deferred = False
+            speculative_scrape_started = False
+
+            async def start_speculative_scrape() -> None:
+                nonlocal speculative_scrape_started
+                if speculative_scrape_started:
+                    return
+                speculative_scrape_started = True
+                await self.start_speculative_scrape(
+                    task,
+                    step,
+                    browser_state,
+                    engine,
+                    record_after_action_artifacts=page_capture_deferred,
+                )
+
+            # the runs of input actions on plain text fields are filled at once when the run starts
+            input_action_batches: dict[int, int] = {}
+            if settings.ENABLE_BATCH_INPUT_ACTIONS and engine not in CUA_ENGINES:
+                input_action_batches = find_input_action_batches(actions, scraped_page)
+            # action index -> whether the batch fill verified the input, for the actions of the current batch
+            batch_verified: dict[int, bool] = {}
+
             element_id_to_last_action: dict[str, int] = dict()
             for action_idx, action_node in enumerate(action_linked_list):
                 context = skyvern_context.ensure_context()
@@ -1015,21 +1101,49 @@ class ForgeAgent:
 
                     element_id_to_last_action[action.element_id] = action_idx
 
-                if engine != RunEngine.openai_cua:
+                if engine != RunEngine.openai_cua and action_idx not in batch_verified:
                     self.async_operation_pool.run_operation(task.task_id, AgentPhase.action)
                 current_page = await browser_state.must_get_working_page()
                 if isinstance(action, CompleteAction) and not complete_verification:
                     # Do not verify the complete action when complete_verification is False
                     # set verified to True will skip the completion verification
                     action.verified = True
-                results = await ActionHandler.handle_action(scraped_page, task, step, current_page, action)
+                if action_idx in input_action_batches:
+                    batch_actions = [
+                        node.action
+                        for node in action_linked_list[action_idx : input_action_batches[action_idx]]
+                        if isinstance(node.action, InputTextAction)
+                    ]
+                    verified = await fill_input_text_actions_in_batch(
+                        batch_actions, current_page, scraped_page, task, step
+                    )
+                    batch_verified.update(enumerate(verified, start=action_idx))
+
+                if batch_verified.pop(action_idx, False):
+                    results = await ActionHandler.handle_action(
+                        scraped_page, task, step, current_page, action, handler=handle_batch_filled_input_action
+                    )
+                else:
+                    # the inputs the batch fill couldn't verify are typed one by one, in order
+                    results = await ActionHandler.handle_action(scraped_page, task, step, current_page, action)
                 detailed_agent_step_output.actions_and_results[action_idx] = (
                     action,
                     results,
                 )
-                # wait random time between actions to avoid detection
-                await asyncio.sleep(random.uniform(0.5, 1.0))
-                await self.record_artifacts_after_action(task, step, browser_state, engine)
+                # the batched actions are done at once, only wait and capture the page after the whole batch
+                if not batch_verified:
+                    # wait random time between actions to avoid detection
+                    await asyncio.sleep(random.uniform(0.5, 1.0))
+                    # the page capture after the last action is taken from the speculative scrape of the next step
+                    page_capture_deferred = (
+                        speculative_scrape_enabled
+                        and action_idx == len(action_linked_list) - 1
+                        and bool(results)
+                        and results[-1].success
+                    )
+                    await self.record_artifacts_after_action(
+                        task, step, browser_state, engine, capture_page=not page_capture_deferred
+                    )
                 for result in results:
                     result.step_retry_number = step.retry_index
                     result.step_order = step.order
@@ -1152,9 +1266,13 @@ class ForgeAgent:
                         scraped_page=scraped_page,
                         task=task,
                         step=step,
+                        # overlap the next scrape with the LLM call of the check
+                        on_page_refreshed=start_speculative_scrape if speculative_scrape_enabled else None,
                     )
                     if complete_action is not None:
                         LOG.info("User goal achieved, executing complete action")
+                        # the task is ending, make sure the page isn't being scraped while completing it
+                        await self.finish_speculative_scrape(task)
                         complete_action.organization_id = task.organization_id
                         complete_action.workflow_run_id = task.workflow_run_id
                         complete_action.task_id = task.task_id
@@ -1167,6 +1285,11 @@ class ForgeAgent:
                         detailed_agent_step_output.actions_and_results.append((complete_action, complete_results))
                         await self.record_artifacts_after_action(task, step, browser_state, engine)
 
+            if speculative_scrape_enabled and not self.step_has_completed_goal(detailed_agent_step_output):
+                await start_speculative_scrape()
+            elif page_capture_deferred and not speculative_scrape_started:
+                await self.record_artifacts_after_action(task, step, browser_state, engine)
+
             # if the last action is complete and is successful, check if there's a data extraction goal
             # if task has navigation goal and extraction goal at the same time, handle ExtractAction before marking step as completed
             if (
@@ -1463,7 +1586,13 @@ class ForgeAgent:
         return actions
 
     @staticmethod
-    async def complete_verify(page: Page, scraped_page: ScrapedPage, task: Task, step: Step) -> CompleteVerifyResult:
+    async def complete_verify(
+        page: Page,
+        scraped_page: ScrapedPage,
+        task: Task,
+        step: Step,
+        on_page_refreshed: Callable[[], Awaitable[None]] | None = None,
+    ) -> CompleteVerifyResult:
         LOG.info(
             "Checking if user goal is achieved after re-scraping the page",
             task_id=task.task_id,
@@ -1476,6 +1605,8 @@ class ForgeAgent:
             scroll = False
 
         scraped_page_refreshed = await scraped_page.refresh(draw_boxes=False, scroll=scroll)
+        if on_page_refreshed:
+            await on_page_refreshed()
 
         verification_prompt = load_prompt_with_elements(
             scraped_page=scraped_page_refreshed,
@@ -1498,7 +1629,11 @@ class ForgeAgent:
 
     @staticmethod
     async def check_user_goal_complete(
-        page: Page, scraped_page: ScrapedPage, task: Task, step: Step
+        page: Page,
+        scraped_page: ScrapedPage,
+        task: Task,
+        step: Step,
+        on_page_refreshed: Callable[[], Awaitable[None]] | None = None,
     ) -> CompleteAction | None:
         try:
             verification_result = await app.agent.complete_verify(
@@ -1506,6 +1641,7 @@ class ForgeAgent:
                 scraped_page=scraped_page,
                 task=task,
                 step=step,
+                on_page_refreshed=on_page_refreshed,
             )
 
             # We don't want to return a complete action if the user goal is not achieved since we're checking at every step
@@ -1533,6 +1669,7 @@ class ForgeAgent:
         step: Step,
         browser_state: BrowserState,
         engine: RunEngine,
+        capture_page: bool = True,
     ) -> None:
         working_page = await browser_state.get_working_page()
         if not working_page:
@@ -1542,13 +1679,35 @@ class ForgeAgent:
         if engine in CUA_ENGINES:
             fullpage_screenshot = False
 
+        page_changed = True
+        if capture_page and settings.ENABLE_AFTER_ACTION_CHANGE_DETECTION:
+            try:
+                skyvern_frame = await SkyvernFrame.create_instance(frame=working_page)
+                page_changed = await skyvern_frame.is_page_changed_since_last_capture()
+            except Exception:
+                LOG.warning(
+                    "Failed to detect page changes after action, capturing the page",
+                    task_id=task.task_id,
+                    step_id=step.step_id,
+                    exc_info=True,
+                )
+            if not page_changed:
+                LOG.debug(
+                    "The page didn't change since the last capture, taking a viewport screenshot only",
+                    task_id=task.task_id,
+                    step_id=step.step_id,
+                )
+
         try:
-            screenshot = await browser_state.take_screenshot(full_page=fullpage_screenshot)
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.SCREENSHOT_ACTION,
-                data=screenshot,
-            )
+            if capture_page and app.ARTIFACT_MANAGER.should_capture(
+                ArtifactType.SCREENSHOT_ACTION, task.organization_id
+            ):
+                screenshot = await browser_state.take_screenshot(full_page=fullpage_screenshot and page_changed)
+                await app.ARTIFACT_MANAGER.create_artifact(
+                    step=step,
+                    artifact_type=ArtifactType.SCREENSHOT_ACTION,
+                    data=screenshot,
+                )
         except Exception:
             LOG.error(
                 "Failed to record screenshot after action",
@@ -1558,13 +1717,18 @@ class ForgeAgent:
             )
 
         try:
-            skyvern_frame = await SkyvernFrame.create_instance(frame=working_page)
-            html = await skyvern_frame.get_content()
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.HTML_ACTION,
-                data=html.encode(),
-            )
+            if (
+                capture_page
+                and page_changed
+                and app.ARTIFACT_MANAGER.should_capture(ArtifactType.HTML_ACTION, task.organization_id)
+            ):
+                skyvern_frame = await SkyvernFrame.create_instance(frame=working_page)
+                html = await skyvern_frame.get_content()
+                await app.ARTIFACT_MANAGER.create_artifact(
+                    step=step,
+                    artifact_type=ArtifactType.HTML_ACTION,
+                    data=html.encode(),
+                )
         except Exception:
             LOG.error(
                 "Failed to record html after action",
@@ -1573,16 +1737,11 @@ class ForgeAgent:
                 exc_info=True,
             )
 
+        # the recording is uploaded by the video artifact flusher unless it's disabled
+        if settings.VIDEO_ARTIFACT_SYNC_INTERVAL_SECONDS > 0:
+            return
         try:
-            video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
-                task_id=task.task_id, browser_state=browser_state
-            )
-            for video_artifact in video_artifacts:
-                await app.ARTIFACT_MANAGER.update_artifact_data(
-                    artifact_id=video_artifact.video_artifact_id,
-                    organization_id=task.organization_id,
-                    data=video_artifact.video_data,
-                )
+            await self.sync_video_artifacts(task, browser_state)
         except Exception:
             LOG.error(
                 "Failed to record video after action",
@@ -1591,6 +1750,141 @@ class ForgeAgent:
                 exc_info=True,
             )
 
+    async def sync_video_artifacts(self, task: Task, browser_state: BrowserState) -> None:
+        video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
+            task_id=task.task_id, browser_state=browser_state
+        )
+        for video_artifact in video_artifacts:
+            await app.ARTIFACT_MANAGER.update_artifact_data(
+                artifact_id=video_artifact.video_artifact_id,
+                organization_id=task.organization_id,
+                data=video_artifact.video_data,
+            )
+
+    def start_video_artifact_flusher(self, task: Task, browser_state: BrowserState) -> None:
+        """
+        Upload the task recording every VIDEO_ARTIFACT_SYNC_INTERVAL_SECONDS in the background until the task is
+        cleaned up, so the recording in progress can be watched without re-uploading it after every action.
+        """
+        interval = settings.VIDEO_ARTIFACT_SYNC_INTERVAL_SECONDS
+        if interval <= 0 or task.task_id in self.video_artifact_flushers:
+            return
+
+        async def flush_periodically() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.sync_video_artifacts(task, browser_state)
+                except Exception:
+                    LOG.warning("Failed to sync the video artifacts", task_id=task.task_id, exc_info=True)
+
+        self.video_artifact_flushers[task.task_id] = asyncio.create_task(flush_periodically())
+
+    async def stop_video_artifact_flusher(self, task: Task) -> None:
+        flusher = self.video_artifact_flushers.pop(task.task_id, None)
+        if flusher is None:
+            return
+        flusher.cancel()
+        try:
+            await flusher
+        except asyncio.CancelledError:
+            pass
+
+    async def start_speculative_scrape(
+        self,
+        task: Task,
+        step: Step,
+        browser_state: BrowserState,
+        engine: RunEngine,
+        record_after_action_artifacts: bool = False,
+    ) -> None:
+        """
+        Start scraping the page for the next step in the background while the current step is wrapping up.
+        The svg and css shape conversions of the scrape are attributed to the current step.
+        """
+        working_page = await browser_state.get_working_page()
+        if not working_page:
+            if record_after_action_artifacts:
+                await self.record_artifacts_after_action(task, step, browser_state, engine)
+            return
+
+        await self.finish_speculative_scrape(task)
+        LOG.info("Starting speculative scrape for the next step", task_id=task.task_id, step_id=step.step_id)
+        self.speculative_scrapes[task.task_id] = SpeculativeScrape(
+            aiotask=asyncio.create_task(
+                self._scrape_with_type(
+                    task=task,
+                    step=step,
+                    browser_state=browser_state,
+                    scrape_type=ScrapeType.NORMAL,
+                    engine=engine,
+                )
+            ),
+            step=step,
+            browser_state=browser_state,
+            engine=engine,
+            page=working_page,
+            url=working_page.url,
+            record_after_action_artifacts=record_after_action_artifacts,
+        )
+
+    async def finish_speculative_scrape(self, task: Task) -> ScrapedPage | None:
+        """
+        Wait for the speculative scrape of the task, and record the deferred page capture of the step that started it.
+        Returns the scraped page if the working page hasn't changed since the scrape started.
+        """
+        speculative_scrape = self.speculative_scrapes.pop(task.task_id, None)
+        if speculative_scrape is None:
+            return None
+
+        scraped_page: ScrapedPage | None = None
+        if not speculative_scrape.aiotask.cancelled():
+            try:
+                scraped_page = await speculative_scrape.aiotask
+            except Exception:
+                LOG.warning(
+                    "Speculative scrape failed, going to scrape again",
+                    task_id=task.task_id,
+                    step_id=speculative_scrape.step.step_id,
+                    exc_info=True,
+                )
+
+        step = speculative_scrape.step
+        if speculative_scrape.record_after_action_artifacts:
+            if scraped_page is None:
+                await self.record_artifacts_after_action(
+                    task, step, speculative_scrape.browser_state, speculative_scrape.engine
+                )
+            else:
+                if scraped_page.screenshots and app.ARTIFACT_MANAGER.should_capture(
+                    ArtifactType.SCREENSHOT_ACTION, task.organization_id
+                ):
+                    await app.ARTIFACT_MANAGER.create_artifact(
+                        step=step,
+                        artifact_type=ArtifactType.SCREENSHOT_ACTION,
+                        data=scraped_page.screenshots[0],
+                    )
+                if app.ARTIFACT_MANAGER.should_capture(ArtifactType.HTML_ACTION, task.organization_id):
+                    await app.ARTIFACT_MANAGER.create_artifact(
+                        step=step,
+                        artifact_type=ArtifactType.HTML_ACTION,
+                        data=scraped_page.html.encode(),
+                    )
+
+        if scraped_page is None:
+            return None
+        working_page = await speculative_scrape.browser_state.get_working_page()
+        if working_page is not speculative_scrape.page or working_page.url != speculative_scrape.url:
+            LOG.info(
+                "The page changed after the speculative scrape, going to scrape again",
+                task_id=task.task_id,
+                step_id=step.step_id,
+                scraped_url=speculative_scrape.url,
+                current_url=working_page.url if working_page else None,
+            )
+            return None
+        return scraped_page
+
     async def initialize_execution_state(
         self,
         task: Task,
@@ -1624,6 +1918,7 @@ class ForgeAgent:
                 )
                 video_artifacts[idx].video_artifact_id = video_artifact_id
             app.BROWSER_MANAGER.set_video_artifact_for_task(task, video_artifacts)
+            self.start_video_artifact_flusher(task, browser_state)
 
         detailed_output = DetailedAgentStepOutput(
             scraped_page=None,
@@ -1695,36 +1990,40 @@ class ForgeAgent:
         # first time: normal scrape to take screenshot
         # second time: try again the normal scrape, (stopping window loading before scraping barely helps, but causing problem)
         # third time: reload the page before scraping
-        scraped_page: ScrapedPage | None = None
-        for idx, scrape_type in enumerate(SCRAPE_TYPE_ORDER):
-            try:
-                scraped_page = await self._scrape_with_type(
-                    task=task,
-                    step=step,
-                    browser_state=browser_state,
-                    scrape_type=scrape_type,
-                    engine=engine,
-                )
-                break
-            except (FailedToTakeScreenshot, ScrapingFailed) as e:
-                if idx < len(SCRAPE_TYPE_ORDER) - 1:
-                    continue
-                LOG.error(
-                    f"{e.__class__.__name__} happened in two normal attempts and reload-page retry",
-                    task_id=task.task_id,
-                    step_id=step.step_id,
-                    exc_info=True,
-                )
-                raise ScrapingFailed()
+        scraped_page: ScrapedPage | None = await self.finish_speculative_scrape(task)
+        if scraped_page is not None:
+            LOG.info("Using the speculative scrape", task_id=task.task_id, step_id=step.step_id)
+        else:
+            for idx, scrape_type in enumerate(SCRAPE_TYPE_ORDER):
+                try:
+                    scraped_page = await self._scrape_with_type(
+                        task=task,
+                        step=step,
+                        browser_state=browser_state,
+                        scrape_type=scrape_type,
+                        engine=engine,
+                    )
+                    break
+                except (FailedToTakeScreenshot, ScrapingFailed) as e:
+                    if idx < len(SCRAPE_TYPE_ORDER) - 1:
+                        continue
+                    LOG.error(
+                        f"{e.__class__.__name__} happened in two normal attempts and reload-page retry",
+                        task_id=task.task_id,
+                        step_id=step.step_id,
+                        exc_info=True,
+                    )
+                    raise ScrapingFailed()
 
         if scraped_page is None:
             raise EmptyScrapePage()
 
-        await app.ARTIFACT_MANAGER.create_artifact(
-            step=step,
-            artifact_type=ArtifactType.HTML_SCRAPE,
-            data=scraped_page.html.encode(),
-        )
+        if app.ARTIFACT_MANAGER.should_capture(ArtifactType.HTML_SCRAPE, task.organization_id):
+            await app.ARTIFACT_MANAGER.create_artifact(
+                step=step,
+                artifact_type=ArtifactType.HTML_SCRAPE,
+                data=scraped_page.html.encode(),
+            )
         LOG.info(
             "Scraped website",
             task_id=task.task_id,
@@ -1734,9 +2033,6 @@ class ForgeAgent:
             num_elements=len(scraped_page.elements),
             url=task.url,
         )
-        # TODO: we only use HTML element for now, introduce a way to switch in the future
-        element_tree_format = ElementTreeFormat.HTML
-        element_tree_in_prompt: str = scraped_page.build_element_tree(element_tree_format)
         extract_action_prompt = ""
         if engine not in CUA_ENGINES:
             extract_action_prompt = await self._build_extract_action_prompt(
@@ -1748,31 +2044,35 @@ class ForgeAgent:
                 expire_verification_code=True,
             )
 
-        await app.ARTIFACT_MANAGER.create_artifact(
+        await app.ARTIFACT_MANAGER.create_json_artifact(
             step=step,
             artifact_type=ArtifactType.VISIBLE_ELEMENTS_ID_CSS_MAP,
-            data=json.dumps(scraped_page.id_to_css_dict, indent=2).encode(),
+            data=scraped_page.id_to_css_dict,
         )
-        await app.ARTIFACT_MANAGER.create_artifact(
+        await app.ARTIFACT_MANAGER.create_json_artifact(
             step=step,
             artifact_type=ArtifactType.VISIBLE_ELEMENTS_ID_FRAME_MAP,
-            data=json.dumps(scraped_page.id_to_frame_dict, indent=2).encode(),
+            data=scraped_page.id_to_frame_dict,
         )
-        await app.ARTIFACT_MANAGER.create_artifact(
+        await app.ARTIFACT_MANAGER.create_json_artifact(
             step=step,
             artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE,
-            data=json.dumps(scraped_page.element_tree, indent=2).encode(),
+            data=scraped_page.element_tree,
         )
-        await app.ARTIFACT_MANAGER.create_artifact(
+        await app.ARTIFACT_MANAGER.create_json_artifact(
             step=step,
             artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE_TRIMMED,
-            data=json.dumps(scraped_page.element_tree_trimmed, indent=2).encode(),
-        )
-        await app.ARTIFACT_MANAGER.create_artifact(
-            step=step,
-            artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE_IN_PROMPT,
-            data=element_tree_in_prompt.encode(),
+            data=scraped_page.element_tree_trimmed,
         )
+        if app.ARTIFACT_MANAGER.should_capture(ArtifactType.VISIBLE_ELEMENTS_TREE_IN_PROMPT, task.organization_id):
+            # TODO: we only use HTML element for now, introduce a way to switch in the future
+            element_tree_format = ElementTreeFormat.HTML
+            element_tree_in_prompt: str = scraped_page.build_element_tree(element_tree_format)
+            await app.ARTIFACT_MANAGER.create_artifact(
+                step=step,
+                artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE_IN_PROMPT,
+                data=element_tree_in_prompt.encode(),
+            )
 
         return scraped_page, extract_action_prompt
 
@@ -1985,6 +2285,11 @@ class ForgeAgent:
         """
         send the task response to the webhook callback url
         """
+        # the task won't have a next step to use the speculative scrape
+        await self.finish_speculative_scrape(task)
+        # the final recording is uploaded after the browser is closed
+        await self.stop_video_artifact_flusher(task)
+
         # refresh the task from the db to get the latest status
         try:
             refreshed_task = await app.DATABASE.get_task(task_id=task.task_id, organization_id=task.organization_id)
@@ -2144,6 +2449,8 @@ class ForgeAgent:
         latest_action_screenshot_urls: list[str] | None = None
         downloaded_files: list[FileInfo] | None = None
 
+        # the artifact rows created by this process could still be in the queue
+        await app.ARTIFACT_MANAGER.flush_artifacts()
         # get the artifact of the screenshot and get the screenshot_url
         screenshot_artifact = await app.DATABASE.get_artifact(
             task_id=task.task_id,
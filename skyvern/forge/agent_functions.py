@@ -1,8 +1,9 @@
 import asyncio
 import copy
 import hashlib
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Dict, List
+from typing import Callable, Dict, List
 
 import structlog
 from playwright.async_api import Frame, Page
@@ -78,6 +79,56 @@ def _get_shape_cache_key(hash: str) -> str:
     return f"skyvern:shape:{hash}"
 
 
+@dataclass
+class _ShapeCandidate:
+    element: dict
+    skyvern_frame: SkyvernFrame
+    # the html of the element without skyvern attributes
+    shape_html: str
+    key: str
+
+
+def _build_shape_candidate(
+    element: dict, skyvern_frame: SkyvernFrame, get_cache_key: Callable[[str], str]
+) -> _ShapeCandidate:
+    shape_html = json_to_html(_remove_skyvern_attributes(element))
+    shape_hash = hashlib.sha256(shape_html.encode("utf-8")).hexdigest()
+    return _ShapeCandidate(
+        element=element, skyvern_frame=skyvern_frame, shape_html=shape_html, key=get_cache_key(shape_hash)
+    )
+
+
+async def _prefetch_shapes(
+    candidates: list[_ShapeCandidate],
+    task: Task | None = None,
+    step: Step | None = None,
+) -> dict[str, str]:
+    """Load the shapes of all the candidates from the shape store in one round-trip."""
+    if not candidates:
+        return {}
+
+    keys = list({candidate.key for candidate in candidates})
+    try:
+        shapes = await app.SHAPE_STORE.get_many(keys)
+    except Exception:
+        LOG.warning(
+            "Failed to load shapes from the shape store",
+            task_id=task.task_id if task else None,
+            step_id=step.step_id if step else None,
+            exc_info=True,
+        )
+        return {}
+
+    try:
+        # refresh the expiration of the shapes in use, the unconvertible ones are left to expire
+        await app.SHAPE_STORE.refresh({key: shape for key, shape in shapes.items() if shape != INVALID_SHAPE})
+    except Exception:
+        LOG.warning("Failed to refresh the shapes in the shape store", exc_info=True)
+
+    LOG.debug("Prefetched shapes from the shape store", candidates=len(keys), hits=len(shapes))
+    return shapes
+
+
 def _remove_skyvern_attributes(element: Dict) -> Dict:
     """
     To get the original HTML element without skyvern attributes
@@ -163,33 +214,21 @@ async def _check_svg_eligibility(
 
 
 async def _convert_svg_to_string(
-    element: Dict,
+    candidate: _ShapeCandidate,
+    svg_shape: str | None = None,
     task: Task | None = None,
     step: Step | None = None,
 ) -> None:
-    """Convert an SVG element to a string description. Assumes element has already passed eligibility checks."""
+    """
+    Convert an SVG element to a string description. Assumes element has already passed eligibility checks.
+    svg_shape is the shape prefetched from the shape store, if any.
+    """
     task_id = task.task_id if task else None
     step_id = step.step_id if step else None
+    element = candidate.element
     element_id = element.get("id", "")
-
-    svg_element = _remove_skyvern_attributes(element)
-    svg_html = json_to_html(svg_element)
-    hash_object = hashlib.sha256()
-    hash_object.update(svg_html.encode("utf-8"))
-    svg_hash = hash_object.hexdigest()
-    svg_key = _get_svg_cache_key(svg_hash)
-
-    svg_shape: str | None = None
-    try:
-        svg_shape = await app.CACHE.get(svg_key)
-    except Exception:
-        LOG.warning(
-            "Failed to loaded SVG cache",
-            task_id=task_id,
-            step_id=step_id,
-            exc_info=True,
-            key=svg_key,
-        )
+    svg_html = candidate.shape_html
+    svg_key = candidate.key
 
     if svg_shape:
         LOG.debug("SVG loaded from cache", element_id=element_id, key=svg_key, shape=svg_shape)
@@ -220,7 +259,7 @@ async def _convert_svg_to_string(
                 if not svg_shape or not recognized:
                     raise Exception("Empty or unrecognized SVG shape replied by secondary llm")
                 LOG.info("SVG converted by LLM", element_id=element_id, key=svg_key, shape=svg_shape)
-                await app.CACHE.set(svg_key, svg_shape)
+                await app.SHAPE_STORE.set(svg_key, svg_shape)
                 break
             except LLMProviderError:
                 LOG.info(
@@ -234,7 +273,7 @@ async def _convert_svg_to_string(
                 )
                 if retry == SVG_SHAPE_CONVERTION_ATTEMPTS - 1:
                     # set the invalid css shape to cache to avoid retry in the near future
-                    await app.CACHE.set(svg_key, INVALID_SHAPE, ex=timedelta(hours=1))
+                    await app.SHAPE_STORE.set(svg_key, INVALID_SHAPE, ex=timedelta(hours=1))
                 await asyncio.sleep(3)
             except Exception:
                 LOG.info(
@@ -247,7 +286,7 @@ async def _convert_svg_to_string(
                 )
                 if retry == SVG_SHAPE_CONVERTION_ATTEMPTS - 1:
                     # set the invalid css shape to cache to avoid retry in the near future
-                    await app.CACHE.set(svg_key, INVALID_SHAPE, ex=timedelta(weeks=1))
+                    await app.SHAPE_STORE.set(svg_key, INVALID_SHAPE, ex=timedelta(weeks=1))
                 await asyncio.sleep(3)
         else:
             LOG.warning(
@@ -263,8 +302,6 @@ async def _convert_svg_to_string(
 
     element["attributes"] = dict()
     if svg_shape != INVALID_SHAPE:
-        # refresh the cache expiration
-        await app.CACHE.set(svg_key, svg_shape)
         element["attributes"]["alt"] = svg_shape
     if "children" in element:
         del element["children"]
@@ -272,33 +309,21 @@ async def _convert_svg_to_string(
 
 
 async def _convert_css_shape_to_string(
-    skyvern_frame: SkyvernFrame,
-    element: Dict,
+    candidate: _ShapeCandidate,
+    css_shape: str | None = None,
     task: Task | None = None,
     step: Step | None = None,
 ) -> None:
+    """
+    css_shape is the shape prefetched from the shape store, if any.
+    """
+    skyvern_frame = candidate.skyvern_frame
+    element = candidate.element
     element_id: str = element.get("id", "")
 
     task_id = task.task_id if task else None
     step_id = step.step_id if step else None
-    shape_element = _remove_skyvern_attributes(element)
-    svg_html = json_to_html(shape_element)
-    hash_object = hashlib.sha256()
-    hash_object.update(svg_html.encode("utf-8"))
-    shape_hash = hash_object.hexdigest()
-    shape_key = _get_shape_cache_key(shape_hash)
-
-    css_shape: str | None = None
-    try:
-        css_shape = await app.CACHE.get(shape_key)
-    except Exception:
-        LOG.warning(
-            "Failed to loaded CSS shape cache",
-            task_id=task_id,
-            step_id=step_id,
-            exc_info=True,
-            key=shape_key,
-        )
+    shape_key = candidate.key
 
     if css_shape:
         LOG.debug("CSS shape loaded from cache", element_id=element_id, key=shape_key, shape=css_shape)
@@ -366,7 +391,7 @@ async def _convert_css_shape_to_string(
                     if not css_shape or not recognized:
                         raise Exception("Empty or unrecognized css shape replied by secondary llm")
                     LOG.info("CSS Shape converted by LLM", element_id=element_id, key=shape_key, shape=css_shape)
-                    await app.CACHE.set(shape_key, css_shape)
+                    await app.SHAPE_STORE.set(shape_key, css_shape)
                     break
                 except LLMProviderError:
                     LOG.info(
@@ -380,7 +405,7 @@ async def _convert_css_shape_to_string(
                     )
                     if retry == CSS_SHAPE_CONVERTION_ATTEMPTS - 1:
                         # set the invalid css shape to cache to avoid retry in the near future
-                        await app.CACHE.set(shape_key, INVALID_SHAPE, ex=timedelta(hours=1))
+                        await app.SHAPE_STORE.set(shape_key, INVALID_SHAPE, ex=timedelta(hours=1))
                     await asyncio.sleep(3)
                 except Exception:
                     LOG.info(
@@ -394,7 +419,7 @@ async def _convert_css_shape_to_string(
                     )
                     if retry == CSS_SHAPE_CONVERTION_ATTEMPTS - 1:
                         # set the invalid css shape to cache to avoid retry in the near future
-                        await app.CACHE.set(shape_key, INVALID_SHAPE, ex=timedelta(weeks=1))
+                        await app.SHAPE_STORE.set(shape_key, INVALID_SHAPE, ex=timedelta(weeks=1))
                     await asyncio.sleep(3)
             else:
                 LOG.info(
@@ -419,8 +444,6 @@ async def _convert_css_shape_to_string(
     if "attributes" not in element:
         element["attributes"] = dict()
     if css_shape != INVALID_SHAPE:
-        # refresh the cache expiration
-        await app.CACHE.set(shape_key, css_shape)
         element["attributes"]["shape-description"] = css_shape
     return None
 
@@ -514,6 +537,7 @@ class AgentFunction:
             queue = []
             element_cnt = 0
             eligible_svgs = []  # List to store eligible SVGs and their frames
+            css_shapes = []  # List to store the css shape elements and their frames
 
             for element in element_tree:
                 queue.append(element)
@@ -542,12 +566,7 @@ class AgentFunction:
                     eligible_svgs.append((queue_ele, skyvern_frame))
 
                 if not element_exceeded and _should_css_shape_convert(element=queue_ele):
-                    await _convert_css_shape_to_string(
-                        skyvern_frame=skyvern_frame,
-                        element=queue_ele,
-                        task=task,
-                        step=step,
-                    )
+                    css_shapes.append((queue_ele, skyvern_frame))
 
                 # TODO: we can come back to test removing the unique_id
                 # from element attributes to make sure this won't increase hallucination
@@ -555,9 +574,26 @@ class AgentFunction:
                 if "children" in queue_ele:
                     queue.extend(queue_ele["children"])
 
+            svg_candidates = [
+                _build_shape_candidate(element, frame, _get_svg_cache_key) for element, frame in eligible_svgs
+            ]
+            css_shape_candidates = [
+                _build_shape_candidate(element, frame, _get_shape_cache_key) for element, frame in css_shapes
+            ]
+            cached_shapes = await _prefetch_shapes(svg_candidates + css_shape_candidates, task, step)
+
+            # the css shapes are converted one by one, because each conversion scrolls to the element
+            for candidate in css_shape_candidates:
+                await _convert_css_shape_to_string(candidate, cached_shapes.get(candidate.key), task, step)
+
             # Convert all eligible SVGs in parallel
-            if eligible_svgs:
-                await asyncio.gather(*[_convert_svg_to_string(element, task, step) for element, frame in eligible_svgs])
+            if svg_candidates:
+                await asyncio.gather(
+                    *[
+                        _convert_svg_to_string(candidate, cached_shapes.get(candidate.key), task, step)
+                        for candidate in svg_candidates
+                    ]
+                )
 
             return element_tree
 
@@ -10,7 +10,10 @@ from skyvern.forge.sdk.api.llm.api_handler_factory import LLMAPIHandlerFactory
 from skyvern.forge.sdk.artifact.manager import ArtifactManager
 from skyvern.forge.sdk.artifact.storage.factory import StorageFactory
 from skyvern.forge.sdk.artifact.storage.s3 import S3Storage
-from skyvern.forge.sdk.cache.factory import CacheFactory
+from skyvern.forge.sdk.cache.factory import CacheFactory, ShapeStoreFactory
+from skyvern.forge.sdk.cache.redis_cache import RedisCache
+from skyvern.forge.sdk.cache.shape_store import DatabaseShapeStore
+from skyvern.forge.sdk.cache.two_tier import TwoTierCache
 from skyvern.forge.sdk.db.client import AgentDB
 from skyvern.forge.sdk.experimentation.providers import BaseExperimentationProvider, NoOpExperimentationProvider
 from skyvern.forge.sdk.schemas.organizations import Organization
@@ -29,7 +32,25 @@ DATABASE = AgentDB(
 if SettingsManager.get_settings().SKYVERN_STORAGE_TYPE == "s3":
     StorageFactory.set_storage(S3Storage())
 STORAGE = StorageFactory.get_storage()
+if SETTINGS_MANAGER.CACHE_TYPE == "redis":
+    redis_cache = RedisCache.from_url(
+        SETTINGS_MANAGER.CACHE_REDIS_URL,
+        key_prefix=SETTINGS_MANAGER.CACHE_KEY_PREFIX,
+        compression_min_bytes=SETTINGS_MANAGER.CACHE_COMPRESSION_MIN_BYTES,
+    )
+    CacheFactory.set_cache(
+        TwoTierCache(
+            redis_cache,
+            local_max_items=SETTINGS_MANAGER.CACHE_LOCAL_TIER_MAX_ITEMS,
+            local_ttl=SETTINGS_MANAGER.CACHE_LOCAL_TIER_TTL_SECONDS,
+        )
+        if SETTINGS_MANAGER.CACHE_ENABLE_LOCAL_TIER
+        else redis_cache
+    )
 CACHE = CacheFactory.get_cache()
+if SettingsManager.get_settings().SHAPE_STORE_TYPE == "database":
+    ShapeStoreFactory.set_shape_store(DatabaseShapeStore())
+SHAPE_STORE = ShapeStoreFactory.get_shape_store()
 ARTIFACT_MANAGER = ArtifactManager()
 BROWSER_MANAGER = BrowserManager()
 EXPERIMENTATION_PROVIDER: BaseExperimentationProvider = NoOpExperimentationProvider()
@@ -23,13 +23,22 @@ from skyvern.forge.sdk.api.llm.exceptions import (
     LLMProviderErrorRetryableTask,
 )
 from skyvern.forge.sdk.api.llm.models import LLMAPIHandler, LLMConfig, LLMRouterConfig, dummy_llm_api_handler
+from skyvern.forge.sdk.api.llm.response_cache import LLMResponseCache
 from skyvern.forge.sdk.api.llm.utils import llm_messages_builder, llm_messages_builder_with_history, parse_api_response
 from skyvern.forge.sdk.artifact.models import ArtifactType
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.task_v2 import TaskV2, Thought
-from skyvern.utils.image_resizer import Resolution, get_resize_target_dimension, resize_screenshots
+from skyvern.utils.image_resizer import (
+    ImageFormat,
+    Resolution,
+    ScreenshotEncoding,
+    encode_screenshots,
+    get_resize_target_dimension,
+    resize_screenshots,
+    run_in_image_executor,
+)
 
 LOG = structlog.get_logger()
 
@@ -119,6 +128,20 @@ class LLMAPIHandlerFactory:
                 task_v2=task_v2,
                 thought=thought,
             )
+            if screenshots:
+                screenshots = await encode_screenshots(
+                    screenshots, LLMAPIHandlerFactory.get_screenshot_encoding(llm_config)
+                )
+
+            cache_key = None
+            if LLMResponseCache.is_enabled(prompt_name):
+                cache_key = LLMResponseCache.get_cache_key(llm_config.model_name, prompt, screenshots, parameters)
+                cached_response = await LLMResponseCache.get(cache_key, prompt_name, llm_key)
+                if cached_response is not None:
+                    return await LLMAPIHandlerFactory.render_hashed_href_map(
+                        cached_response, step=step, task_v2=task_v2, thought=thought, ai_suggestion=ai_suggestion
+                    )
+
             messages = await llm_messages_builder(prompt, screenshots, llm_config.add_assistant_prefix)
 
             await app.ARTIFACT_MANAGER.create_llm_artifact(
@@ -207,6 +230,8 @@ class LLMAPIHandlerFactory:
                         cached_token_count=cached_tokens if cached_tokens > 0 else None,
                     )
             parsed_response = parse_api_response(response, llm_config.add_assistant_prefix)
+            if cache_key:
+                await LLMResponseCache.set(cache_key, prompt_name, parsed_response)
             await app.ARTIFACT_MANAGER.create_llm_artifact(
                 data=json.dumps(parsed_response, indent=2).encode("utf-8"),
                 artifact_type=ArtifactType.LLM_RESPONSE_PARSED,
@@ -216,18 +241,9 @@ class LLMAPIHandlerFactory:
                 ai_suggestion=ai_suggestion,
             )
 
-            if context and len(context.hashed_href_map) > 0:
-                llm_content = json.dumps(parsed_response)
-                rendered_content = Template(llm_content).render(context.hashed_href_map)
-                parsed_response = json.loads(rendered_content)
-                await app.ARTIFACT_MANAGER.create_llm_artifact(
-                    data=json.dumps(parsed_response, indent=2).encode("utf-8"),
-                    artifact_type=ArtifactType.LLM_RESPONSE_RENDERED,
-                    step=step,
-                    task_v2=task_v2,
-                    thought=thought,
-                    ai_suggestion=ai_suggestion,
-                )
+            parsed_response = await LLMAPIHandlerFactory.render_hashed_href_map(
+                parsed_response, step=step, task_v2=task_v2, thought=thought, ai_suggestion=ai_suggestion
+            )
 
             # Track LLM API handler duration
             duration_seconds = time.time() - start_time
@@ -300,6 +316,19 @@ class LLMAPIHandlerFactory:
 
             if not llm_config.supports_vision:
                 screenshots = None
+            elif screenshots:
+                screenshots = await encode_screenshots(
+                    screenshots, LLMAPIHandlerFactory.get_screenshot_encoding(llm_config)
+                )
+
+            cache_key = None
+            if LLMResponseCache.is_enabled(prompt_name):
+                cache_key = LLMResponseCache.get_cache_key(llm_config.model_name, prompt, screenshots, parameters)
+                cached_response = await LLMResponseCache.get(cache_key, prompt_name, llm_key)
+                if cached_response is not None:
+                    return await LLMAPIHandlerFactory.render_hashed_href_map(
+                        cached_response, step=step, task_v2=task_v2, thought=thought, ai_suggestion=ai_suggestion
+                    )
 
             messages = await llm_messages_builder(prompt, screenshots, llm_config.add_assistant_prefix)
             await app.ARTIFACT_MANAGER.create_llm_artifact(
@@ -397,6 +426,8 @@ class LLMAPIHandlerFactory:
                         thought_cost=llm_cost,
                     )
             parsed_response = parse_api_response(response, llm_config.add_assistant_prefix)
+            if cache_key:
+                await LLMResponseCache.set(cache_key, prompt_name, parsed_response)
             await app.ARTIFACT_MANAGER.create_llm_artifact(
                 data=json.dumps(parsed_response, indent=2).encode("utf-8"),
                 artifact_type=ArtifactType.LLM_RESPONSE_PARSED,
@@ -406,18 +437,9 @@ class LLMAPIHandlerFactory:
                 ai_suggestion=ai_suggestion,
             )
 
-            if context and len(context.hashed_href_map) > 0:
-                llm_content = json.dumps(parsed_response)
-                rendered_content = Template(llm_content).render(context.hashed_href_map)
-                parsed_response = json.loads(rendered_content)
-                await app.ARTIFACT_MANAGER.create_llm_artifact(
-                    data=json.dumps(parsed_response, indent=2).encode("utf-8"),
-                    artifact_type=ArtifactType.LLM_RESPONSE_RENDERED,
-                    step=step,
-                    task_v2=task_v2,
-                    thought=thought,
-                    ai_suggestion=ai_suggestion,
-                )
+            parsed_response = await LLMAPIHandlerFactory.render_hashed_href_map(
+                parsed_response, step=step, task_v2=task_v2, thought=thought, ai_suggestion=ai_suggestion
+            )
 
             # Track LLM API handler duration
             duration_seconds = time.time() - start_time
@@ -454,6 +476,42 @@ class LLMAPIHandlerFactory:
 
         return params
 
+    @staticmethod
+    def get_screenshot_encoding(llm_config: LLMConfig | LLMRouterConfig) -> ScreenshotEncoding:
+        if llm_config.screenshot_encoding is not None:
+            return llm_config.screenshot_encoding
+        return ScreenshotEncoding(
+            format=ImageFormat(settings.LLM_SCREENSHOT_FORMAT),
+            quality=settings.LLM_SCREENSHOT_QUALITY,
+            max_dimension=settings.LLM_SCREENSHOT_MAX_DIMENSION,
+            dedup_threshold=settings.LLM_SCREENSHOT_DEDUP_THRESHOLD,
+        )
+
+    @staticmethod
+    async def render_hashed_href_map(
+        parsed_response: dict[str, Any],
+        step: Step | None = None,
+        task_v2: TaskV2 | None = None,
+        thought: Thought | None = None,
+        ai_suggestion: AISuggestion | None = None,
+    ) -> dict[str, Any]:
+        context = skyvern_context.current()
+        if not context or len(context.hashed_href_map) == 0:
+            return parsed_response
+
+        llm_content = json.dumps(parsed_response)
+        rendered_content = Template(llm_content).render(context.hashed_href_map)
+        parsed_response = json.loads(rendered_content)
+        await app.ARTIFACT_MANAGER.create_llm_artifact(
+            data=json.dumps(parsed_response, indent=2).encode("utf-8"),
+            artifact_type=ArtifactType.LLM_RESPONSE_RENDERED,
+            step=step,
+            task_v2=task_v2,
+            thought=thought,
+            ai_suggestion=ai_suggestion,
+        )
+        return parsed_response
+
     @classmethod
     def register_custom_handler(cls, llm_key: str, handler: LLMAPIHandler) -> None:
         if llm_key in cls._custom_handlers:
@@ -542,7 +600,7 @@ class LLMCaller:
                         tool["display_height_px"] = target_dimension["height"]
                     if "display_width_px" in tool:
                         tool["display_width_px"] = target_dimension["width"]
-            screenshots = resize_screenshots(screenshots, target_dimension)
+            screenshots = await run_in_image_executor(resize_screenshots, screenshots, target_dimension)
 
         await app.ARTIFACT_MANAGER.create_llm_artifact(
             data=prompt.encode("utf-8") if prompt else b"",
@@ -556,6 +614,12 @@ class LLMCaller:
 
         if not self.llm_config.supports_vision:
             screenshots = None
+        elif screenshots:
+            screenshot_encoding = LLMAPIHandlerFactory.get_screenshot_encoding(self.llm_config)
+            if self.screenshot_scaling_enabled:
+                # the screenshots are already scaled to the dimension the coordinates are based on
+                screenshot_encoding = dataclasses.replace(screenshot_encoding, max_dimension=None)
+            screenshots = await encode_screenshots(screenshots, screenshot_encoding)
 
         message_pattern = "openai"
         if "ANTHROPIC" in self.llm_key:
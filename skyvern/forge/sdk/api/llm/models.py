@@ -7,6 +7,7 @@ from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.task_v2 import TaskV2, Thought
 from skyvern.forge.sdk.settings_manager import SettingsManager
+from skyvern.utils.image_resizer import ScreenshotEncoding
 
 
 class LiteLLMParams(TypedDict, total=False):
@@ -42,6 +43,8 @@ class LLMConfig(LLMConfigBase):
     max_completion_tokens: int | None = None
     temperature: float | None = SettingsManager.get_settings().LLM_CONFIG_TEMPERATURE
     reasoning_effort: str | None = None
+    # None uses the LLM_SCREENSHOT_* settings
+    screenshot_encoding: ScreenshotEncoding | None = None
 
 
 @dataclass(frozen=True)
@@ -81,6 +84,8 @@ class LLMRouterConfig(LLMConfigBase):
     max_completion_tokens: int | None = None
     reasoning_effort: str | None = None
     temperature: float | None = SettingsManager.get_settings().LLM_CONFIG_TEMPERATURE
+    # None uses the LLM_SCREENSHOT_* settings
+    screenshot_encoding: ScreenshotEncoding | None = None
 
 
 class LLMAPIHandler(Protocol):
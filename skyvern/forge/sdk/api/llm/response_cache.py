@@ -0,0 +1,81 @@
+import hashlib
+import json
+import time
+from collections import defaultdict
+from typing import Any
+
+import structlog
+
+from skyvern.config import settings
+from skyvern.forge import app
+
+LOG = structlog.get_logger()
+
+LLM_RESPONSE_CACHE_KEY_PREFIX = "llm_response"
+
+
+class LLMResponseCache:
+    """
+    Caches the parsed LLM responses of the prompts in LLM_RESPONSE_CACHE_PROMPT_NAMES in app.CACHE, so the backend
+    can be swapped by CacheFactory.set_cache. The expiration is checked on read as well, because not every backend
+    honors the expiration passed to set, and the LRU eviction is left to the backend.
+    """
+
+    hits: dict[str, int] = defaultdict(int)
+    misses: dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def is_enabled(prompt_name: str) -> bool:
+        return settings.ENABLE_LLM_RESPONSE_CACHE and prompt_name in settings.LLM_RESPONSE_CACHE_PROMPT_NAMES
+
+    @staticmethod
+    def get_cache_key(
+        model: str,
+        prompt: str,
+        screenshots: list[bytes] | None,
+        parameters: dict[str, Any] | None,
+    ) -> str:
+        key_hash = hashlib.sha256()
+        key_hash.update(model.encode("utf-8"))
+        key_hash.update(hashlib.sha256(prompt.encode("utf-8")).digest())
+        for screenshot in screenshots or []:
+            key_hash.update(hashlib.sha256(screenshot).digest())
+        key_hash.update(json.dumps(parameters or {}, sort_keys=True, default=str).encode("utf-8"))
+        return f"{LLM_RESPONSE_CACHE_KEY_PREFIX}:{key_hash.hexdigest()}"
+
+    @classmethod
+    async def get(cls, cache_key: str, prompt_name: str, llm_key: str) -> dict[str, Any] | None:
+        cached_response = None
+        try:
+            cached_value = await app.CACHE.get(cache_key)
+            if cached_value:
+                cached_entry = json.loads(cached_value)
+                if cached_entry["expires_at"] > time.time():
+                    cached_response = cached_entry["response"]
+        except Exception:
+            # a corrupted or outdated entry is a miss, it's overwritten by the fresh response
+            LOG.warning("Failed to read the LLM response cache", prompt_name=prompt_name, exc_info=True)
+            cached_response = None
+
+        if cached_response is None:
+            cls.misses[prompt_name] += 1
+        else:
+            cls.hits[prompt_name] += 1
+        LOG.info(
+            "LLM response cache hit" if cached_response is not None else "LLM response cache miss",
+            prompt_name=prompt_name,
+            llm_key=llm_key,
+            hits=cls.hits[prompt_name],
+            misses=cls.misses[prompt_name],
+        )
+        return cached_response
+
+    @staticmethod
+    async def set(cache_key: str, prompt_name: str, response: dict[str, Any]) -> None:
+        ttl = settings.LLM_RESPONSE_CACHE_TTL_SECONDS
+        # stored as a json string, so the cached response can't be mutated by the callers
+        cached_value = json.dumps({"expires_at": time.time() + ttl, "response": response})
+        try:
+            await app.CACHE.set(cache_key, cached_value, ex=ttl)
+        except Exception:
+            LOG.warning("Failed to write the LLM response cache", prompt_name=prompt_name, exc_info=True)
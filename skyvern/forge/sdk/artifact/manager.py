@@ -1,24 +1,144 @@
 import asyncio
+import json
 import time
 from collections import defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable
 
 import structlog
 
+from skyvern.config import settings
 from skyvern.forge import app
-from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
+from skyvern.forge.sdk.artifact.models import (
+    SKIPPED_ARTIFACT_TYPES,
+    Artifact,
+    ArtifactCaptureLevel,
+    ArtifactType,
+    LogEntityType,
+)
 from skyvern.forge.sdk.db.id import generate_artifact_id
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.task_v2 import TaskV2, Thought
 from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
 LOG = structlog.get_logger(__name__)
 
+ZSTD_MAGIC_NUMBER = b"\x28\xb5\x2f\xfd"
+
+
+def serialize_json_artifact(data: Any) -> bytes:
+    serialized = json.dumps(data).encode()
+    # fall back to the plain json if zstandard isn't installed
+    if settings.ENABLE_ARTIFACT_COMPRESSION and zstandard is not None:
+        return zstandard.ZstdCompressor().compress(serialized)
+    return serialized
+
 
 class ArtifactManager:
     # task_id -> list of aio_tasks for uploading artifacts
     upload_aiotasks_map: dict[str, list[asyncio.Task[None]]] = defaultdict(list)
 
+    def __init__(self) -> None:
+        # artifact rows waiting to be inserted in a batch, only used when ENABLE_ARTIFACT_BATCHING is on
+        self.pending_artifacts: list[Artifact] = []
+        self.flush_aiotasks: set[asyncio.Task[None]] = set()
+        self.flush_lock = asyncio.Lock()
+        self.delayed_flush_scheduled = False
+        # primary key -> the uploads waiting for the upload aio task of the key, only used when ENABLE_ARTIFACT_BATCHING
+        # is on. The artifacts created while an upload of the key is running are uploaded together by the same aio task
+        self.pending_uploads: dict[str, list[Callable[[], Awaitable[None]]]] = defaultdict(list)
+        self.upload_drain_aiotasks: dict[str, asyncio.Task[None]] = {}
+        if settings.ENABLE_ARTIFACT_COMPRESSION and zstandard is None:
+            LOG.warning(
+                "ENABLE_ARTIFACT_COMPRESSION is on but zstandard isn't installed, the JSON artifacts are stored uncompressed. "
+                "Install the compression extra to compress them"
+            )
+
+    async def flush_artifacts(self) -> None:
+        async with self.flush_lock:
+            while self.pending_artifacts:
+                artifacts = self.pending_artifacts[: settings.ARTIFACT_BATCH_SIZE]
+                del self.pending_artifacts[: len(artifacts)]
+                try:
+                    await app.DATABASE.create_artifacts(artifacts)
+                except Exception:
+                    LOG.warning(
+                        "Failed to insert the artifacts in batch, inserting them one by one",
+                        artifact_ids=[artifact.artifact_id for artifact in artifacts],
+                        exc_info=True,
+                    )
+                    await self._create_artifacts_one_by_one(artifacts)
+
+    @staticmethod
+    async def _create_artifacts_one_by_one(artifacts: list[Artifact]) -> None:
+        # a bad row fails the whole batch, so the other rows of the batch are still inserted
+        for artifact in artifacts:
+            try:
+                await app.DATABASE.create_artifact(
+                    artifact.artifact_id,
+                    artifact.artifact_type,
+                    artifact.uri,
+                    step_id=artifact.step_id,
+                    task_id=artifact.task_id,
+                    workflow_run_id=artifact.workflow_run_id,
+                    workflow_run_block_id=artifact.workflow_run_block_id,
+                    task_v2_id=artifact.observer_cruise_id,
+                    thought_id=artifact.observer_thought_id,
+                    ai_suggestion_id=artifact.ai_suggestion_id,
+                    organization_id=artifact.organization_id,
+                )
+            except Exception:
+                LOG.exception("Failed to insert the artifact", artifact_id=artifact.artifact_id)
+
+    async def _flush_artifacts_after_interval(self) -> None:
+        await asyncio.sleep(settings.ARTIFACT_BATCH_FLUSH_INTERVAL_MS / 1000)
+        self.delayed_flush_scheduled = False
+        await self.flush_artifacts()
+
+    def _track_flush_aiotask(self, aio_task: asyncio.Task[None]) -> None:
+        self.flush_aiotasks.add(aio_task)
+        aio_task.add_done_callback(self.flush_aiotasks.discard)
+
+    def _queue_upload(self, primary_key: str, upload: Callable[[], Awaitable[None]]) -> None:
+        self.pending_uploads[primary_key].append(upload)
+        drain_aiotask = self.upload_drain_aiotasks.get(primary_key)
+        if drain_aiotask is None or drain_aiotask.done():
+            drain_aiotask = asyncio.create_task(self._drain_uploads(primary_key))
+            self.upload_drain_aiotasks[primary_key] = drain_aiotask
+            self.upload_aiotasks_map[primary_key].append(drain_aiotask)
+
+    async def _drain_uploads(self, primary_key: str) -> None:
+        # nothing is awaited between the last pop and the return, so an upload queued later starts a new aio task
+        while uploads := self.pending_uploads.pop(primary_key, None):
+            await asyncio.gather(*(upload() for upload in uploads))
+
+    async def _queue_artifact(self, artifact: Artifact) -> None:
+        if len(self.pending_artifacts) >= settings.ARTIFACT_QUEUE_MAX_SIZE:
+            # backpressure: the producer waits for the queue to drain
+            await self.flush_artifacts()
+        self.pending_artifacts.append(artifact)
+
+        if len(self.pending_artifacts) >= settings.ARTIFACT_BATCH_SIZE:
+            self._track_flush_aiotask(asyncio.create_task(self.flush_artifacts()))
+        elif not self.delayed_flush_scheduled:
+            self.delayed_flush_scheduled = True
+            self._track_flush_aiotask(asyncio.create_task(self._flush_artifacts_after_interval()))
+
+    @staticmethod
+    def get_capture_level(organization_id: str | None = None) -> ArtifactCaptureLevel:
+        if organization_id and organization_id in settings.ARTIFACT_CAPTURE_LEVEL_BY_ORGANIZATION:
+            return ArtifactCaptureLevel(settings.ARTIFACT_CAPTURE_LEVEL_BY_ORGANIZATION[organization_id])
+        return ArtifactCaptureLevel(settings.ARTIFACT_CAPTURE_LEVEL)
+
+    def should_capture(self, artifact_type: ArtifactType, organization_id: str | None = None) -> bool:
+        return artifact_type not in SKIPPED_ARTIFACT_TYPES[self.get_capture_level(organization_id)]
+
     async def _create_artifact(
         self,
         aio_task_primary_key: str,
@@ -40,20 +160,44 @@ class ArtifactManager:
             raise ValueError("Either data or path must be provided to create an artifact.")
         if data and path:
             raise ValueError("Both data and path cannot be provided to create an artifact.")
-        artifact = await app.DATABASE.create_artifact(
-            artifact_id,
-            artifact_type,
-            uri,
-            step_id=step_id,
-            task_id=task_id,
-            workflow_run_id=workflow_run_id,
-            workflow_run_block_id=workflow_run_block_id,
-            thought_id=thought_id,
-            task_v2_id=task_v2_id,
-            organization_id=organization_id,
-            ai_suggestion_id=ai_suggestion_id,
-        )
-        if data:
+        if settings.ENABLE_ARTIFACT_BATCHING:
+            now = datetime.utcnow()
+            artifact = Artifact(
+                artifact_id=artifact_id,
+                artifact_type=artifact_type,
+                uri=uri,
+                step_id=step_id,
+                task_id=task_id,
+                workflow_run_id=workflow_run_id,
+                workflow_run_block_id=workflow_run_block_id,
+                observer_thought_id=thought_id,
+                observer_cruise_id=task_v2_id,
+                organization_id=organization_id,
+                ai_suggestion_id=ai_suggestion_id,
+                created_at=now,
+                modified_at=now,
+            )
+            await self._queue_artifact(artifact)
+        else:
+            artifact = await app.DATABASE.create_artifact(
+                artifact_id,
+                artifact_type,
+                uri,
+                step_id=step_id,
+                task_id=task_id,
+                workflow_run_id=workflow_run_id,
+                workflow_run_block_id=workflow_run_block_id,
+                thought_id=thought_id,
+                task_v2_id=task_v2_id,
+                organization_id=organization_id,
+                ai_suggestion_id=ai_suggestion_id,
+            )
+        if settings.ENABLE_ARTIFACT_BATCHING:
+            if data:
+                self._queue_upload(aio_task_primary_key, lambda: app.STORAGE.store_artifact(artifact, data))
+            elif path:
+                self._queue_upload(aio_task_primary_key, lambda: app.STORAGE.store_artifact_from_path(artifact, path))
+        elif data:
             # Fire and forget
             aio_task = asyncio.create_task(app.STORAGE.store_artifact(artifact, data))
             self.upload_aiotasks_map[aio_task_primary_key].append(aio_task)
@@ -85,6 +229,21 @@ class ArtifactManager:
             path=path,
         )
 
+    async def create_json_artifact(
+        self,
+        step: Step,
+        artifact_type: ArtifactType,
+        data: Any,
+    ) -> str | None:
+        """
+        Serialize the data in a thread and create the artifact. Nothing is serialized if the artifact type isn't
+        captured at the current capture level.
+        """
+        if not self.should_capture(artifact_type, step.organization_id):
+            return None
+        serialized_data = await asyncio.to_thread(serialize_json_artifact, data)
+        return await self.create_artifact(step=step, artifact_type=artifact_type, data=serialized_data)
+
     async def create_log_artifact(
         self,
         log_entity_type: LogEntityType,
@@ -206,12 +365,25 @@ class ArtifactManager:
         task_v2: TaskV2 | None = None,
         ai_suggestion: AISuggestion | None = None,
     ) -> None:
+        organization_id = next(
+            (
+                entity.organization_id
+                for entity in (step, task_v2, thought, ai_suggestion)
+                if entity and entity.organization_id
+            ),
+            None,
+        )
+        capture_data = self.should_capture(artifact_type, organization_id)
+        if not self.should_capture(ArtifactType.SCREENSHOT_LLM, organization_id):
+            screenshots = None
+
         if step:
-            await self.create_artifact(
-                step=step,
-                artifact_type=artifact_type,
-                data=data,
-            )
+            if capture_data:
+                await self.create_artifact(
+                    step=step,
+                    artifact_type=artifact_type,
+                    data=data,
+                )
             for screenshot in screenshots or []:
                 await self.create_artifact(
                     step=step,
@@ -219,11 +391,12 @@ class ArtifactManager:
                     data=screenshot,
                 )
         elif task_v2:
-            await self.create_task_v2_artifact(
-                task_v2=task_v2,
-                artifact_type=artifact_type,
-                data=data,
-            )
+            if capture_data:
+                await self.create_task_v2_artifact(
+                    task_v2=task_v2,
+                    artifact_type=artifact_type,
+                    data=data,
+                )
             for screenshot in screenshots or []:
                 await self.create_task_v2_artifact(
                     task_v2=task_v2,
@@ -231,11 +404,12 @@ class ArtifactManager:
                     data=screenshot,
                 )
         elif thought:
-            await self.create_thought_artifact(
-                thought=thought,
-                artifact_type=artifact_type,
-                data=data,
-            )
+            if capture_data:
+                await self.create_thought_artifact(
+                    thought=thought,
+                    artifact_type=artifact_type,
+                    data=data,
+                )
             for screenshot in screenshots or []:
                 await self.create_thought_artifact(
                     thought=thought,
@@ -243,11 +417,12 @@ class ArtifactManager:
                     data=screenshot,
                 )
         elif ai_suggestion:
-            await self.create_ai_suggestion_artifact(
-                ai_suggestion=ai_suggestion,
-                artifact_type=artifact_type,
-                data=data,
-            )
+            if capture_data:
+                await self.create_ai_suggestion_artifact(
+                    ai_suggestion=ai_suggestion,
+                    artifact_type=artifact_type,
+                    data=data,
+                )
             for screenshot in screenshots or []:
                 await self.create_ai_suggestion_artifact(
                     ai_suggestion=ai_suggestion,
@@ -264,6 +439,9 @@ class ArtifactManager:
     ) -> None:
         if not artifact_id or not organization_id:
             return None
+        if settings.ENABLE_ARTIFACT_BATCHING:
+            # the artifact row could still be in the queue
+            await self.flush_artifacts()
         artifact = await app.DATABASE.get_artifact_by_id(artifact_id, organization_id)
         if not artifact:
             return
@@ -275,7 +453,10 @@ class ArtifactManager:
         self.upload_aiotasks_map[artifact[primary_key]].append(aio_task)
 
     async def retrieve_artifact(self, artifact: Artifact) -> bytes | None:
-        return await app.STORAGE.retrieve_artifact(artifact)
+        data = await app.STORAGE.retrieve_artifact(artifact)
+        if data and data.startswith(ZSTD_MAGIC_NUMBER) and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        return data
 
     async def get_share_link(self, artifact: Artifact) -> str | None:
         return await app.STORAGE.get_share_link(artifact)
@@ -287,6 +468,7 @@ class ArtifactManager:
         try:
             st = time.time()
             async with asyncio.timeout(30):
+                await self.flush_artifacts()
                 await asyncio.gather(
                     *[
                         aio_task
@@ -308,3 +490,5 @@ class ArtifactManager:
 
         for primary_key in primary_keys:
             del self.upload_aiotasks_map[primary_key]
+            # the uploads queued from now on start a new aio task, tracked in the new upload_aiotasks_map entry
+            self.upload_drain_aiotasks.pop(primary_key, None)
@@ -45,11 +45,45 @@ class ArtifactType(StrEnum):
     HTML_SCRAPE = "html_scrape"
     HTML_ACTION = "html_action"
 
+    # the rows of a parsed file, as newline-delimited json
+    PARSED_ROWS = "parsed_rows"
+
     # Debugging
     TRACE = "trace"
     HAR = "har"
 
 
+class ArtifactCaptureLevel(StrEnum):
+    MINIMAL = "minimal"
+    DEBUG = "debug"
+    FULL = "full"
+
+
+# the artifact types that aren't captured at each capture level
+SKIPPED_ARTIFACT_TYPES: dict[ArtifactCaptureLevel, set[ArtifactType]] = {
+    ArtifactCaptureLevel.MINIMAL: {
+        ArtifactType.LLM_PROMPT,
+        ArtifactType.LLM_REQUEST,
+        ArtifactType.LLM_RESPONSE,
+        ArtifactType.LLM_RESPONSE_RENDERED,
+        ArtifactType.VISIBLE_ELEMENTS_ID_CSS_MAP,
+        ArtifactType.VISIBLE_ELEMENTS_ID_FRAME_MAP,
+        ArtifactType.VISIBLE_ELEMENTS_TREE,
+        ArtifactType.VISIBLE_ELEMENTS_TREE_TRIMMED,
+        ArtifactType.VISIBLE_ELEMENTS_TREE_IN_PROMPT,
+        ArtifactType.HASHED_HREF_MAP,
+        ArtifactType.HTML_SCRAPE,
+        ArtifactType.HTML_ACTION,
+    },
+    ArtifactCaptureLevel.DEBUG: {
+        ArtifactType.VISIBLE_ELEMENTS_ID_FRAME_MAP,
+        ArtifactType.VISIBLE_ELEMENTS_TREE,
+        ArtifactType.VISIBLE_ELEMENTS_TREE_TRIMMED,
+    },
+    ArtifactCaptureLevel.FULL: set(),
+}
+
+
 class Artifact(BaseModel):
     created_at: datetime = Field(
         ...,
@@ -31,6 +31,7 @@ FILE_EXTENTSION_MAP: dict[ArtifactType, str] = {
     ArtifactType.TRACE: "zip",
     ArtifactType.HAR: "har",
     ArtifactType.HASHED_HREF_MAP: "json",
+    ArtifactType.PARSED_ROWS: "ndjson",
     # DEPRECATED: we're using CSS selector map now
     ArtifactType.VISIBLE_ELEMENTS_ID_XPATH_MAP: "json",
 }
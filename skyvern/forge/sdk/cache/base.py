@@ -14,3 +14,16 @@ class BaseCache(ABC):
     @abstractmethod
     async def get(self, key: str) -> Any:
         pass
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get the values of the keys. The missing keys aren't in the result."""
+        values = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    async def set_many(self, values: dict[str, Any], ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        for key, value in values.items():
+            await self.set(key, value, ex=ex)
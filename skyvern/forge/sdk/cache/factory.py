@@ -1,5 +1,7 @@
 from skyvern.forge.sdk.cache.base import BaseCache
 from skyvern.forge.sdk.cache.local import LocalCache
+from skyvern.forge.sdk.cache.namespaced import NamespacedCache
+from skyvern.forge.sdk.cache.shape_store import BaseShapeStore, CacheShapeStore
 
 
 class CacheFactory:
@@ -12,3 +14,20 @@ class CacheFactory:
     @staticmethod
     def get_cache() -> BaseCache:
         return CacheFactory.__cache
+
+    @staticmethod
+    def get_organization_cache(organization_id: str) -> BaseCache:
+        """The cache with the keys namespaced by the organization, for the values that mustn't be shared."""
+        return NamespacedCache(CacheFactory.__cache, f"org:{organization_id}")
+
+
+class ShapeStoreFactory:
+    __shape_store: BaseShapeStore = CacheShapeStore()
+
+    @staticmethod
+    def set_shape_store(shape_store: BaseShapeStore) -> None:
+        ShapeStoreFactory.__shape_store = shape_store
+
+    @staticmethod
+    def get_shape_store() -> BaseShapeStore:
+        return ShapeStoreFactory.__shape_store
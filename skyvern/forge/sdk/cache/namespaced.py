@@ -0,0 +1,30 @@
+from datetime import timedelta
+from typing import Any, Union
+
+from skyvern.forge.sdk.cache.base import CACHE_EXPIRE_TIME, BaseCache
+
+
+class NamespacedCache(BaseCache):
+    """
+    A view of the cache with the keys prefixed by the namespace, e.g. to keep the values of an organization apart.
+    """
+
+    def __init__(self, cache: BaseCache, namespace: str) -> None:
+        self.cache = cache
+        self.namespace = namespace
+
+    def _get_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Any:
+        return await self.cache.get(self._get_key(key))
+
+    async def set(self, key: str, value: Any, ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        await self.cache.set(self._get_key(key), value, ex=ex)
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        values = await self.cache.get_many([self._get_key(key) for key in keys])
+        return {key: values[self._get_key(key)] for key in keys if self._get_key(key) in values}
+
+    async def set_many(self, values: dict[str, Any], ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        await self.cache.set_many({self._get_key(key): value for key, value in values.items()}, ex=ex)
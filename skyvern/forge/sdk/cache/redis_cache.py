@@ -0,0 +1,149 @@
+import json
+import time
+import zlib
+from datetime import timedelta
+from typing import Any, Union
+
+import redis.asyncio as redis
+import structlog
+
+from skyvern.forge.sdk.cache.base import CACHE_EXPIRE_TIME, BaseCache
+
+LOG = structlog.get_logger()
+
+# the first byte of the stored value tells how to decode the rest
+_TYPE_BYTES = 0
+_TYPE_STR = 1
+_TYPE_JSON = 2
+_FLAG_COMPRESSED = 0x80
+
+
+def serialize_cache_value(value: Any, compression_min_bytes: int) -> bytes:
+    if isinstance(value, bytes):
+        value_type, data = _TYPE_BYTES, value
+    elif isinstance(value, str):
+        value_type, data = _TYPE_STR, value.encode("utf-8")
+    else:
+        value_type, data = _TYPE_JSON, json.dumps(value).encode("utf-8")
+
+    if compression_min_bytes > 0 and len(data) >= compression_min_bytes:
+        compressed_data = zlib.compress(data)
+        if len(compressed_data) < len(data):
+            return bytes([value_type | _FLAG_COMPRESSED]) + compressed_data
+    return bytes([value_type]) + data
+
+
+def deserialize_cache_value(data: bytes) -> Any:
+    header, payload = data[0], data[1:]
+    if header & _FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+    value_type = header & ~_FLAG_COMPRESSED
+    if value_type == _TYPE_BYTES:
+        return payload
+    if value_type == _TYPE_STR:
+        return payload.decode("utf-8")
+    return json.loads(payload)
+
+
+class _InMemoryPipeline:
+    def __init__(self, client: "InMemoryRedis") -> None:
+        self.client = client
+        self.commands: list[tuple[str, bytes, Union[int, timedelta, None]]] = []
+
+    async def __aenter__(self) -> "_InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.commands = []
+
+    def set(self, name: str, value: bytes, ex: Union[int, timedelta, None] = None) -> "_InMemoryPipeline":
+        self.commands.append((name, value, ex))
+        return self
+
+    async def execute(self) -> list[bool]:
+        return [await self.client.set(name, value, ex=ex) for name, value, ex in self.commands]
+
+
+class InMemoryRedis:
+    """
+    An in-process stand-in for the subset of the redis client used by RedisCache, for tests and local development.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[bytes, float | None]] = {}
+
+    async def get(self, name: str) -> bytes | None:
+        if name not in self.data:
+            return None
+        value, expires_at = self.data[name]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[name]
+            return None
+        return value
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, name: str, value: bytes, ex: Union[int, timedelta, None] = None) -> bool:
+        if isinstance(ex, timedelta):
+            ex = int(ex.total_seconds())
+        self.data[name] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def pipeline(self, transaction: bool = True) -> _InMemoryPipeline:
+        return _InMemoryPipeline(self)
+
+    async def aclose(self) -> None:
+        self.data = {}
+
+
+class RedisCache(BaseCache):
+    """
+    A cache shared by all the workers, on any server speaking the redis protocol.
+    The values are stored as bytes with a type header, so str, bytes and json serializable values round-trip, and
+    the large values are compressed.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis | InMemoryRedis,
+        key_prefix: str = "skyvern",
+        compression_min_bytes: int = 1024,
+    ) -> None:
+        self.client = client
+        self.key_prefix = key_prefix
+        self.compression_min_bytes = compression_min_bytes
+
+    @classmethod
+    def from_url(cls, url: str, key_prefix: str = "skyvern", compression_min_bytes: int = 1024) -> "RedisCache":
+        return cls(redis.from_url(url), key_prefix=key_prefix, compression_min_bytes=compression_min_bytes)
+
+    def _get_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}" if self.key_prefix else key
+
+    async def get(self, key: str) -> Any:
+        data = await self.client.get(self._get_key(key))
+        if data is None:
+            return None
+        return deserialize_cache_value(data)
+
+    async def set(self, key: str, value: Any, ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        await self.client.set(self._get_key(key), serialize_cache_value(value, self.compression_min_bytes), ex=ex)
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+        values = await self.client.mget([self._get_key(key) for key in keys])
+        return {key: deserialize_cache_value(data) for key, data in zip(keys, values) if data is not None}
+
+    async def set_many(self, values: dict[str, Any], ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        if not values:
+            return
+        # MSET can't set the expiration, so the SETs are sent in one pipeline instead
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(self._get_key(key), serialize_cache_value(value, self.compression_min_bytes), ex=ex)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,61 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+import structlog
+
+from skyvern.forge import app
+from skyvern.forge.sdk.cache.base import CACHE_EXPIRE_TIME
+
+LOG = structlog.get_logger()
+
+
+class BaseShapeStore(ABC):
+    """
+    A content-addressed store of the SVG and CSS shape descriptions, keyed by the hash of the shape HTML.
+    """
+
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Get the shapes of the keys in one round-trip. The missing keys aren't in the result."""
+
+    @abstractmethod
+    async def set_many(self, shapes: dict[str, str], ex: timedelta | None = None) -> None:
+        """Store the shapes. ex=None keeps them as long as the store does."""
+
+    async def get(self, key: str) -> str | None:
+        return (await self.get_many([key])).get(key)
+
+    async def set(self, key: str, shape: str, ex: timedelta | None = None) -> None:
+        await self.set_many({key: shape}, ex=ex)
+
+    async def refresh(self, shapes: dict[str, str]) -> None:
+        """Extend the expiration of the shapes that were just used, if the store expires them."""
+
+
+class CacheShapeStore(BaseShapeStore):
+    """
+    Stores the shapes in app.CACHE, so it's as durable and as shared as the cache backend.
+    """
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        return {key: shape for key, shape in (await app.CACHE.get_many(keys)).items() if shape}
+
+    async def set_many(self, shapes: dict[str, str], ex: timedelta | None = None) -> None:
+        await app.CACHE.set_many(shapes, ex=ex or CACHE_EXPIRE_TIME)
+
+    async def refresh(self, shapes: dict[str, str]) -> None:
+        await self.set_many(shapes)
+
+
+class DatabaseShapeStore(BaseShapeStore):
+    """
+    Stores the shapes in the shape_descriptions table, so they survive restarts and deploys and are shared by all
+    the workers. The converted shapes never expire, only the unconvertible ones do.
+    """
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        return await app.DATABASE.get_shape_descriptions(keys)
+
+    async def set_many(self, shapes: dict[str, str], ex: timedelta | None = None) -> None:
+        expires_at = datetime.utcnow() + ex if ex else None
+        await app.DATABASE.upsert_shape_descriptions(shapes, expires_at=expires_at)
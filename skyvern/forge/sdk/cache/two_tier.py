@@ -0,0 +1,42 @@
+from datetime import timedelta
+from typing import Any, Union
+
+from cachetools import TTLCache
+
+from skyvern.forge.sdk.cache.base import CACHE_EXPIRE_TIME, BaseCache
+
+
+class TwoTierCache(BaseCache):
+    """
+    An in-process LRU in front of a shared cache. The local entries live for a short ttl, so a value changed by
+    another worker is picked up after at most local_ttl seconds.
+    """
+
+    def __init__(self, remote: BaseCache, local_max_items: int = 1000, local_ttl: int = 60) -> None:
+        self.remote = remote
+        self.local: TTLCache = TTLCache(maxsize=local_max_items, ttl=local_ttl)
+
+    async def get(self, key: str) -> Any:
+        if key in self.local:
+            return self.local[key]
+        value = await self.remote.get(key)
+        if value is not None:
+            self.local[key] = value
+        return value
+
+    async def set(self, key: str, value: Any, ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        await self.remote.set(key, value, ex=ex)
+        self.local[key] = value
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        values = {key: self.local[key] for key in keys if key in self.local}
+        missing_keys = [key for key in keys if key not in values]
+        if missing_keys:
+            remote_values = await self.remote.get_many(missing_keys)
+            self.local.update(remote_values)
+            values.update(remote_values)
+        return values
+
+    async def set_many(self, values: dict[str, Any], ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        await self.remote.set_many(values, ex=ex)
+        self.local.update(values)
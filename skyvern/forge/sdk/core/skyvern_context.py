@@ -2,8 +2,12 @@ from contextvars import ContextVar
 from dataclasses import dataclass, field
 from zoneinfo import ZoneInfo
 
+from cachetools import LRUCache
 from playwright.async_api import Frame
 
+# the elements of a few pages, the counts of the elements gone from the page are evicted first
+ELEMENT_TOKEN_COUNT_CACHE_SIZE = 10000
+
 
 @dataclass
 class SkyvernContext:
@@ -21,8 +25,16 @@ class SkyvernContext:
     totp_codes: dict[str, str | None] = field(default_factory=dict)
     log: list[dict] = field(default_factory=list)
     hashed_href_map: dict[str, str] = field(default_factory=dict)
+    # the key of the browser state used instead of the one of the workflow run, e.g. by a concurrent loop iteration
+    browser_state_key: str | None = None
     refresh_working_page: bool = False
     frame_index_map: dict[Frame, int] = field(default_factory=dict)
+    # element id -> (element content, content digest) from the previous scrape, used by the diff scraping
+    element_hash_cache: dict[str, tuple[dict, str]] = field(default_factory=dict)
+    # content digest of an element html -> token count, so the unchanged elements aren't encoded again
+    element_token_count_cache: LRUCache[str, int] = field(
+        default_factory=lambda: LRUCache(maxsize=ELEMENT_TOKEN_COUNT_CACHE_SIZE)
+    )
 
     def __repr__(self) -> str:
         return f"SkyvernContext(request_id={self.request_id}, organization_id={self.organization_id}, task_id={self.task_id}, workflow_id={self.workflow_id}, workflow_run_id={self.workflow_run_id}, task_v2_id={self.task_v2_id}, max_steps_override={self.max_steps_override})"
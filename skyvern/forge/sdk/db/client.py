@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 from typing import Any, List, Optional, Sequence
 
 import structlog
-from sqlalchemy import and_, delete, distinct, func, pool, select, tuple_, update
+from sqlalchemy import and_, delete, distinct, func, or_, pool, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
@@ -27,6 +28,7 @@ from skyvern.forge.sdk.db.models import (
     OrganizationModel,
     OutputParameterModel,
     PersistentBrowserSessionModel,
+    ShapeDescriptionModel,
     StepModel,
     TaskGenerationModel,
     TaskModel,
@@ -243,6 +245,40 @@ class AgentDB:
             LOG.exception("UnexpectedError")
             raise
 
+    async def create_artifacts(self, artifacts: list[Artifact]) -> None:
+        """Insert the artifacts in a single transaction"""
+        if not artifacts:
+            return
+        try:
+            async with self.Session() as session:
+                session.add_all(
+                    [
+                        ArtifactModel(
+                            artifact_id=artifact.artifact_id,
+                            artifact_type=artifact.artifact_type,
+                            uri=artifact.uri,
+                            task_id=artifact.task_id,
+                            step_id=artifact.step_id,
+                            workflow_run_id=artifact.workflow_run_id,
+                            workflow_run_block_id=artifact.workflow_run_block_id,
+                            observer_cruise_id=artifact.observer_cruise_id,
+                            observer_thought_id=artifact.observer_thought_id,
+                            ai_suggestion_id=artifact.ai_suggestion_id,
+                            organization_id=artifact.organization_id,
+                            created_at=artifact.created_at,
+                            modified_at=artifact.modified_at,
+                        )
+                        for artifact in artifacts
+                    ]
+                )
+                await session.commit()
+        except SQLAlchemyError:
+            LOG.exception("SQLAlchemyError")
+            raise
+        except Exception:
+            LOG.exception("UnexpectedError")
+            raise
+
     async def get_task(self, task_id: str, organization_id: str | None = None) -> Task | None:
         """Get a task by its id"""
         try:
@@ -409,7 +445,12 @@ class AgentDB:
             LOG.error("UnexpectedError", exc_info=True)
             raise
 
-    async def get_tasks_actions(self, task_ids: list[str], organization_id: str | None = None) -> list[Action]:
+    async def get_tasks_actions(
+        self,
+        task_ids: list[str],
+        organization_id: str | None = None,
+        updated_after: datetime | None = None,
+    ) -> list[Action]:
         try:
             async with self.Session() as session:
                 query = (
@@ -418,6 +459,8 @@ class AgentDB:
                     .filter(ActionModel.task_id.in_(task_ids))
                     .order_by(ActionModel.created_at.desc())
                 )
+                if updated_after:
+                    query = query.filter(ActionModel.modified_at > updated_after)
                 actions = (await session.scalars(query)).all()
                 return [Action.model_validate(action) for action in actions]
 
@@ -2639,17 +2682,23 @@ class AgentDB:
         self,
         workflow_run_id: str,
         organization_id: str | None = None,
+        updated_after: datetime | None = None,
     ) -> list[WorkflowRunBlock]:
         async with self.Session() as session:
-            workflow_run_blocks = (
-                await session.scalars(
-                    select(WorkflowRunBlockModel)
-                    .filter_by(workflow_run_id=workflow_run_id)
-                    .filter_by(organization_id=organization_id)
-                    .order_by(WorkflowRunBlockModel.created_at.desc())
-                )
-            ).all()
-            tasks = await self.get_tasks_by_workflow_run_id(workflow_run_id)
+            query = (
+                select(WorkflowRunBlockModel)
+                .filter_by(workflow_run_id=workflow_run_id)
+                .filter_by(organization_id=organization_id)
+                .order_by(WorkflowRunBlockModel.created_at.desc())
+            )
+            if updated_after:
+                query = query.filter(WorkflowRunBlockModel.modified_at > updated_after)
+            workflow_run_blocks = (await session.scalars(query)).all()
+            if updated_after:
+                task_ids = [block.task_id for block in workflow_run_blocks if block.task_id]
+                tasks = await self.get_tasks_by_ids(task_ids, organization_id=organization_id) if task_ids else []
+            else:
+                tasks = await self.get_tasks_by_workflow_run_id(workflow_run_id)
             tasks_dict = {task.task_id: task for task in tasks}
             return [
                 convert_to_workflow_run_block(workflow_run_block, task=tasks_dict.get(workflow_run_block.task_id))
@@ -3028,3 +3077,48 @@ class AgentDB:
                 query = query.filter_by(organization_id=organization_id)
             task_run = (await session.scalars(query)).first()
             return Run.model_validate(task_run) if task_run else None
+
+    async def get_shape_descriptions(self, shape_keys: list[str]) -> dict[str, str]:
+        """Get the unexpired shape descriptions of the keys in one query"""
+        if not shape_keys:
+            return {}
+        async with self.Session() as session:
+            query = (
+                select(ShapeDescriptionModel.shape_key, ShapeDescriptionModel.shape)
+                .filter(ShapeDescriptionModel.shape_key.in_(shape_keys))
+                .filter(
+                    or_(
+                        ShapeDescriptionModel.expires_at.is_(None),
+                        ShapeDescriptionModel.expires_at > datetime.utcnow(),
+                    )
+                )
+            )
+            return {shape_key: shape for shape_key, shape in (await session.execute(query)).all()}
+
+    async def upsert_shape_descriptions(self, shapes: dict[str, str], expires_at: datetime | None = None) -> None:
+        if not shapes:
+            return
+        now = datetime.utcnow()
+        async with self.Session() as session:
+            statement = insert(ShapeDescriptionModel).values(
+                [
+                    {
+                        "shape_key": shape_key,
+                        "shape": shape,
+                        "expires_at": expires_at,
+                        "created_at": now,
+                        "modified_at": now,
+                    }
+                    for shape_key, shape in shapes.items()
+                ]
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[ShapeDescriptionModel.shape_key],
+                set_={
+                    "shape": statement.excluded.shape,
+                    "expires_at": statement.excluded.expires_at,
+                    "modified_at": now,
+                },
+            )
+            await session.execute(statement)
+            await session.commit()
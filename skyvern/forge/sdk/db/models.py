@@ -683,3 +683,16 @@ class CredentialModel(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     modified_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, nullable=False)
     deleted_at = Column(DateTime, nullable=True)
+
+
+class ShapeDescriptionModel(Base):
+    __tablename__ = "shape_descriptions"
+
+    # the svg/css shape cache key, e.g. skyvern:svg:<sha256 of the element html>
+    shape_key = Column(String, primary_key=True)
+    shape = Column(UnicodeText, nullable=False)
+    # only set for the unconvertible shapes, so they're retried later
+    expires_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    modified_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, nullable=False)
@@ -120,6 +120,9 @@ async def _save_log_artifacts(
 
         log_json = json.dumps(log, cls=SkyvernJSONLogEncoder, indent=2)
 
+        if settings.ENABLE_ARTIFACT_BATCHING:
+            # the log artifact created last time could still be in the queue
+            await app.ARTIFACT_MANAGER.flush_artifacts()
         log_artifact = await app.DATABASE.get_artifact_by_entity_id(
             artifact_type=ArtifactType.SKYVERN_LOG_RAW,
             step_id=step_id,
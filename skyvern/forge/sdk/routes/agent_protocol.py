@@ -81,6 +81,7 @@ from skyvern.forge.sdk.workflow.models.workflow import (
     WorkflowStatus,
 )
 from skyvern.forge.sdk.workflow.models.yaml import WorkflowCreateYAMLRequest
+from skyvern.forge.sdk.workflow.timeline import filter_workflow_run_timeline
 from skyvern.schemas.runs import (
     CUA_ENGINES,
     RunEngine,
@@ -566,6 +567,8 @@ async def get_artifacts(
         entity_type_to_param[entity_type]: entity_id,
     }
 
+    # the artifact rows created by the runs in this process could still be in the queue
+    await app.ARTIFACT_MANAGER.flush_artifacts()
     artifacts = await app.DATABASE.get_artifacts_by_entity_id(**params)  # type: ignore
 
     if settings.ENV != "local" or settings.GENERATE_PRESIGNED_URLS:
@@ -609,6 +612,8 @@ async def get_step_artifacts(
     :return: List of artifacts for a list of steps.
     """
     analytics.capture("skyvern-oss-agent-task-step-artifacts-get")
+    # the artifact rows created by the runs in this process could still be in the queue
+    await app.ARTIFACT_MANAGER.flush_artifacts()
     artifacts = await app.DATABASE.get_artifacts_for_task_step(
         task_id,
         step_id,
@@ -814,9 +819,16 @@ async def get_workflow_run_timeline(
     workflow_run_id: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1),
+    updated_after: datetime.datetime | None = Query(
+        None,
+        description="Only return the blocks, actions and thoughts modified after this time, with the ancestor blocks "
+        "of the modified blocks. Pass the latest modified_at of the previous response to poll for changes.",
+    ),
     current_org: Organization = Depends(org_auth_service.get_current_org),
 ) -> list[WorkflowRunTimeline]:
-    return await _flatten_workflow_run_timeline(current_org.organization_id, workflow_run_id)
+    return await _flatten_workflow_run_timeline(
+        current_org.organization_id, workflow_run_id, updated_after=updated_after
+    )
 
 
 @legacy_base_router.get(
@@ -1412,7 +1424,11 @@ async def get_task_v2(
     return task_v2.model_dump(by_alias=True)
 
 
-async def _flatten_workflow_run_timeline(organization_id: str, workflow_run_id: str) -> list[WorkflowRunTimeline]:
+async def _flatten_workflow_run_timeline(
+    organization_id: str,
+    workflow_run_id: str,
+    updated_after: datetime.datetime | None = None,
+) -> list[WorkflowRunTimeline]:
     """
     Get the timeline workflow runs including the nested workflow runs in a flattened list
     """
@@ -1458,6 +1474,9 @@ async def _flatten_workflow_run_timeline(organization_id: str, workflow_run_id:
         )
         final_workflow_run_block_timeline.extend(thought_timeline)
     final_workflow_run_block_timeline.sort(key=lambda x: x.created_at, reverse=True)
+    if updated_after:
+        # filtered after the flattening, so the changes in the nested workflow runs of unchanged task_v2 blocks are kept
+        return filter_workflow_run_timeline(final_workflow_run_block_timeline, updated_after)
     return final_workflow_run_block_timeline
 
 
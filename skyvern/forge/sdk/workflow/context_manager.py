@@ -1,5 +1,6 @@
 import copy
 import uuid
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any, Self
 
 import structlog
@@ -40,6 +41,12 @@ LOG = structlog.get_logger()
 
 BlockMetadata = dict[str, str | int | float | bool | dict | list]
 
+# workflow_run_id -> the WorkflowRunContext forked for the current asyncio task, see WorkflowContextManager.fork
+_forked_workflow_run_contexts: ContextVar[dict[str, "WorkflowRunContext"] | None] = ContextVar(
+    "forked_workflow_run_contexts",
+    default=None,
+)
+
 
 class WorkflowRunContext:
     @classmethod
@@ -113,6 +120,26 @@ class WorkflowRunContext:
         self.values: dict[str, Any] = {}
         self.secrets: dict[str, Any] = {}
 
+    def fork(self) -> "WorkflowRunContext":
+        """
+        Copy the context, so the values set on the copy don't leak into the other copies, e.g. for the concurrent loop
+        iterations. The secrets are shared.
+        """
+        forked_context = WorkflowRunContext()
+        forked_context.blocks_metadata = copy.deepcopy(self.blocks_metadata)
+        forked_context.parameters = copy.deepcopy(self.parameters)
+        forked_context.values = dict(self.values)
+        forked_context.secrets = self.secrets
+        return forked_context
+
+    def merge(self, forked_context: "WorkflowRunContext") -> None:
+        """
+        Bring the values and the parameters set on a forked context back.
+        """
+        self.blocks_metadata.update(forked_context.blocks_metadata)
+        self.parameters.update(forked_context.parameters)
+        self.values.update(forked_context.values)
+
     def get_parameter(self, key: str) -> Parameter:
         return self.parameters[key]
 
@@ -774,23 +801,35 @@ class WorkflowContextManager:
         return workflow_run_context
 
     def get_workflow_run_context(self, workflow_run_id: str) -> WorkflowRunContext:
+        forked_contexts = _forked_workflow_run_contexts.get()
+        if forked_contexts and workflow_run_id in forked_contexts:
+            return forked_contexts[workflow_run_id]
         self._validate_workflow_run_context(workflow_run_id)
         return self.workflow_run_contexts[workflow_run_id]
 
+    def fork_workflow_run_context(self, workflow_run_id: str) -> WorkflowRunContext:
+        """
+        Fork the context of the workflow run for the current asyncio task and the tasks it creates, the other tasks
+        keep using the original context. Call it at the beginning of a task, so the fork doesn't outlive it.
+        """
+        forked_context = self.get_workflow_run_context(workflow_run_id).fork()
+        forked_contexts = dict(_forked_workflow_run_contexts.get() or {})
+        forked_contexts[workflow_run_id] = forked_context
+        _forked_workflow_run_contexts.set(forked_contexts)
+        return forked_context
+
     async def register_block_parameters_for_workflow_run(
         self,
         workflow_run_id: str,
         parameters: list[PARAMETER_TYPE],
         organization: Organization,
     ) -> None:
-        self._validate_workflow_run_context(workflow_run_id)
-        await self.workflow_run_contexts[workflow_run_id].register_block_parameters(
+        await self.get_workflow_run_context(workflow_run_id).register_block_parameters(
             self.aws_client, parameters, organization
         )
 
     def add_context_parameter(self, workflow_run_id: str, context_parameter: ContextParameter) -> None:
-        self._validate_workflow_run_context(workflow_run_id)
-        self.workflow_run_contexts[workflow_run_id].parameters[context_parameter.key] = context_parameter
+        self.get_workflow_run_context(workflow_run_id).parameters[context_parameter.key] = context_parameter
 
     async def set_parameter_values_for_output_parameter_dependent_blocks(
         self,
@@ -798,8 +837,7 @@ class WorkflowContextManager:
         output_parameter: OutputParameter,
         value: dict[str, Any] | list | str | None,
     ) -> None:
-        self._validate_workflow_run_context(workflow_run_id)
-        await self.workflow_run_contexts[workflow_run_id].set_parameter_values_for_output_parameter_dependent_blocks(
+        await self.get_workflow_run_context(workflow_run_id).set_parameter_values_for_output_parameter_dependent_blocks(
             output_parameter,
             value,
         )
@@ -101,6 +101,11 @@ class InvalidFileType(BaseWorkflowHTTPException):
         )
 
 
+class ChunkedRowsNotFound(SkyvernException):
+    def __init__(self, artifact_id: str) -> None:
+        super().__init__(f"The chunk of parsed rows {artifact_id} is not found")
+
+
 class WorkflowParameterMissingRequiredValue(BaseWorkflowHTTPException):
     def __init__(self, workflow_parameter_type: str, workflow_parameter_key: str, required_value: str) -> None:
         super().__init__(
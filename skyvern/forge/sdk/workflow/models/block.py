@@ -4,17 +4,19 @@ import abc
 import ast
 import asyncio
 import csv
+import itertools
 import json
 import os
 import smtplib
 import textwrap
 import uuid
+import zipfile
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from email.message import EmailMessage
 from enum import StrEnum
 from pathlib import Path
-from typing import Annotated, Any, Awaitable, Callable, Literal, Union
+from typing import Annotated, Any, AsyncGenerator, Awaitable, Callable, Iterator, Literal, Union
 from urllib.parse import quote
 
 import filetype
@@ -23,7 +25,6 @@ from email_validator import EmailNotValidError, validate_email
 from jinja2 import Template
 from playwright.async_api import Page
 from pydantic import BaseModel, Field
-from pypdf import PdfReader
 from pypdf.errors import PdfReadError
 
 from skyvern.config import settings
@@ -55,6 +56,7 @@ from skyvern.forge.sdk.schemas.task_v2 import TaskV2Status
 from skyvern.forge.sdk.schemas.tasks import Task, TaskOutput, TaskStatus
 from skyvern.forge.sdk.workflow.context_manager import BlockMetadata, WorkflowRunContext
 from skyvern.forge.sdk.workflow.exceptions import (
+    ChunkedRowsNotFound,
     CustomizedCodeException,
     FailedToFormatJinjaStyleParameter,
     InsecureCodeDetected,
@@ -72,10 +74,17 @@ from skyvern.forge.sdk.workflow.models.parameter import (
     WorkflowParameter,
 )
 from skyvern.schemas.runs import RunEngine
+from skyvern.utils.pdf_extractor import extract_page_texts
+from skyvern.utils.token_counter import estimate_tokens
 from skyvern.utils.url_validators import prepend_scheme_and_validate_url
 from skyvern.webeye.browser_factory import BrowserState
 from skyvern.webeye.utils.page import SkyvernFrame
 
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
 LOG = structlog.get_logger()
 
 
@@ -818,6 +827,59 @@ class LoopBlockExecutedResult(BaseModel):
         return self.block_outputs[-1].failure_reason if len(self.block_outputs) > 0 else "No block has been executed"
 
 
+@dataclass
+class LoopIterationExecutedResult:
+    outputs_with_loop_value: list[dict[str, Any]]
+    block_outputs: list[BlockResult]
+    last_block: BlockTypeVar | None
+    # the block was canceled, or failed without continue_on_failure
+    stop_loop: bool = False
+
+
+class ChunkedRows(BaseModel):
+    """
+    The rows parsed by a streaming FileParserBlock. They're stored as newline-delimited json artifacts of
+    FILE_PARSER_CHUNK_SIZE rows instead of in the output parameter, and read back one chunk at a time.
+    """
+
+    type: Literal["chunked_rows"] = "chunked_rows"
+    organization_id: str
+    artifact_ids: list[str]
+    row_count: int
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    @classmethod
+    def from_value(cls, value: Any) -> ChunkedRows | None:
+        if isinstance(value, dict) and value.get("type") == "chunked_rows":
+            return cls.model_validate(value)
+        return None
+
+    async def iter_rows(self) -> AsyncGenerator[Any, None]:
+        for artifact_id in self.artifact_ids:
+            artifact = await app.DATABASE.get_artifact_by_id(artifact_id, self.organization_id)
+            data = await app.ARTIFACT_MANAGER.retrieve_artifact(artifact) if artifact else None
+            if data is None:
+                raise ChunkedRowsNotFound(artifact_id)
+            for line in data.decode("utf-8").splitlines():
+                if line:
+                    yield json.loads(line)
+
+
+async def enumerate_loop_over_values(
+    loop_over_values: list[Any] | ChunkedRows,
+) -> AsyncGenerator[tuple[int, Any], None]:
+    if isinstance(loop_over_values, ChunkedRows):
+        loop_idx = 0
+        async for loop_over_value in loop_over_values.iter_rows():
+            yield loop_idx, loop_over_value
+            loop_idx += 1
+    else:
+        for loop_idx, loop_over_value in enumerate(loop_over_values):
+            yield loop_idx, loop_over_value
+
+
 class ForLoopBlock(Block):
     block_type: Literal[BlockType.FOR_LOOP] = BlockType.FOR_LOOP
 
@@ -825,6 +887,9 @@ class ForLoopBlock(Block):
     loop_over: PARAMETER_TYPE | None = None
     loop_variable_reference: str | None = None
     complete_if_empty: bool = False
+    # run up to max_concurrency iterations at the same time, each in its own browser with its own copy of the workflow
+    # run context. 1 runs the iterations one after another in the browser of the workflow run
+    max_concurrency: int = Field(default=1, ge=1)
 
     def get_all_parameters(
         self,
@@ -839,9 +904,14 @@ class ForLoopBlock(Block):
                 parameters.add(parameter)
         return list(parameters)
 
-    def get_loop_block_context_parameters(self, workflow_run_id: str, loop_data: Any) -> list[ContextParameter]:
+    def get_loop_block_context_parameters(
+        self,
+        workflow_run_id: str,
+        loop_data: Any,
+        loop_blocks: list[BlockTypeVar] | None = None,
+    ) -> list[ContextParameter]:
         context_parameters = []
-        for loop_block in self.loop_blocks:
+        for loop_block in self.loop_blocks if loop_blocks is None else loop_blocks:
             # todo: handle the case where the loop_block is a ForLoopBlock
 
             all_parameters = loop_block.get_all_parameters(workflow_run_id)
@@ -871,7 +941,7 @@ class ForLoopBlock(Block):
 
         return context_parameters
 
-    def get_loop_over_parameter_values(self, workflow_run_context: WorkflowRunContext) -> list[Any]:
+    def get_loop_over_parameter_values(self, workflow_run_context: WorkflowRunContext) -> list[Any] | ChunkedRows:
         # parse the value from self.loop_variable_reference and then from self.loop_over
         if self.loop_variable_reference:
             value_template = f"{{{{ {self.loop_variable_reference.strip(' {}')} | tojson }}}}"
@@ -916,108 +986,256 @@ class ForLoopBlock(Block):
 
         if isinstance(parameter_value, list):
             return parameter_value
+        elif chunked_rows := ChunkedRows.from_value(parameter_value):
+            # the rows are read lazily by the iterations
+            return chunked_rows
         else:
             # TODO (kerem): Should we raise an error here?
             return [parameter_value]
 
+    async def execute_loop_iteration(
+        self,
+        workflow_run_id: str,
+        workflow_run_block_id: str,
+        workflow_run_context: WorkflowRunContext,
+        loop_blocks: list[BlockTypeVar],
+        loop_idx: int,
+        loop_over_value: Any,
+        organization_id: str | None = None,
+    ) -> LoopIterationExecutedResult:
+        context_parameters_with_value = self.get_loop_block_context_parameters(
+            workflow_run_id, loop_over_value, loop_blocks=loop_blocks
+        )
+        for context_parameter in context_parameters_with_value:
+            workflow_run_context.set_value(context_parameter.key, context_parameter.value)
+
+        iteration_result = LoopIterationExecutedResult(outputs_with_loop_value=[], block_outputs=[], last_block=None)
+        for block_idx, loop_block in enumerate(loop_blocks):
+            metadata: BlockMetadata = {
+                "current_index": loop_idx,
+                "current_value": loop_over_value,
+            }
+            workflow_run_context.update_block_metadata(loop_block.label, metadata)
+
+            original_loop_block = loop_block
+            loop_block = loop_block.copy()
+            iteration_result.last_block = loop_block
+
+            block_output = await loop_block.execute_safe(
+                workflow_run_id=workflow_run_id,
+                parent_workflow_run_block_id=workflow_run_block_id,
+                organization_id=organization_id,
+            )
+
+            output_value = (
+                workflow_run_context.get_value(block_output.output_parameter.key)
+                if workflow_run_context.has_value(block_output.output_parameter.key)
+                else None
+            )
+            iteration_result.outputs_with_loop_value.append(
+                {
+                    "loop_value": loop_over_value,
+                    "output_parameter": block_output.output_parameter,
+                    "output_value": output_value,
+                }
+            )
+            try:
+                if block_output.workflow_run_block_id:
+                    await app.DATABASE.update_workflow_run_block(
+                        workflow_run_block_id=block_output.workflow_run_block_id,
+                        organization_id=organization_id,
+                        current_value=str(loop_over_value),
+                        current_index=loop_idx,
+                    )
+            except Exception:
+                LOG.warning(
+                    "Failed to update workflow run block",
+                    workflow_run_block_id=block_output.workflow_run_block_id,
+                    loop_over_value=loop_over_value,
+                    loop_idx=loop_idx,
+                )
+            loop_block = original_loop_block
+            iteration_result.block_outputs.append(block_output)
+            if block_output.status == BlockStatus.canceled:
+                LOG.info(
+                    f"ForLoopBlock: Block with type {loop_block.block_type} at index {block_idx} during loop {loop_idx} was canceled for workflow run {workflow_run_id}, canceling for loop",
+                    block_type=loop_block.block_type,
+                    workflow_run_id=workflow_run_id,
+                    block_idx=block_idx,
+                    block_result=iteration_result.block_outputs,
+                )
+                iteration_result.stop_loop = True
+                return iteration_result
+
+            if not block_output.success and not loop_block.continue_on_failure:
+                LOG.info(
+                    f"ForLoopBlock: Encountered a failure processing block {block_idx} during loop {loop_idx}, terminating early",
+                    block_outputs=iteration_result.block_outputs,
+                    loop_idx=loop_idx,
+                    block_idx=block_idx,
+                    loop_over_value=loop_over_value,
+                    loop_block_continue_on_failure=loop_block.continue_on_failure,
+                    failure_reason=block_output.failure_reason,
+                )
+                iteration_result.stop_loop = True
+                return iteration_result
+
+        return iteration_result
+
     async def execute_loop_helper(
         self,
         workflow_run_id: str,
         workflow_run_block_id: str,
         workflow_run_context: WorkflowRunContext,
-        loop_over_values: list[Any],
+        loop_over_values: list[Any] | ChunkedRows,
         organization_id: str | None = None,
     ) -> LoopBlockExecutedResult:
+        if self.max_concurrency > 1 and len(loop_over_values) > 1:
+            return await self.execute_loop_concurrently(
+                workflow_run_id=workflow_run_id,
+                workflow_run_block_id=workflow_run_block_id,
+                workflow_run_context=workflow_run_context,
+                loop_over_values=loop_over_values,
+                organization_id=organization_id,
+            )
+
         outputs_with_loop_values: list[list[dict[str, Any]]] = []
         block_outputs: list[BlockResult] = []
         current_block: BlockTypeVar | None = None
 
-        for loop_idx, loop_over_value in enumerate(loop_over_values):
-            context_parameters_with_value = self.get_loop_block_context_parameters(workflow_run_id, loop_over_value)
-            for context_parameter in context_parameters_with_value:
-                workflow_run_context.set_value(context_parameter.key, context_parameter.value)
-
-            each_loop_output_values: list[dict[str, Any]] = []
-            for block_idx, loop_block in enumerate(self.loop_blocks):
-                metadata: BlockMetadata = {
-                    "current_index": loop_idx,
-                    "current_value": loop_over_value,
-                }
-                workflow_run_context.update_block_metadata(loop_block.label, metadata)
+        async for loop_idx, loop_over_value in enumerate_loop_over_values(loop_over_values):
+            iteration_result = await self.execute_loop_iteration(
+                workflow_run_id=workflow_run_id,
+                workflow_run_block_id=workflow_run_block_id,
+                workflow_run_context=workflow_run_context,
+                loop_blocks=self.loop_blocks,
+                loop_idx=loop_idx,
+                loop_over_value=loop_over_value,
+                organization_id=organization_id,
+            )
+            outputs_with_loop_values.append(iteration_result.outputs_with_loop_value)
+            block_outputs.extend(iteration_result.block_outputs)
+            current_block = iteration_result.last_block or current_block
+            if iteration_result.stop_loop:
+                break
 
-                original_loop_block = loop_block
-                loop_block = loop_block.copy()
-                current_block = loop_block
+        return LoopBlockExecutedResult(
+            outputs_with_loop_values=outputs_with_loop_values,
+            block_outputs=block_outputs,
+            last_block=current_block,
+        )
 
-                block_output = await loop_block.execute_safe(
+    async def execute_loop_concurrently(
+        self,
+        workflow_run_id: str,
+        workflow_run_block_id: str,
+        workflow_run_context: WorkflowRunContext,
+        loop_over_values: list[Any] | ChunkedRows,
+        organization_id: str | None = None,
+    ) -> LoopBlockExecutedResult:
+        """
+        Run up to max_concurrency iterations at the same time. Each iteration runs in its own asyncio task with its own
+        browser state, skyvern context and fork of the workflow run context, and the forks are merged back in the
+        order of the iterations. Like the sequential loop, no iteration is started after one stopped the loop.
+        """
+        workflow_run = await app.DATABASE.get_workflow_run(workflow_run_id, organization_id=organization_id)
+        # the iterations start from the page the workflow run is on
+        start_url: str | None = None
+        if browser_state := app.BROWSER_MANAGER.get_for_workflow_run(workflow_run_id):
+            working_page = await browser_state.get_working_page()
+            if working_page and working_page.url != "about:blank":
+                start_url = working_page.url
+
+        iteration_results: list[LoopIterationExecutedResult | None] = [None] * len(loop_over_values)
+        forked_contexts: list[WorkflowRunContext | None] = [None] * len(loop_over_values)
+        stop_loop = asyncio.Event()
+        # the values are pulled by the workers one at a time, so the chunked rows are never loaded all at once
+        loop_over_value_iterator = enumerate_loop_over_values(loop_over_values)
+        loop_over_value_lock = asyncio.Lock()
+
+        async def run_iteration(loop_idx: int, loop_over_value: Any) -> LoopIterationExecutedResult:
+            browser_state_key = f"{workflow_run_id}_{workflow_run_block_id}_{loop_idx}"
+            context = skyvern_context.current()
+            skyvern_context.set(
+                replace(
+                    context,
+                    task_id=None,
+                    browser_state_key=browser_state_key,
+                    hashed_href_map={},
+                    refresh_working_page=False,
+                    frame_index_map={},
+                    element_hash_cache={},
+                )
+                if context
+                else skyvern_context.SkyvernContext(
+                    organization_id=organization_id,
+                    workflow_run_id=workflow_run_id,
+                    browser_state_key=browser_state_key,
+                )
+            )
+            forked_context = app.WORKFLOW_CONTEXT_MANAGER.fork_workflow_run_context(workflow_run_id)
+            forked_contexts[loop_idx] = forked_context
+            try:
+                if workflow_run:
+                    await app.BROWSER_MANAGER.get_or_create_for_workflow_run(workflow_run=workflow_run, url=start_url)
+                return await self.execute_loop_iteration(
                     workflow_run_id=workflow_run_id,
-                    parent_workflow_run_block_id=workflow_run_block_id,
+                    workflow_run_block_id=workflow_run_block_id,
+                    workflow_run_context=forked_context,
+                    loop_blocks=[loop_block.model_copy(deep=True) for loop_block in self.loop_blocks],
+                    loop_idx=loop_idx,
+                    loop_over_value=loop_over_value,
                     organization_id=organization_id,
                 )
+            finally:
+                if workflow_run:
+                    await app.WORKFLOW_SERVICE.clean_up_browser_state(browser_state_key, workflow_run)
+                else:
+                    await app.BROWSER_MANAGER.cleanup_for_browser_state_key(browser_state_key)
+
+        async def worker() -> None:
+            while not stop_loop.is_set():
+                async with loop_over_value_lock:
+                    next_loop_over_value = await anext(loop_over_value_iterator, None)
+                if next_loop_over_value is None:
+                    return
+                loop_idx, loop_over_value = next_loop_over_value
+                # a task per iteration, so the context set by the iteration stays in the iteration
+                iteration_result = await asyncio.create_task(run_iteration(loop_idx, loop_over_value))
+                iteration_results[loop_idx] = iteration_result
+                if iteration_result.stop_loop:
+                    stop_loop.set()
 
-                output_value = (
-                    workflow_run_context.get_value(block_output.output_parameter.key)
-                    if workflow_run_context.has_value(block_output.output_parameter.key)
-                    else None
-                )
-                each_loop_output_values.append(
-                    {
-                        "loop_value": loop_over_value,
-                        "output_parameter": block_output.output_parameter,
-                        "output_value": output_value,
-                    }
-                )
-                try:
-                    if block_output.workflow_run_block_id:
-                        await app.DATABASE.update_workflow_run_block(
-                            workflow_run_block_id=block_output.workflow_run_block_id,
-                            organization_id=organization_id,
-                            current_value=str(loop_over_value),
-                            current_index=loop_idx,
-                        )
-                except Exception:
-                    LOG.warning(
-                        "Failed to update workflow run block",
-                        workflow_run_block_id=block_output.workflow_run_block_id,
-                        loop_over_value=loop_over_value,
-                        loop_idx=loop_idx,
-                    )
-                loop_block = original_loop_block
-                block_outputs.append(block_output)
-                if block_output.status == BlockStatus.canceled:
-                    LOG.info(
-                        f"ForLoopBlock: Block with type {loop_block.block_type} at index {block_idx} during loop {loop_idx} was canceled for workflow run {workflow_run_id}, canceling for loop",
-                        block_type=loop_block.block_type,
-                        workflow_run_id=workflow_run_id,
-                        block_idx=block_idx,
-                        block_result=block_outputs,
-                    )
-                    outputs_with_loop_values.append(each_loop_output_values)
-                    return LoopBlockExecutedResult(
-                        outputs_with_loop_values=outputs_with_loop_values,
-                        block_outputs=block_outputs,
-                        last_block=current_block,
-                    )
+        LOG.info(
+            "Executing the loop iterations concurrently",
+            workflow_run_id=workflow_run_id,
+            num_loop_over_values=len(loop_over_values),
+            max_concurrency=self.max_concurrency,
+        )
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(min(self.max_concurrency, len(loop_over_values))):
+                    task_group.create_task(worker())
+        finally:
+            await loop_over_value_iterator.aclose()
 
-                if not block_output.success and not loop_block.continue_on_failure:
-                    LOG.info(
-                        f"ForLoopBlock: Encountered a failure processing block {block_idx} during loop {loop_idx}, terminating early",
-                        block_outputs=block_outputs,
-                        loop_idx=loop_idx,
-                        block_idx=block_idx,
-                        loop_over_value=loop_over_value,
-                        loop_block_continue_on_failure=loop_block.continue_on_failure,
-                        failure_reason=block_output.failure_reason,
-                    )
-                    outputs_with_loop_values.append(each_loop_output_values)
-                    return LoopBlockExecutedResult(
-                        outputs_with_loop_values=outputs_with_loop_values,
-                        block_outputs=block_outputs,
-                        last_block=current_block,
-                    )
+        for forked_context in forked_contexts:
+            if forked_context is not None:
+                workflow_run_context.merge(forked_context)
 
-            outputs_with_loop_values.append(each_loop_output_values)
+        executed_results = [iteration_result for iteration_result in iteration_results if iteration_result is not None]
+        outputs_with_loop_values = [iteration_result.outputs_with_loop_value for iteration_result in executed_results]
+        # the loop ends with the first iteration that stopped it, so the status of the loop is the same as sequentially
+        stopped_results = [iteration_result for iteration_result in executed_results if iteration_result.stop_loop]
+        if stopped_results:
+            executed_results.remove(stopped_results[0])
+            executed_results.append(stopped_results[0])
 
+        current_block: BlockTypeVar | None = None
+        block_outputs: list[BlockResult] = []
+        for iteration_result in executed_results:
+            block_outputs.extend(iteration_result.block_outputs)
+            current_block = iteration_result.last_block or current_block
         return LoopBlockExecutedResult(
             outputs_with_loop_values=outputs_with_loop_values,
             block_outputs=block_outputs,
@@ -1047,7 +1265,8 @@ class ForLoopBlock(Block):
         await app.DATABASE.update_workflow_run_block(
             workflow_run_block_id=workflow_run_block_id,
             organization_id=organization_id,
-            loop_values=loop_over_values,
+            # the chunked rows are too large to be stored with the block
+            loop_values=loop_over_values if isinstance(loop_over_values, list) else None,
         )
 
         LOG.info(
@@ -2084,6 +2303,8 @@ class SendEmailBlock(Block):
 
 class FileType(StrEnum):
     CSV = "csv"
+    TSV = "tsv"
+    EXCEL = "excel"
 
 
 class FileParserBlock(Block):
@@ -2091,6 +2312,8 @@ class FileParserBlock(Block):
 
     file_url: str
     file_type: FileType
+    # store the rows as chunked artifacts instead of in the output parameter, for the files too large to keep in memory
+    streaming: bool = False
 
     def get_all_parameters(
         self,
@@ -2107,12 +2330,73 @@ class FileParserBlock(Block):
         )
 
     def validate_file_type(self, file_url_used: str, file_path: str) -> None:
-        if self.file_type == FileType.CSV:
+        if self.file_type in (FileType.CSV, FileType.TSV):
             try:
                 with open(file_path, "r") as file:
-                    csv.Sniffer().sniff(file.read(1024))
+                    csv.Sniffer().sniff(file.read(1024), delimiters="\t" if self.file_type == FileType.TSV else None)
             except csv.Error as e:
                 raise InvalidFileType(file_url=file_url_used, file_type=self.file_type, error=str(e))
+        elif self.file_type == FileType.EXCEL:
+            if openpyxl is None:
+                raise InvalidFileType(
+                    file_url=file_url_used, file_type=self.file_type, error="openpyxl is required to parse excel files"
+                )
+            if not zipfile.is_zipfile(file_path):
+                raise InvalidFileType(file_url=file_url_used, file_type=self.file_type, error="not an xlsx file")
+
+    def iter_rows(self, file_path: str) -> Iterator[dict[str, Any]]:
+        """
+        Parse the file lazily into dictionaries where each dictionary represents a row in the file.
+        """
+        if self.file_type == FileType.EXCEL:
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    return
+                keys = ["" if cell is None else str(cell) for cell in header]
+                for row in rows:
+                    if all(cell is None for cell in row):
+                        continue
+                    # the same string values as the csv rows
+                    yield {key: "" if cell is None else str(cell) for key, cell in zip(keys, row)}
+            finally:
+                workbook.close()
+            return
+
+        with open(file_path, "r") as file:
+            yield from csv.DictReader(file, delimiter="\t" if self.file_type == FileType.TSV else ",")
+
+    async def store_rows_in_chunks(self, rows: Iterator[dict[str, Any]], workflow_run_block_id: str) -> ChunkedRows:
+        workflow_run_block = await app.DATABASE.get_workflow_run_block(workflow_run_block_id)
+        if workflow_run_block.organization_id is None:
+            raise ValueError("The workflow run block has no organization")
+
+        chunked_rows = ChunkedRows(organization_id=workflow_run_block.organization_id, artifact_ids=[], row_count=0)
+
+        def read_chunk() -> list[str]:
+            return [json.dumps(row) for row in itertools.islice(rows, settings.FILE_PARSER_CHUNK_SIZE)]
+
+        while True:
+            # the file is parsed in a thread, so a large file doesn't block the event loop
+            chunk = await asyncio.to_thread(read_chunk)
+            if not chunk:
+                break
+            chunked_rows.row_count += len(chunk)
+            chunked_rows.artifact_ids.append(
+                await app.ARTIFACT_MANAGER.create_workflow_run_block_artifact(
+                    workflow_run_block=workflow_run_block,
+                    artifact_type=ArtifactType.PARSED_ROWS,
+                    data="\n".join(chunk).encode("utf-8"),
+                )
+            )
+            # wait for the upload, so only one chunk is held in memory
+            await app.ARTIFACT_MANAGER.wait_for_upload_aiotasks([workflow_run_block_id])
+            if len(chunk) < settings.FILE_PARSER_CHUNK_SIZE:
+                break
+
+        return chunked_rows
 
     async def execute(
         self,
@@ -2157,12 +2441,18 @@ class FileParserBlock(Block):
         # Validate the file type
         self.validate_file_type(self.file_url, file_path)
         # Parse the file into a list of dictionaries where each dictionary represents a row in the file
-        parsed_data = []
-        with open(file_path, "r") as file:
-            if self.file_type == FileType.CSV:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    parsed_data.append(row)
+        parsed_data: list[dict[str, Any]] | dict[str, Any]
+        if self.streaming:
+            chunked_rows = await self.store_rows_in_chunks(self.iter_rows(file_path), workflow_run_block_id)
+            LOG.info(
+                "FileParserBlock: Stored the parsed rows in chunks",
+                workflow_run_id=workflow_run_id,
+                row_count=chunked_rows.row_count,
+                chunk_count=len(chunked_rows.artifact_ids),
+            )
+            parsed_data = chunked_rows.model_dump()
+        else:
+            parsed_data = list(self.iter_rows(file_path))
         # Record the parsed data
         await self.record_output_parameter_value(workflow_run_context, workflow_run_id, parsed_data)
         return await self.build_block_result(
@@ -2195,6 +2485,60 @@ class PDFParserBlock(Block):
             self.file_url, workflow_run_context
         )
 
+    @staticmethod
+    def split_pages_into_chunks(page_texts: list[str]) -> list[list[str]]:
+        """
+        Group the consecutive pages into chunks of up to PDF_PARSER_CHUNK_MAX_TOKENS estimated tokens. A page longer
+        than that is a chunk on its own.
+        """
+        chunks: list[list[str]] = []
+        chunk_tokens = 0
+        for page_text in page_texts:
+            page_tokens = estimate_tokens(page_text)
+            if not chunks or chunk_tokens + page_tokens > settings.PDF_PARSER_CHUNK_MAX_TOKENS:
+                chunks.append([])
+                chunk_tokens = 0
+            chunks[-1].append(page_text)
+            chunk_tokens += page_tokens
+        return chunks
+
+    async def extract_information_from_chunk(
+        self, page_texts: list[str], chunk_idx: int, chunk_count: int
+    ) -> dict[str, Any]:
+        """
+        Extract the information of a chunk of pages. The llm api handler caches the response when the response cache
+        is enabled for the prompt.
+        """
+        prompt_name = "extract-information-from-file-text"
+        llm_prompt = prompt_engine.load_prompt(
+            prompt_name,
+            extracted_text_content="".join(f"{page_text}\n" for page_text in page_texts),
+            json_schema=self.json_schema,
+            chunk_index=chunk_idx + 1,
+            chunk_count=chunk_count,
+        )
+        return await app.LLM_API_HANDLER(prompt=llm_prompt, prompt_name=prompt_name)
+
+    async def extract_information_in_chunks(self, page_chunks: list[list[str]]) -> dict[str, Any]:
+        """
+        Extract the information of each chunk concurrently, then have the llm merge the results against the schema.
+        """
+        semaphore = asyncio.Semaphore(settings.PDF_PARSER_MAX_CONCURRENT_LLM_CALLS)
+
+        async def extract_chunk(chunk_idx: int, page_texts: list[str]) -> dict[str, Any]:
+            async with semaphore:
+                return await self.extract_information_from_chunk(page_texts, chunk_idx, len(page_chunks))
+
+        chunk_responses = await asyncio.gather(
+            *(extract_chunk(chunk_idx, page_texts) for chunk_idx, page_texts in enumerate(page_chunks))
+        )
+        llm_prompt = prompt_engine.load_prompt(
+            "merge-information-extracted-from-file-text",
+            json_schema=self.json_schema,
+            extracted_information_list=chunk_responses,
+        )
+        return await app.LLM_API_HANDLER(prompt=llm_prompt, prompt_name="merge-information-extracted-from-file-text")
+
     async def execute(
         self,
         workflow_run_id: str,
@@ -2237,13 +2581,8 @@ class PDFParserBlock(Block):
         else:
             file_path = await download_file(self.file_url)
 
-        extracted_text = ""
         try:
-            reader = PdfReader(file_path)
-            page_count = len(reader.pages)
-            for i in range(page_count):
-                extracted_text += reader.pages[i].extract_text() + "\n"
-
+            page_texts = await extract_page_texts(file_path)
         except PdfReadError:
             return await self.build_block_result(
                 success=False,
@@ -2265,10 +2604,25 @@ class PDFParserBlock(Block):
                 },
             }
 
-        llm_prompt = prompt_engine.load_prompt(
-            "extract-information-from-file-text", extracted_text_content=extracted_text, json_schema=self.json_schema
-        )
-        llm_response = await app.LLM_API_HANDLER(prompt=llm_prompt, prompt_name="extract-information-from-file-text")
+        page_chunks = self.split_pages_into_chunks(page_texts)
+        if len(page_chunks) > 1:
+            LOG.info(
+                "PDFParserBlock: Extracting the information in chunks",
+                workflow_run_id=workflow_run_id,
+                page_count=len(page_texts),
+                chunk_count=len(page_chunks),
+            )
+            llm_response = await self.extract_information_in_chunks(page_chunks)
+        else:
+            extracted_text = "".join(f"{page_text}\n" for page_text in page_texts)
+            llm_prompt = prompt_engine.load_prompt(
+                "extract-information-from-file-text",
+                extracted_text_content=extracted_text,
+                json_schema=self.json_schema,
+            )
+            llm_response = await app.LLM_API_HANDLER(
+                prompt=llm_prompt, prompt_name="extract-information-from-file-text"
+            )
         # Record the parsed data
         await self.record_output_parameter_value(workflow_run_context, workflow_run_id, llm_response)
         return await self.build_block_result(
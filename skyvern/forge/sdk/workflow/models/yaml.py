@@ -156,6 +156,7 @@ class ForLoopBlockYAML(BlockYAML):
     loop_over_parameter_key: str = ""
     loop_variable_reference: str | None = None
     complete_if_empty: bool = False
+    max_concurrency: int = Field(default=1, ge=1)
 
 
 class CodeBlockYAML(BlockYAML):
@@ -235,6 +236,7 @@ class FileParserBlockYAML(BlockYAML):
 
     file_url: str
     file_type: FileType
+    streaming: bool = False
 
 
 class PDFParserBlockYAML(BlockYAML):
@@ -0,0 +1,120 @@
+import asyncio
+import re
+from dataclasses import dataclass
+
+import structlog
+
+from skyvern.forge.sdk.workflow.models.block import BlockType, BlockTypeVar
+from skyvern.forge.sdk.workflow.models.parameter import ContextParameter, OutputParameter
+from skyvern.forge.sdk.workflow.models.workflow import WorkflowRunStatus
+
+LOG = structlog.get_logger()
+
+# the blocks that don't touch the browser or the downloaded files of the workflow run, so they can run alongside the
+# other blocks as soon as the blocks they depend on are done. The send email and the download to s3 blocks read the
+# download directory of the workflow run, so they're kept in order with the browser blocks
+BROWSER_INDEPENDENT_BLOCK_TYPES = {
+    BlockType.TEXT_PROMPT,
+    BlockType.FILE_URL_PARSER,
+    BlockType.PDF_PARSER,
+}
+
+
+@dataclass
+class WorkflowRunStop:
+    status: WorkflowRunStatus
+    failure_reason: str | None = None
+    # the status is already set, e.g. by the cancel request
+    marked: bool = False
+    need_call_webhook: bool = True
+
+
+class WorkflowRunStatusSignal:
+    """
+    Notifies the workflow runs executing in this process when they're canceled or timed out, instead of having them
+    poll the database before every block. The status set by the other processes is still picked up by polling, see
+    WORKFLOW_RUN_STATUS_POLL_INTERVAL_SECONDS.
+    """
+
+    _events: dict[str, asyncio.Event] = {}
+    _statuses: dict[str, WorkflowRunStatus] = {}
+
+    @classmethod
+    def subscribe(cls, workflow_run_id: str) -> asyncio.Event:
+        if workflow_run_id not in cls._events:
+            cls._events[workflow_run_id] = asyncio.Event()
+        return cls._events[workflow_run_id]
+
+    @classmethod
+    def unsubscribe(cls, workflow_run_id: str) -> None:
+        cls._events.pop(workflow_run_id, None)
+        cls._statuses.pop(workflow_run_id, None)
+
+    @classmethod
+    def publish(cls, workflow_run_id: str, status: WorkflowRunStatus) -> None:
+        event = cls._events.get(workflow_run_id)
+        if event is None:
+            # the workflow run isn't executing in this process
+            return
+        cls._statuses[workflow_run_id] = status
+        event.set()
+
+    @classmethod
+    def get_status(cls, workflow_run_id: str) -> WorkflowRunStatus | None:
+        return cls._statuses.get(workflow_run_id)
+
+
+def _get_parameter_source_keys(parameter: object) -> set[str]:
+    keys: set[str] = set()
+    while isinstance(parameter, (ContextParameter, OutputParameter)):
+        keys.add(parameter.key)
+        parameter = parameter.source if isinstance(parameter, ContextParameter) else None
+    return keys
+
+
+def get_block_dependencies(blocks: list[BlockTypeVar], workflow_run_id: str) -> list[set[int]]:
+    """
+    Get the indices of the blocks each block has to wait for. A block depends on:
+    - the blocks whose output parameters are in its parameters, directly or as the source of a context parameter
+    - the blocks whose label or output parameter key shows up in its definition, e.g. in a jinja template
+    - the last block before it using the browser, so the browser blocks keep their order, and the other blocks see
+      the page and the downloaded files they would have seen in order
+    """
+    output_key_to_idx: dict[str, int] = {}
+    reference_patterns: list[re.Pattern[str]] = []
+    for block in blocks:
+        output_key_to_idx[block.output_parameter.key] = len(reference_patterns)
+        reference_patterns.append(
+            re.compile(rf"(?<!\w)({re.escape(block.label)}|{re.escape(block.output_parameter.key)})(?!\w)")
+        )
+
+    dependencies: list[set[int]] = []
+    last_browser_block_idx: int | None = None
+    for block_idx, block in enumerate(blocks):
+        block_dependencies: set[int] = set()
+        try:
+            for parameter in block.get_all_parameters(workflow_run_id):
+                for key in _get_parameter_source_keys(parameter):
+                    if key in output_key_to_idx:
+                        block_dependencies.add(output_key_to_idx[key])
+            definition = block.model_dump_json(exclude={"label", "output_parameter"})
+            for other_idx, pattern in enumerate(reference_patterns[:block_idx]):
+                if pattern.search(definition):
+                    block_dependencies.add(other_idx)
+        except Exception:
+            LOG.warning(
+                "Failed to get the dependencies of the block, waiting for all the blocks before it",
+                workflow_run_id=workflow_run_id,
+                block_label=block.label,
+                exc_info=True,
+            )
+            block_dependencies = set(range(block_idx))
+
+        if last_browser_block_idx is not None:
+            block_dependencies.add(last_browser_block_idx)
+        if block.block_type not in BROWSER_INDEPENDENT_BLOCK_TYPES:
+            last_browser_block_idx = block_idx
+        # a block can only wait for the blocks defined before it
+        dependencies.append({idx for idx in block_dependencies if idx < block_idx})
+
+    return dependencies
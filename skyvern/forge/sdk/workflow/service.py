@@ -1,5 +1,6 @@
 import asyncio
 import json
+import time
 from datetime import UTC, datetime
 from typing import Any
 
@@ -26,7 +27,7 @@ from skyvern.forge.sdk.models import Step, StepStatus
 from skyvern.forge.sdk.schemas.files import FileInfo
 from skyvern.forge.sdk.schemas.organizations import Organization
 from skyvern.forge.sdk.schemas.tasks import Task
-from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock, WorkflowRunTimeline, WorkflowRunTimelineType
+from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunTimeline
 from skyvern.forge.sdk.workflow.exceptions import (
     ContextParameterSourceNotDefined,
     InvalidWaitBlockTime,
@@ -90,6 +91,8 @@ from skyvern.forge.sdk.workflow.models.yaml import (
     WorkflowCreateYAMLRequest,
     WorkflowDefinitionYAML,
 )
+from skyvern.forge.sdk.workflow.scheduler import WorkflowRunStatusSignal, WorkflowRunStop, get_block_dependencies
+from skyvern.forge.sdk.workflow.timeline import WorkflowRunTimelineCache, build_workflow_run_timeline
 from skyvern.schemas.runs import ProxyLocation
 from skyvern.webeye.browser_factory import BrowserState
 
@@ -280,222 +283,38 @@ class WorkflowService:
 
         # Execute workflow blocks
         blocks = workflow.workflow_definition.blocks
-        blocks_cnt = len(blocks)
-        block_result = None
-        for block_idx, block in enumerate(blocks):
-            try:
-                refreshed_workflow_run = await app.DATABASE.get_workflow_run(
-                    workflow_run_id=workflow_run.workflow_run_id,
-                    organization_id=organization_id,
-                )
-                if refreshed_workflow_run and refreshed_workflow_run.status == WorkflowRunStatus.canceled:
-                    LOG.info(
-                        "Workflow run is canceled, stopping execution inside workflow execution loop",
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_type=block.block_type,
-                        block_label=block.label,
-                    )
-                    await self.clean_up_workflow(
-                        workflow=workflow,
-                        workflow_run=workflow_run,
-                        api_key=api_key,
-                        need_call_webhook=True,
-                        close_browser_on_completion=browser_session_id is None,
-                        browser_session_id=browser_session_id,
-                    )
-                    return workflow_run
-
-                if refreshed_workflow_run and refreshed_workflow_run.status == WorkflowRunStatus.timed_out:
-                    LOG.info(
-                        "Workflow run is timed out, stopping execution inside workflow execution loop",
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_type=block.block_type,
-                        block_label=block.label,
-                    )
-                    await self.clean_up_workflow(
-                        workflow=workflow,
-                        workflow_run=workflow_run,
-                        api_key=api_key,
-                        need_call_webhook=True,
-                        close_browser_on_completion=browser_session_id is None,
-                        browser_session_id=browser_session_id,
-                    )
-                    return workflow_run
-
-                parameters = block.get_all_parameters(workflow_run_id)
-                await app.WORKFLOW_CONTEXT_MANAGER.register_block_parameters_for_workflow_run(
-                    workflow_run_id, parameters, organization
-                )
-                LOG.info(
-                    f"Executing root block {block.block_type} at index {block_idx}/{blocks_cnt - 1} for workflow run {workflow_run_id}",
-                    block_type=block.block_type,
-                    workflow_run_id=workflow_run.workflow_run_id,
-                    block_idx=block_idx,
-                    block_type_var=block.block_type,
-                    block_label=block.label,
-                )
-                block_result = await block.execute_safe(
-                    workflow_run_id=workflow_run_id,
-                    organization_id=organization_id,
-                    browser_session_id=browser_session_id,
-                )
-                if block_result.status == BlockStatus.canceled:
-                    LOG.info(
-                        f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} was canceled for workflow run {workflow_run_id}, cancelling workflow run",
-                        block_type=block.block_type,
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_result=block_result,
-                        block_type_var=block.block_type,
-                        block_label=block.label,
-                    )
+        if settings.ENABLE_WORKFLOW_DAG_SCHEDULER:
+            block_dependencies = get_block_dependencies(blocks, workflow_run_id)
+        else:
+            block_dependencies = [{block_idx - 1} if block_idx > 0 else set() for block_idx in range(len(blocks))]
+        workflow_run_stop = await self.execute_workflow_blocks(
+            workflow_run=workflow_run,
+            organization=organization,
+            blocks=blocks,
+            block_dependencies=block_dependencies,
+            browser_session_id=browser_session_id,
+        )
+        if workflow_run_stop is not None:
+            if not workflow_run_stop.marked:
+                if workflow_run_stop.status == WorkflowRunStatus.canceled:
                     await self.mark_workflow_run_as_canceled(workflow_run_id=workflow_run.workflow_run_id)
-                    # We're not sending a webhook here because the workflow run is manually marked as canceled.
-                    await self.clean_up_workflow(
-                        workflow=workflow,
-                        workflow_run=workflow_run,
-                        api_key=api_key,
-                        need_call_webhook=False,
-                        close_browser_on_completion=browser_session_id is None,
-                        browser_session_id=browser_session_id,
-                    )
-                    return workflow_run
-                elif block_result.status == BlockStatus.failed:
-                    LOG.error(
-                        f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} failed for workflow run {workflow_run_id}",
-                        block_type=block.block_type,
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_result=block_result,
-                        block_type_var=block.block_type,
-                        block_label=block.label,
-                    )
-                    if not block.continue_on_failure:
-                        failure_reason = (
-                            f"{block.block_type} block failed. failure reason: {block_result.failure_reason}"
-                        )
-                        await self.mark_workflow_run_as_failed(
-                            workflow_run_id=workflow_run.workflow_run_id, failure_reason=failure_reason
-                        )
-                        await self.clean_up_workflow(
-                            workflow=workflow,
-                            workflow_run=workflow_run,
-                            api_key=api_key,
-                            close_browser_on_completion=browser_session_id is None,
-                            browser_session_id=browser_session_id,
-                        )
-                        return workflow_run
-
-                    LOG.warning(
-                        f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} failed but will continue executing the workflow run {workflow_run_id}",
-                        block_type=block.block_type,
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_result=block_result,
-                        continue_on_failure=block.continue_on_failure,
-                        block_type_var=block.block_type,
-                        block_label=block.label,
-                    )
-
-                elif block_result.status == BlockStatus.terminated:
-                    LOG.info(
-                        f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} was terminated for workflow run {workflow_run_id}, marking workflow run as terminated",
-                        block_type=block.block_type,
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_result=block_result,
-                        block_type_var=block.block_type,
-                        block_label=block.label,
-                    )
-
-                    if not block.continue_on_failure:
-                        failure_reason = f"{block.block_type} block terminated. Reason: {block_result.failure_reason}"
-                        await self.mark_workflow_run_as_terminated(
-                            workflow_run_id=workflow_run.workflow_run_id, failure_reason=failure_reason
-                        )
-                        await self.clean_up_workflow(
-                            workflow=workflow,
-                            workflow_run=workflow_run,
-                            api_key=api_key,
-                            close_browser_on_completion=browser_session_id is None,
-                            browser_session_id=browser_session_id,
-                        )
-                        return workflow_run
-
-                    LOG.warning(
-                        f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} was terminated for workflow run {workflow_run_id}, but will continue executing the workflow run",
-                        block_type=block.block_type,
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_result=block_result,
-                        continue_on_failure=block.continue_on_failure,
-                        block_type_var=block.block_type,
-                        block_label=block.label,
+                elif workflow_run_stop.status == WorkflowRunStatus.terminated:
+                    await self.mark_workflow_run_as_terminated(
+                        workflow_run_id=workflow_run.workflow_run_id, failure_reason=workflow_run_stop.failure_reason
                     )
-
-                elif block_result.status == BlockStatus.timed_out:
-                    LOG.info(
-                        f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} timed out for workflow run {workflow_run_id}, marking workflow run as failed",
-                        block_type=block.block_type,
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_result=block_result,
-                        block_type_var=block.block_type,
-                        block_label=block.label,
-                    )
-
-                    if not block.continue_on_failure:
-                        failure_reason = f"{block.block_type} block timed out. Reason: {block_result.failure_reason}"
-                        await self.mark_workflow_run_as_failed(
-                            workflow_run_id=workflow_run.workflow_run_id, failure_reason=failure_reason
-                        )
-                        await self.clean_up_workflow(
-                            workflow=workflow,
-                            workflow_run=workflow_run,
-                            api_key=api_key,
-                            close_browser_on_completion=browser_session_id is None,
-                            browser_session_id=browser_session_id,
-                        )
-                        return workflow_run
-
-                    LOG.warning(
-                        f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} timed out for workflow run {workflow_run_id}, but will continue executing the workflow run",
-                        block_type=block.block_type,
-                        workflow_run_id=workflow_run.workflow_run_id,
-                        block_idx=block_idx,
-                        block_result=block_result,
-                        continue_on_failure=block.continue_on_failure,
-                        block_type_var=block.block_type,
-                        block_label=block.label,
+                else:
+                    await self.mark_workflow_run_as_failed(
+                        workflow_run_id=workflow_run.workflow_run_id, failure_reason=workflow_run_stop.failure_reason
                     )
-
-            except Exception as e:
-                LOG.exception(
-                    f"Error while executing workflow run {workflow_run.workflow_run_id}",
-                    workflow_run_id=workflow_run.workflow_run_id,
-                    block_idx=block_idx,
-                    block_type=block.block_type,
-                    block_label=block.label,
-                )
-
-                exception_message = f"Unexpected error: {str(e)}"
-                if isinstance(e, SkyvernException):
-                    exception_message = f"unexpected SkyvernException({e.__class__.__name__}): {str(e)}"
-
-                failure_reason = f"{block.block_type} block failed. failure reason: {exception_message}"
-                await self.mark_workflow_run_as_failed(
-                    workflow_run_id=workflow_run.workflow_run_id, failure_reason=failure_reason
-                )
-                await self.clean_up_workflow(
-                    workflow=workflow,
-                    workflow_run=workflow_run,
-                    api_key=api_key,
-                    browser_session_id=browser_session_id,
-                    close_browser_on_completion=browser_session_id is None,
-                )
-                return workflow_run
+            await self.clean_up_workflow(
+                workflow=workflow,
+                workflow_run=workflow_run,
+                api_key=api_key,
+                need_call_webhook=workflow_run_stop.need_call_webhook,
+                close_browser_on_completion=browser_session_id is None,
+                browser_session_id=browser_session_id,
+            )
+            return workflow_run
 
         refreshed_workflow_run = await app.DATABASE.get_workflow_run(
             workflow_run_id=workflow_run.workflow_run_id,
@@ -535,6 +354,253 @@ class WorkflowService:
 
         return workflow_run
 
+    async def execute_workflow_blocks(
+        self,
+        workflow_run: WorkflowRun,
+        organization: Organization,
+        blocks: list[BlockTypeVar],
+        block_dependencies: list[set[int]],
+        browser_session_id: str | None = None,
+    ) -> WorkflowRunStop | None:
+        """
+        Execute the root blocks, each one as soon as the blocks it depends on are done, so the independent blocks run
+        at the same time. Once a block stops the workflow run, or the workflow run is canceled or timed out, no more
+        blocks are started and the running ones are waited for.
+        Returns how the workflow run stopped, None if all the blocks were executed.
+        """
+        workflow_run_id = workflow_run.workflow_run_id
+        status_changed = WorkflowRunStatusSignal.subscribe(workflow_run_id)
+        poll_interval = settings.WORKFLOW_RUN_STATUS_POLL_INTERVAL_SECONDS
+        last_polled_at: float | None = None
+        pending_block_idxs = list(range(len(blocks)))
+        done_block_idxs: set[int] = set()
+        running_blocks: dict[asyncio.Task[WorkflowRunStop | None], int] = {}
+        workflow_run_stop: WorkflowRunStop | None = None
+        try:
+            while pending_block_idxs or running_blocks:
+                if workflow_run_stop is None:
+                    # the status set by this process is signaled right away, the one set by the other processes is
+                    # polled from the database
+                    status = WorkflowRunStatusSignal.get_status(workflow_run_id)
+                    if status is None and (
+                        last_polled_at is None or time.monotonic() - last_polled_at >= poll_interval
+                    ):
+                        last_polled_at = time.monotonic()
+                        try:
+                            refreshed_workflow_run = await app.DATABASE.get_workflow_run(
+                                workflow_run_id=workflow_run_id,
+                                organization_id=organization.organization_id,
+                            )
+                        except Exception as e:
+                            LOG.exception(
+                                f"Error while checking the status of workflow run {workflow_run_id}",
+                                workflow_run_id=workflow_run_id,
+                                running_block_idxs=sorted(running_blocks.values()),
+                            )
+                            exception_message = f"Unexpected error: {str(e)}"
+                            if isinstance(e, SkyvernException):
+                                exception_message = f"unexpected SkyvernException({e.__class__.__name__}): {str(e)}"
+                            # no more blocks are started, the running ones are waited for before the clean up
+                            workflow_run_stop = WorkflowRunStop(
+                                status=WorkflowRunStatus.failed,
+                                failure_reason=f"Failed to check the workflow run status. failure reason: {exception_message}",
+                            )
+                            refreshed_workflow_run = None
+                        status = refreshed_workflow_run.status if refreshed_workflow_run else None
+                    if status in (WorkflowRunStatus.canceled, WorkflowRunStatus.timed_out):
+                        LOG.info(
+                            f"Workflow run is {status}, stopping execution inside workflow execution loop",
+                            workflow_run_id=workflow_run_id,
+                            running_block_idxs=sorted(running_blocks.values()),
+                        )
+                        workflow_run_stop = WorkflowRunStop(status=status, marked=True)
+
+                if workflow_run_stop is None:
+                    for block_idx in list(pending_block_idxs):
+                        if block_dependencies[block_idx] <= done_block_idxs:
+                            pending_block_idxs.remove(block_idx)
+                            block_task = asyncio.create_task(
+                                self.execute_workflow_block(
+                                    workflow_run=workflow_run,
+                                    organization=organization,
+                                    block=blocks[block_idx],
+                                    block_idx=block_idx,
+                                    blocks_cnt=len(blocks),
+                                    browser_session_id=browser_session_id,
+                                )
+                            )
+                            running_blocks[block_task] = block_idx
+
+                if not running_blocks:
+                    break
+
+                waiters: set[asyncio.Future] = set(running_blocks)
+                status_waiter: asyncio.Task | None = None
+                if workflow_run_stop is None:
+                    status_waiter = asyncio.create_task(status_changed.wait())
+                    waiters.add(status_waiter)
+                finished, _ = await asyncio.wait(
+                    waiters,
+                    timeout=poll_interval if workflow_run_stop is None and poll_interval > 0 else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if status_waiter:
+                    status_waiter.cancel()
+
+                for finished_task in finished:
+                    if finished_task not in running_blocks:
+                        continue
+                    done_block_idxs.add(running_blocks.pop(finished_task))
+                    block_stop = finished_task.result()
+                    if block_stop is not None and workflow_run_stop is None:
+                        workflow_run_stop = block_stop
+        finally:
+            # only left running when the execution itself is cancelled
+            for block_task in running_blocks:
+                block_task.cancel()
+            WorkflowRunStatusSignal.unsubscribe(workflow_run_id)
+
+        return workflow_run_stop
+
+    async def execute_workflow_block(
+        self,
+        workflow_run: WorkflowRun,
+        organization: Organization,
+        block: BlockTypeVar,
+        block_idx: int,
+        blocks_cnt: int,
+        browser_session_id: str | None = None,
+    ) -> WorkflowRunStop | None:
+        """
+        Execute a root block. Returns how the workflow run has to stop if the block stops it, None otherwise.
+        """
+        workflow_run_id = workflow_run.workflow_run_id
+        organization_id = organization.organization_id
+        try:
+            parameters = block.get_all_parameters(workflow_run_id)
+            await app.WORKFLOW_CONTEXT_MANAGER.register_block_parameters_for_workflow_run(
+                workflow_run_id, parameters, organization
+            )
+            LOG.info(
+                f"Executing root block {block.block_type} at index {block_idx}/{blocks_cnt - 1} for workflow run {workflow_run_id}",
+                block_type=block.block_type,
+                workflow_run_id=workflow_run.workflow_run_id,
+                block_idx=block_idx,
+                block_type_var=block.block_type,
+                block_label=block.label,
+            )
+            block_result = await block.execute_safe(
+                workflow_run_id=workflow_run_id,
+                organization_id=organization_id,
+                browser_session_id=browser_session_id,
+            )
+            if block_result.status == BlockStatus.canceled:
+                LOG.info(
+                    f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} was canceled for workflow run {workflow_run_id}, cancelling workflow run",
+                    block_type=block.block_type,
+                    workflow_run_id=workflow_run.workflow_run_id,
+                    block_idx=block_idx,
+                    block_result=block_result,
+                    block_type_var=block.block_type,
+                    block_label=block.label,
+                )
+                # We're not sending a webhook here because the workflow run is manually marked as canceled.
+                return WorkflowRunStop(status=WorkflowRunStatus.canceled, need_call_webhook=False)
+            elif block_result.status == BlockStatus.failed:
+                LOG.error(
+                    f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} failed for workflow run {workflow_run_id}",
+                    block_type=block.block_type,
+                    workflow_run_id=workflow_run.workflow_run_id,
+                    block_idx=block_idx,
+                    block_result=block_result,
+                    block_type_var=block.block_type,
+                    block_label=block.label,
+                )
+                if not block.continue_on_failure:
+                    failure_reason = f"{block.block_type} block failed. failure reason: {block_result.failure_reason}"
+                    return WorkflowRunStop(status=WorkflowRunStatus.failed, failure_reason=failure_reason)
+
+                LOG.warning(
+                    f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} failed but will continue executing the workflow run {workflow_run_id}",
+                    block_type=block.block_type,
+                    workflow_run_id=workflow_run.workflow_run_id,
+                    block_idx=block_idx,
+                    block_result=block_result,
+                    continue_on_failure=block.continue_on_failure,
+                    block_type_var=block.block_type,
+                    block_label=block.label,
+                )
+
+            elif block_result.status == BlockStatus.terminated:
+                LOG.info(
+                    f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} was terminated for workflow run {workflow_run_id}, marking workflow run as terminated",
+                    block_type=block.block_type,
+                    workflow_run_id=workflow_run.workflow_run_id,
+                    block_idx=block_idx,
+                    block_result=block_result,
+                    block_type_var=block.block_type,
+                    block_label=block.label,
+                )
+
+                if not block.continue_on_failure:
+                    failure_reason = f"{block.block_type} block terminated. Reason: {block_result.failure_reason}"
+                    return WorkflowRunStop(status=WorkflowRunStatus.terminated, failure_reason=failure_reason)
+
+                LOG.warning(
+                    f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} was terminated for workflow run {workflow_run_id}, but will continue executing the workflow run",
+                    block_type=block.block_type,
+                    workflow_run_id=workflow_run.workflow_run_id,
+                    block_idx=block_idx,
+                    block_result=block_result,
+                    continue_on_failure=block.continue_on_failure,
+                    block_type_var=block.block_type,
+                    block_label=block.label,
+                )
+
+            elif block_result.status == BlockStatus.timed_out:
+                LOG.info(
+                    f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} timed out for workflow run {workflow_run_id}, marking workflow run as failed",
+                    block_type=block.block_type,
+                    workflow_run_id=workflow_run.workflow_run_id,
+                    block_idx=block_idx,
+                    block_result=block_result,
+                    block_type_var=block.block_type,
+                    block_label=block.label,
+                )
+
+                if not block.continue_on_failure:
+                    failure_reason = f"{block.block_type} block timed out. Reason: {block_result.failure_reason}"
+                    return WorkflowRunStop(status=WorkflowRunStatus.failed, failure_reason=failure_reason)
+
+                LOG.warning(
+                    f"Block with type {block.block_type} at index {block_idx}/{blocks_cnt - 1} timed out for workflow run {workflow_run_id}, but will continue executing the workflow run",
+                    block_type=block.block_type,
+                    workflow_run_id=workflow_run.workflow_run_id,
+                    block_idx=block_idx,
+                    block_result=block_result,
+                    continue_on_failure=block.continue_on_failure,
+                    block_type_var=block.block_type,
+                    block_label=block.label,
+                )
+
+        except Exception as e:
+            LOG.exception(
+                f"Error while executing workflow run {workflow_run.workflow_run_id}",
+                workflow_run_id=workflow_run.workflow_run_id,
+                block_idx=block_idx,
+                block_type=block.block_type,
+                block_label=block.label,
+            )
+
+            exception_message = f"Unexpected error: {str(e)}"
+            if isinstance(e, SkyvernException):
+                exception_message = f"unexpected SkyvernException({e.__class__.__name__}): {str(e)}"
+
+            failure_reason = f"{block.block_type} block failed. failure reason: {exception_message}"
+            return WorkflowRunStop(status=WorkflowRunStatus.failed, failure_reason=failure_reason)
+
+        return None
+
     async def create_workflow(
         self,
         organization_id: str,
@@ -780,6 +846,7 @@ class WorkflowService:
             workflow_run_id=workflow_run_id,
             status=WorkflowRunStatus.canceled,
         )
+        WorkflowRunStatusSignal.publish(workflow_run_id, WorkflowRunStatus.canceled)
 
     async def mark_workflow_run_as_timed_out(self, workflow_run_id: str, failure_reason: str | None = None) -> None:
         LOG.info(
@@ -792,6 +859,7 @@ class WorkflowService:
             status=WorkflowRunStatus.timed_out,
             failure_reason=failure_reason,
         )
+        WorkflowRunStatusSignal.publish(workflow_run_id, WorkflowRunStatus.timed_out)
 
     async def get_workflow_run(self, workflow_run_id: str, organization_id: str | None = None) -> WorkflowRun:
         workflow_run = await app.DATABASE.get_workflow_run(
@@ -1008,6 +1076,8 @@ class WorkflowService:
 
         workflow_run = await self.get_workflow_run(workflow_run_id=workflow_run_id, organization_id=organization_id)
         workflow_run_tasks = await app.DATABASE.get_tasks_by_workflow_run_id(workflow_run_id=workflow_run_id)
+        # the artifact rows created by this process could still be in the queue
+        await app.ARTIFACT_MANAGER.flush_artifacts()
         screenshot_artifacts = []
         screenshot_urls: list[str] | None = None
         # get the last screenshot for the last 3 tasks of the workflow run
@@ -1248,6 +1318,33 @@ class WorkflowService:
                 workflow_run_id=workflow_run.workflow_run_id,
             ) from e
 
+    async def clean_up_browser_state(self, browser_state_key: str, workflow_run: WorkflowRun) -> None:
+        """
+        Close the browser state a part of the workflow run used instead of the one of the workflow run, e.g. an
+        iteration of a concurrent loop, then upload its recording and har like clean_up_workflow does.
+        """
+        browser_state, task_ids = await app.BROWSER_MANAGER.cleanup_for_browser_state_key(browser_state_key)
+        if browser_state is None:
+            return
+
+        try:
+            workflow = await self.get_workflow(workflow_run.workflow_id, organization_id=workflow_run.organization_id)
+            await self.persist_video_data(browser_state, workflow, workflow_run)
+            if not task_ids:
+                return
+            last_step = await app.DATABASE.get_latest_step(
+                task_id=task_ids[-1], organization_id=workflow_run.organization_id
+            )
+            if last_step:
+                await self.persist_har_data(browser_state, last_step, workflow, workflow_run)
+        except Exception:
+            LOG.warning(
+                "Failed to persist the artifacts of the browser state",
+                workflow_run_id=workflow_run.workflow_run_id,
+                browser_state_key=browser_state_key,
+                exc_info=True,
+            )
+
     async def persist_video_data(
         self, browser_state: BrowserState, workflow: Workflow, workflow_run: WorkflowRun
     ) -> None:
@@ -1652,6 +1749,7 @@ class WorkflowService:
                 output_parameter=output_parameter,
                 continue_on_failure=block_yaml.continue_on_failure,
                 complete_if_empty=block_yaml.complete_if_empty,
+                max_concurrency=block_yaml.max_concurrency,
             )
         elif block_yaml.block_type == BlockType.CODE:
             return CodeBlock(
@@ -1726,6 +1824,7 @@ class WorkflowService:
                 output_parameter=output_parameter,
                 file_url=block_yaml.file_url,
                 file_type=block_yaml.file_type,
+                streaming=block_yaml.streaming,
                 continue_on_failure=block_yaml.continue_on_failure,
             )
         elif block_yaml.block_type == BlockType.PDF_PARSER:
@@ -1953,47 +2052,8 @@ class WorkflowService:
         """
         build the tree structure of the workflow run timeline
         """
-        workflow_run_blocks = await app.DATABASE.get_workflow_run_blocks(
+        workflow_run_blocks = await WorkflowRunTimelineCache.get_workflow_run_blocks(
             workflow_run_id=workflow_run_id,
             organization_id=organization_id,
         )
-        # get all the actions for all workflow run blocks
-        task_ids = [block.task_id for block in workflow_run_blocks if block.task_id]
-        task_id_to_block: dict[str, WorkflowRunBlock] = {
-            block.task_id: block for block in workflow_run_blocks if block.task_id
-        }
-        actions = await app.DATABASE.get_tasks_actions(task_ids=task_ids, organization_id=organization_id)
-        for action in actions:
-            if not action.task_id:
-                continue
-            task_block = task_id_to_block[action.task_id]
-            task_block.actions.append(action)
-
-        result = []
-        block_map: dict[str, WorkflowRunTimeline] = {}
-        counter = 0
-        while workflow_run_blocks:
-            counter += 1
-            block = workflow_run_blocks.pop(0)
-            workflow_run_timeline = WorkflowRunTimeline(
-                type=WorkflowRunTimelineType.block,
-                block=block,
-                created_at=block.created_at,
-                modified_at=block.modified_at,
-            )
-            if block.parent_workflow_run_block_id:
-                if block.parent_workflow_run_block_id in block_map:
-                    block_map[block.parent_workflow_run_block_id].children.append(workflow_run_timeline)
-                    block_map[block.workflow_run_block_id] = workflow_run_timeline
-                else:
-                    # put the block back to the queue
-                    workflow_run_blocks.append(block)
-            else:
-                result.append(workflow_run_timeline)
-                block_map[block.workflow_run_block_id] = workflow_run_timeline
-
-            if counter > 1000:
-                LOG.error("Too many blocks in the workflow run", workflow_run_id=workflow_run_id)
-                break
-
-        return result
+        return build_workflow_run_timeline(workflow_run_blocks, workflow_run_id)
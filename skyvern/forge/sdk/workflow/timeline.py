@@ -0,0 +1,176 @@
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from cachetools import TTLCache
+
+from skyvern.config import settings
+from skyvern.forge import app
+from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock, WorkflowRunTimeline, WorkflowRunTimelineType
+from skyvern.webeye.actions.actions import Action
+
+LOG = structlog.get_logger()
+
+# the rows modified within this window before the latest change are fetched again on refresh, in case their
+# transactions were committed after the previous refresh
+TIMELINE_REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+@dataclass
+class _MaterializedTimeline:
+    blocks: dict[str, WorkflowRunBlock] = field(default_factory=dict)
+    # task_id -> action_id -> action
+    actions: dict[str, dict[str, Action]] = field(default_factory=dict)
+    # the latest modified_at of the blocks and the actions
+    last_modified_at: datetime | None = None
+
+    def merge_blocks(self, blocks: list[WorkflowRunBlock]) -> None:
+        for block in blocks:
+            existing_block = self.blocks.get(block.workflow_run_block_id)
+            # a slower refresh can finish after a newer one
+            if existing_block is None or existing_block.modified_at <= block.modified_at:
+                self.blocks[block.workflow_run_block_id] = block
+            self._update_last_modified_at(block.modified_at)
+
+    def merge_actions(self, actions: list[Action]) -> None:
+        for action in actions:
+            if not action.task_id or not action.action_id:
+                continue
+            task_actions = self.actions.setdefault(action.task_id, {})
+            existing_action = task_actions.get(action.action_id)
+            if (
+                existing_action is None
+                or existing_action.modified_at is None
+                or action.modified_at is None
+                or existing_action.modified_at <= action.modified_at
+            ):
+                task_actions[action.action_id] = action
+            self._update_last_modified_at(action.modified_at)
+
+    def _update_last_modified_at(self, modified_at: datetime | None) -> None:
+        if modified_at and (self.last_modified_at is None or modified_at > self.last_modified_at):
+            self.last_modified_at = modified_at
+
+    def get_blocks(self) -> list[WorkflowRunBlock]:
+        """
+        Copies of the blocks with their actions, the latest first like the database queries.
+        """
+        blocks = sorted(self.blocks.values(), key=lambda block: block.created_at, reverse=True)
+        return [
+            block.model_copy(
+                update={
+                    "actions": sorted(
+                        self.actions.get(block.task_id, {}).values() if block.task_id else [],
+                        key=lambda action: action.created_at or datetime.min,
+                        reverse=True,
+                    )
+                }
+            )
+            for block in blocks
+        ]
+
+
+class WorkflowRunTimelineCache:
+    """
+    Keeps the blocks and the actions of the recently requested workflow runs in memory. The timeline of a live run is
+    polled by the UI, so each request only fetches the blocks and the actions modified since the previous one.
+    """
+
+    _timelines: TTLCache[str, _MaterializedTimeline] = TTLCache(
+        maxsize=settings.WORKFLOW_RUN_TIMELINE_CACHE_SIZE,
+        ttl=settings.WORKFLOW_RUN_TIMELINE_CACHE_TTL_SECONDS,
+    )
+
+    @classmethod
+    async def get_workflow_run_blocks(
+        cls,
+        workflow_run_id: str,
+        organization_id: str | None = None,
+    ) -> list[WorkflowRunBlock]:
+        key = f"{organization_id}:{workflow_run_id}"
+        materialized_timeline = None
+        if settings.ENABLE_WORKFLOW_RUN_TIMELINE_CACHE:
+            materialized_timeline = cls._timelines.get(key)
+
+        updated_after: datetime | None = None
+        if materialized_timeline is None:
+            materialized_timeline = _MaterializedTimeline()
+        elif materialized_timeline.last_modified_at:
+            updated_after = materialized_timeline.last_modified_at - TIMELINE_REFRESH_OVERLAP
+
+        workflow_run_blocks = await app.DATABASE.get_workflow_run_blocks(
+            workflow_run_id=workflow_run_id,
+            organization_id=organization_id,
+            updated_after=updated_after,
+        )
+        materialized_timeline.merge_blocks(workflow_run_blocks)
+        # get all the actions for all workflow run blocks
+        task_ids = [block.task_id for block in materialized_timeline.blocks.values() if block.task_id]
+        if task_ids:
+            actions = await app.DATABASE.get_tasks_actions(
+                task_ids=task_ids,
+                organization_id=organization_id,
+                updated_after=updated_after,
+            )
+            materialized_timeline.merge_actions(actions)
+
+        if settings.ENABLE_WORKFLOW_RUN_TIMELINE_CACHE:
+            cls._timelines[key] = materialized_timeline
+        return materialized_timeline.get_blocks()
+
+
+def build_workflow_run_timeline(
+    workflow_run_blocks: list[WorkflowRunBlock],
+    workflow_run_id: str,
+) -> list[WorkflowRunTimeline]:
+    """
+    Build the tree of the workflow run timeline in one pass over the blocks, indexed by their ids. The root blocks and
+    the children of each block keep the order of workflow_run_blocks.
+    """
+    block_timelines = {
+        block.workflow_run_block_id: WorkflowRunTimeline(
+            type=WorkflowRunTimelineType.block,
+            block=block,
+            created_at=block.created_at,
+            modified_at=block.modified_at,
+        )
+        for block in workflow_run_blocks
+    }
+    result = []
+    for block in workflow_run_blocks:
+        workflow_run_timeline = block_timelines[block.workflow_run_block_id]
+        if not block.parent_workflow_run_block_id:
+            result.append(workflow_run_timeline)
+        elif parent_timeline := block_timelines.get(block.parent_workflow_run_block_id):
+            parent_timeline.children.append(workflow_run_timeline)
+        else:
+            LOG.warning(
+                "The parent of the workflow run block is not found, skipping the block in the timeline",
+                workflow_run_id=workflow_run_id,
+                workflow_run_block_id=block.workflow_run_block_id,
+                parent_workflow_run_block_id=block.parent_workflow_run_block_id,
+            )
+    return result
+
+
+def filter_workflow_run_timeline(
+    workflow_run_timeline: list[WorkflowRunTimeline],
+    updated_after: datetime,
+) -> list[WorkflowRunTimeline]:
+    """
+    Keep the blocks and the thoughts modified after updated_after, with only the actions modified after it. The
+    ancestors of the kept blocks are kept as well, so the client can place them in the tree.
+    """
+    if updated_after.tzinfo:
+        # the timestamps in the database are naive utc
+        updated_after = updated_after.astimezone(UTC).replace(tzinfo=None)
+    result = []
+    for timeline in workflow_run_timeline:
+        children = filter_workflow_run_timeline(timeline.children, updated_after)
+        block = timeline.block
+        if block:
+            actions = [action for action in block.actions if action.modified_at and action.modified_at > updated_after]
+            block = block.model_copy(update={"actions": actions})
+        if children or timeline.modified_at > updated_after or (block and block.actions):
+            result.append(timeline.model_copy(update={"block": block, "children": children}))
+    return result
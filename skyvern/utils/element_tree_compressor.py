@@ -0,0 +1,162 @@
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from skyvern.webeye.scraper.scraper import json_to_html
+
+# the text elements deeper than this are pruned before the shallower ones
+DEEP_TEXT_DEPTH = 8
+
+
+class PruneReason(IntEnum):
+    """
+    The elements are pruned by the reason in this order. Elements with interactable descendants are never pruned.
+    """
+
+    SVG = 0
+    DUPLICATE_TEXT = 1
+    DEEP_TEXT = 2
+    NON_INTERACTABLE = 3
+
+
+@dataclass
+class _ElementNode:
+    element: dict
+    depth: int
+    order: int
+    cost: float
+    has_interactable: bool = False
+    pruned: bool = False
+    children: list["_ElementNode"] = field(default_factory=list)
+
+
+@dataclass
+class ElementTreeCompressionResult:
+    element_tree: list[dict]
+    estimated_token_count: int
+    estimated_tokens_saved: int
+    pruned_count: dict[str, int]
+    # True if pruning wasn't enough and the trailing root elements were dropped
+    truncated: bool
+
+
+def _build_nodes(
+    element_tree: list[dict], html_need_skyvern_attrs: bool, seen_texts: set[str]
+) -> tuple[list[_ElementNode], list[_ElementNode], dict[int, PruneReason]]:
+    nodes: list[_ElementNode] = []
+    reasons: dict[int, PruneReason] = {}
+
+    def build(element: dict, depth: int) -> _ElementNode:
+        # the HTML of the element itself, its children are counted by their own nodes
+        own_html = json_to_html({**element, "children": []}, need_skyvern_attrs=html_need_skyvern_attrs)
+        node = _ElementNode(element=element, depth=depth, order=len(nodes), cost=len(own_html))
+        nodes.append(node)
+
+        text = element.get("text", "")
+        if element.get("tagName", "").lower() == "svg":
+            reasons[node.order] = PruneReason.SVG
+        elif text and text in seen_texts:
+            reasons[node.order] = PruneReason.DUPLICATE_TEXT
+        elif text and depth >= DEEP_TEXT_DEPTH:
+            reasons[node.order] = PruneReason.DEEP_TEXT
+        else:
+            reasons[node.order] = PruneReason.NON_INTERACTABLE
+        if text:
+            seen_texts.add(text)
+
+        node.children = [build(child, depth + 1) for child in element.get("children", [])]
+        node.has_interactable = element.get("interactable", False) or any(
+            child.has_interactable for child in node.children
+        )
+        return node
+
+    roots = [build(element, 0) for element in element_tree]
+    return roots, nodes, reasons
+
+
+def _prune(node: _ElementNode) -> float:
+    if node.pruned:
+        return 0
+    node.pruned = True
+    return node.cost + sum(_prune(child) for child in node.children)
+
+
+def _remaining_cost(node: _ElementNode) -> float:
+    if node.pruned:
+        return 0
+    return node.cost + sum(_remaining_cost(child) for child in node.children)
+
+
+def _rebuild(node: _ElementNode) -> dict | None:
+    if node.pruned:
+        return None
+    if not node.children:
+        return node.element
+
+    children = [rebuilt for child in node.children if (rebuilt := _rebuild(child)) is not None]
+    # share the untouched subtrees with the original tree
+    if len(children) == len(node.children) and all(
+        rebuilt is child.element for rebuilt, child in zip(children, node.children)
+    ):
+        return node.element
+    return {**node.element, "children": children}
+
+
+def compress_element_tree(
+    element_tree: list[dict],
+    token_count: int,
+    token_budget: int,
+    html_need_skyvern_attrs: bool = True,
+) -> ElementTreeCompressionResult:
+    """
+    Prune the element tree by priority (see PruneReason) until the estimated token count fits the budget.
+    The token cost of each element is estimated once from its HTML length, calibrated by the token count of the whole
+    tree, so no extra tokenization is needed.
+    The input tree isn't mutated, and the untouched subtrees are shared with the result.
+
+    :param token_count: The token count of the whole element tree HTML.
+    :param token_budget: The max token count of the element tree HTML.
+    """
+    roots, nodes, reasons = _build_nodes(element_tree, html_need_skyvern_attrs, seen_texts=set())
+    total_length = sum(node.cost for node in nodes)
+    tokens_per_char = token_count / total_length if total_length > 0 else 0
+    for node in nodes:
+        node.cost *= tokens_per_char
+
+    pruned_count = {reason.name.lower(): 0 for reason in PruneReason}
+    estimated_token_count = float(token_count)
+    # the deeper and the later in the page, the less important the element is
+    candidates = sorted(
+        (node for node in nodes if not node.has_interactable),
+        key=lambda node: (reasons[node.order], -node.depth, -node.order),
+    )
+    for node in candidates:
+        if estimated_token_count <= token_budget:
+            break
+        if node.pruned:
+            continue
+        estimated_token_count -= _prune(node)
+        pruned_count[reasons[node.order].name.lower()] += 1
+
+    # only the interactable elements are left, drop the trailing root elements as the last resort
+    truncated = False
+    if estimated_token_count > token_budget:
+        truncated = True
+        kept_token_count = 0.0
+        exceeded = False
+        for root in roots:
+            root_token_count = _remaining_cost(root)
+            if exceeded or kept_token_count + root_token_count > token_budget:
+                exceeded = True
+                _prune(root)
+                continue
+            kept_token_count += root_token_count
+        estimated_token_count = kept_token_count
+
+    compressed_tree = [rebuilt for root in roots if (rebuilt := _rebuild(root)) is not None]
+    return ElementTreeCompressionResult(
+        element_tree=compressed_tree,
+        estimated_token_count=int(estimated_token_count),
+        estimated_tokens_saved=int(token_count - estimated_token_count),
+        pruned_count=pruned_count,
+        truncated=truncated,
+    )
@@ -1,14 +1,44 @@
+import asyncio
 import io
-from typing import TypedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Callable, TypedDict, TypeVar
 
 from PIL import Image
 
+from skyvern.config import settings
+
+T = TypeVar("T")
+
+_image_executor: ThreadPoolExecutor | None = None
+
 
 class Resolution(TypedDict):
     width: int
     height: int
 
 
+class ImageFormat(StrEnum):
+    PNG = "png"
+    JPEG = "jpeg"
+    WEBP = "webp"
+
+
+@dataclass(frozen=True)
+class ScreenshotEncoding:
+    format: ImageFormat = ImageFormat.PNG
+    # only used by the lossy formats
+    quality: int = 85
+    # the longest side of the screenshot is downscaled to this size, None keeps the original size
+    max_dimension: int | None = None
+    # drop the screenshots whose perceptual hash is within this hamming distance of a kept one, None disables the dedup
+    dedup_threshold: int | None = None
+
+    def is_noop(self) -> bool:
+        return self.format == ImageFormat.PNG and self.max_dimension is None and self.dedup_threshold is None
+
+
 MAX_SCALING_TARGETS_ANTHROPIC_CUA: dict[str, Resolution] = {
     "XGA": Resolution(width=1024, height=768),  # 4:3
     "WXGA": Resolution(width=1280, height=800),  # 16:10
@@ -50,6 +80,118 @@ def resize_screenshots(screenshots: list[bytes], target_dimension: Resolution) -
     return new_screenshots
 
 
+def split_screenshot_into_tiles(screenshot: bytes, viewport: Resolution, overlap: int, max_number: int) -> list[bytes]:
+    """
+    Slice a full page screenshot into viewport-sized tiles, overlapping like the scrolling screenshots do.
+    The viewport is in CSS pixels, and it's scaled to the screenshot pixels by the device scale factor.
+    """
+    img = Image.open(io.BytesIO(screenshot))
+    scale = img.width / viewport["width"] if viewport["width"] else 1
+    tile_height = max(1, round(viewport["height"] * scale))
+    step = max(1, round((viewport["height"] - overlap) * scale))
+
+    tiles: list[bytes] = []
+    top = 0
+    while len(tiles) < max_number:
+        # the last tile is aligned to the bottom of the page, the same as scrolling to the end of the page
+        top = max(0, min(top, img.height - tile_height))
+        bottom = min(top + tile_height, img.height)
+        img_byte_arr = io.BytesIO()
+        img.crop((0, top, img.width, bottom)).save(img_byte_arr, format="PNG")
+        tiles.append(img_byte_arr.getvalue())
+        if bottom >= img.height:
+            break
+        top += step
+    return tiles
+
+
+def get_image_media_type(image: bytes) -> str:
+    if image.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if image[:4] == b"RIFF" and image[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+def compute_difference_hash(img: Image.Image, hash_size: int = 8) -> int:
+    """
+    A perceptual hash of the image: each bit tells whether a pixel is brighter than its right neighbour in the
+    downscaled grayscale image, so near-identical images have hashes within a small hamming distance.
+    """
+    pixels = list(img.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR).getdata())
+    difference_hash = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            difference_hash = (difference_hash << 1) | (left > right)
+    return difference_hash
+
+
+def _encode_screenshot(screenshot: bytes, encoding: ScreenshotEncoding) -> tuple[int | None, bytes]:
+    img = Image.open(io.BytesIO(screenshot))
+    difference_hash = compute_difference_hash(img) if encoding.dedup_threshold is not None else None
+
+    if encoding.max_dimension and max(img.size) > encoding.max_dimension:
+        img = img.copy()
+        img.thumbnail((encoding.max_dimension, encoding.max_dimension), Image.Resampling.LANCZOS)
+    elif encoding.format == ImageFormat.PNG:
+        # nothing to re-encode
+        return difference_hash, screenshot
+
+    img_byte_arr = io.BytesIO()
+    if encoding.format == ImageFormat.PNG:
+        img.save(img_byte_arr, format="PNG")
+    elif encoding.format == ImageFormat.JPEG:
+        img.convert("RGB").save(img_byte_arr, format="JPEG", quality=encoding.quality, optimize=True)
+    else:
+        img.save(img_byte_arr, format="WEBP", quality=encoding.quality, method=4)
+    return difference_hash, img_byte_arr.getvalue()
+
+
+def _is_duplicate(difference_hash: int | None, kept_hashes: list[int], dedup_threshold: int | None) -> bool:
+    if difference_hash is None or dedup_threshold is None:
+        return False
+    return any((difference_hash ^ kept_hash).bit_count() <= dedup_threshold for kept_hash in kept_hashes)
+
+
+def _get_image_executor() -> ThreadPoolExecutor:
+    global _image_executor
+    if _image_executor is None:
+        _image_executor = ThreadPoolExecutor(
+            max_workers=settings.LLM_SCREENSHOT_ENCODING_MAX_WORKERS, thread_name_prefix="image"
+        )
+    return _image_executor
+
+
+async def run_in_image_executor(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run the CPU bound image processing in the image thread pool, so it doesn't block the event loop.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_get_image_executor(), func, *args)
+
+
+async def encode_screenshots(screenshots: list[bytes], encoding: ScreenshotEncoding) -> list[bytes]:
+    """
+    Downscale, re-encode and dedup the screenshots in the image thread pool. The order of the screenshots is kept.
+    """
+    if not screenshots or encoding.is_noop():
+        return screenshots
+
+    results = await asyncio.gather(
+        *(run_in_image_executor(_encode_screenshot, screenshot, encoding) for screenshot in screenshots)
+    )
+    encoded_screenshots: list[bytes] = []
+    kept_hashes: list[int] = []
+    for difference_hash, encoded_screenshot in results:
+        if _is_duplicate(difference_hash, kept_hashes, encoding.dedup_threshold):
+            continue
+        if difference_hash is not None:
+            kept_hashes.append(difference_hash)
+        encoded_screenshots.append(encoded_screenshot)
+    return encoded_screenshots
+
+
 def scale_coordinates(
     current_coordinates: tuple[int, int],
     current_dimension: Resolution,
@@ -0,0 +1,48 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from pypdf import PdfReader
+
+from skyvern.config import settings
+
+_pdf_executor: ProcessPoolExecutor | None = None
+
+
+def _get_page_count(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def _extract_page_texts(file_path: str, start: int, end: int) -> list[str]:
+    reader = PdfReader(file_path)
+    return [reader.pages[page_idx].extract_text() for page_idx in range(start, end)]
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ProcessPoolExecutor(max_workers=settings.PDF_TEXT_EXTRACTION_MAX_WORKERS)
+    return _pdf_executor
+
+
+async def extract_page_texts(file_path: str) -> list[str]:
+    """
+    Extract the text of each page of the pdf. pypdf is pure python, so the ranges of
+    PDF_TEXT_EXTRACTION_PAGES_PER_WORKER pages are extracted in parallel by the pdf process pool. A pdf with a single
+    range is extracted in a thread.
+    Raises PdfReadError if the file isn't a valid pdf.
+    """
+    page_count = await asyncio.to_thread(_get_page_count, file_path)
+    pages_per_worker = max(1, settings.PDF_TEXT_EXTRACTION_PAGES_PER_WORKER)
+    if page_count <= pages_per_worker or settings.PDF_TEXT_EXTRACTION_MAX_WORKERS <= 1:
+        return await asyncio.to_thread(_extract_page_texts, file_path, 0, page_count)
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                _get_pdf_executor(), _extract_page_texts, file_path, start, min(start + pages_per_worker, page_count)
+            )
+            for start in range(0, page_count, pages_per_worker)
+        )
+    )
+    return [page_text for page_texts in results for page_text in page_texts]
@@ -3,13 +3,18 @@ from typing import Any
 import structlog
 from pydantic import BaseModel
 
+from skyvern.config import settings
 from skyvern.constants import DEFAULT_MAX_TOKENS
 from skyvern.forge.sdk.prompting import PromptEngine
-from skyvern.utils.token_counter import count_tokens
-from skyvern.webeye.scraper.scraper import ScrapedPage
+from skyvern.utils.element_tree_compressor import compress_element_tree
+from skyvern.utils.token_counter import count_tokens, may_exceed_token_limit
+from skyvern.webeye.scraper.scraper import ScrapedPage, json_to_html
 
 LOG = structlog.get_logger()
 
+# the ratio of the remaining max tokens the pruned elements tree is allowed to use
+ELEMENT_TOKEN_BUDGET_RATIO = 0.95
+
 
 class CheckPhoneNumberFormatResponse(BaseModel):
     page_info: str
@@ -25,43 +30,46 @@ def load_prompt_with_elements(
     prompt_engine: PromptEngine,
     template_name: str,
     html_need_skyvern_attrs: bool = True,
+    llm_key: str | None = None,
     **kwargs: Any,
 ) -> str:
-    prompt = prompt_engine.load_prompt(
-        template_name,
-        elements=scraped_page.build_element_tree(html_need_skyvern_attrs=html_need_skyvern_attrs),
-        **kwargs,
+    """
+    llm_key is the key of the llm the prompt is sent to, its tokens are counted with the encoding of that model.
+    Defaults to LLM_KEY, the key of the main llm.
+    """
+    llm_key = llm_key or settings.LLM_KEY
+    element_tree_html = scraped_page.build_element_tree(html_need_skyvern_attrs=html_need_skyvern_attrs)
+    prompt = prompt_engine.load_prompt(template_name, elements=element_tree_html, **kwargs)
+    if not may_exceed_token_limit(prompt, DEFAULT_MAX_TOKENS):
+        return prompt
+    token_count = count_tokens(prompt, llm_key=llm_key)
+    if token_count <= DEFAULT_MAX_TOKENS:
+        return prompt
+
+    # the prompt without elements is small, so counting it is much cheaper than re-counting the whole prompt
+    base_token_count = count_tokens(prompt_engine.load_prompt(template_name, elements="", **kwargs), llm_key=llm_key)
+    element_token_count = token_count - base_token_count
+    # leave some headroom since the element tokens are estimated from the HTML length
+    element_token_budget = int((DEFAULT_MAX_TOKENS - base_token_count) * ELEMENT_TOKEN_BUDGET_RATIO)
+    result = compress_element_tree(
+        scraped_page.element_tree_trimmed,
+        token_count=element_token_count,
+        token_budget=element_token_budget,
+        html_need_skyvern_attrs=html_need_skyvern_attrs,
+    )
+    scraped_page.last_used_element_tree = result.element_tree
+    compressed_element_tree_html = "".join(
+        json_to_html(element, need_skyvern_attrs=html_need_skyvern_attrs) for element in result.element_tree
+    )
+    prompt = prompt_engine.load_prompt(template_name, elements=compressed_element_tree_html, **kwargs)
+    LOG.warning(
+        "Prompt is longer than the max tokens. Pruned the elements tree to fit the max tokens.",
+        template_name=template_name,
+        token_count=token_count,
+        estimated_token_count=base_token_count + result.estimated_token_count,
+        estimated_tokens_saved=result.estimated_tokens_saved,
+        pruned_count=result.pruned_count,
+        truncated=result.truncated,
+        max_tokens=DEFAULT_MAX_TOKENS,
     )
-    token_count = count_tokens(prompt)
-    if token_count > DEFAULT_MAX_TOKENS:
-        # get rid of all the secondary elements like SVG, etc
-        economy_elements_tree = scraped_page.build_economy_elements_tree(
-            html_need_skyvern_attrs=html_need_skyvern_attrs
-        )
-        prompt = prompt_engine.load_prompt(template_name, elements=economy_elements_tree, **kwargs)
-        economy_token_count = count_tokens(prompt)
-        LOG.warning(
-            "Prompt is longer than the max tokens. Going to use the economy elements tree.",
-            template_name=template_name,
-            token_count=token_count,
-            economy_token_count=economy_token_count,
-            max_tokens=DEFAULT_MAX_TOKENS,
-        )
-        if economy_token_count > DEFAULT_MAX_TOKENS:
-            # !!! HACK alert
-            # dump the last 1/3 of the html context and keep the first 2/3 of the html context
-            economy_elements_tree_dumped = scraped_page.build_economy_elements_tree(
-                html_need_skyvern_attrs=html_need_skyvern_attrs,
-                percent_to_keep=2 / 3,
-            )
-            prompt = prompt_engine.load_prompt(template_name, elements=economy_elements_tree_dumped, **kwargs)
-            token_count_after_dump = count_tokens(prompt)
-            LOG.warning(
-                "Prompt is still longer than the max tokens. Will only keep the first 2/3 of the html context.",
-                template_name=template_name,
-                token_count=token_count,
-                economy_token_count=economy_token_count,
-                token_count_after_dump=token_count_after_dump,
-                max_tokens=DEFAULT_MAX_TOKENS,
-            )
     return prompt
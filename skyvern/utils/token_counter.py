@@ -1,5 +1,69 @@
+import hashlib
+from collections.abc import MutableMapping
+from functools import lru_cache
+
+import structlog
 import tiktoken
 
+LOG = structlog.get_logger()
+
+DEFAULT_ENCODING_MODEL = "gpt-4o"
+# used for the models tiktoken doesn't know, e.g. anthropic, gemini, etc
+FALLBACK_ENCODING_NAME = "o200k_base"
+ESTIMATED_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name: str = DEFAULT_ENCODING_MODEL) -> tiktoken.Encoding:
+    # litellm model names can have the provider prefix, e.g. "azure/gpt-4o"
+    model_name = model_name.split("/")[-1]
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding(FALLBACK_ENCODING_NAME)
+
+
+@lru_cache(maxsize=None)
+def get_encoding_for_llm_key(llm_key: str) -> tiktoken.Encoding:
+    # the llm config registry imports the scraper, which imports this module
+    from skyvern.forge.sdk.api.llm.config_registry import LLMConfigRegistry
+
+    try:
+        llm_config = LLMConfigRegistry.get_config(llm_key)
+    except Exception:
+        LOG.warning("Failed to get the LLM config for token counting, using the default encoding", llm_key=llm_key)
+        return get_encoding()
+    return get_encoding(llm_config.model_name)
+
+
+def count_tokens(text: str, llm_key: str | None = None) -> int:
+    encoding = get_encoding_for_llm_key(llm_key) if llm_key else get_encoding()
+    return len(encoding.encode(text))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    A cheap estimation without encoding the text. Only use it when an approximate count is good enough.
+    """
+    return -(-len(text) // ESTIMATED_CHARS_PER_TOKEN)
+
+
+def may_exceed_token_limit(text: str, max_tokens: int) -> bool:
+    # every token takes at least one byte, so the text can't exceed the limit if it has fewer bytes than the limit
+    return len(text) > max_tokens or len(text.encode("utf-8")) > max_tokens
+
 
-def count_tokens(text: str) -> int:
-    return len(tiktoken.encoding_for_model("gpt-4o").encode(text))
+def count_tokens_of_parts(parts: list[str], cache: MutableMapping[str, int], llm_key: str | None = None) -> int:
+    """
+    Count the tokens of the concatenated parts, memoizing the count of each part by its content digest.
+    The parts are encoded separately, so the result can be slightly off the count of the concatenated text.
+    """
+    total = 0
+    for part in parts:
+        digest = f"{llm_key or DEFAULT_ENCODING_MODEL}:{hashlib.sha256(part.encode('utf-8')).hexdigest()}"
+        token_count = cache.get(digest)
+        if token_count is None:
+            token_count = count_tokens(part, llm_key=llm_key)
+            cache[digest] = token_count
+        total += token_count
+    return total
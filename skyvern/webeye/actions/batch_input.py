@@ -0,0 +1,193 @@
+import re
+from dataclasses import dataclass
+from typing import TypeGuard
+
+import structlog
+from playwright.async_api import Frame, Page
+
+from skyvern.forge.sdk.models import Step
+from skyvern.forge.sdk.schemas.tasks import Task
+from skyvern.webeye.actions.actions import Action, InputTextAction
+from skyvern.webeye.actions.handler import get_actual_value_of_parameter_if_secret
+from skyvern.webeye.actions.responses import ActionResult, ActionSuccess
+from skyvern.webeye.scraper.scraper import ScrapedPage
+from skyvern.webeye.utils.dom import DomUtil, SkyvernElement
+from skyvern.webeye.utils.page import SkyvernFrame
+
+LOG = structlog.get_logger()
+
+MIN_BATCH_SIZE = 2
+# the input types that are plain text fields. tel is left out because the phone number format is checked by the llm
+BATCH_INPUT_TYPES = {"", "text", "email", "password", "url", "number"}
+# the attributes that mean the element opens a popup or a suggestion list when typing
+BLOCKING_ATTRIBUTES = ["list", "aria-autocomplete", "aria-haspopup", "aria-controls", "readonly", "hidden"]
+BLOCKING_ROLES = {"combobox", "searchbox", "spinbutton", "listbox"}
+# the names of the fields usually wired to an auto-completion (e.g. the address lookups)
+AUTO_COMPLETION_HINT_PATTERN = re.compile(
+    r"auto-?complete|typeahead|suggest|combobox|search|address|street|city|location|country|postal|zip",
+    re.IGNORECASE,
+)
+AUTO_COMPLETION_HINT_ATTRIBUTES = ["id", "name", "class", "placeholder", "aria-label", "autocomplete", "data-x-bind"]
+
+
+@dataclass
+class _BatchInputField:
+    action: InputTextAction
+    skyvern_element: SkyvernElement
+    text: str
+
+
+def is_batchable_input_action(action: Action, scraped_page: ScrapedPage) -> TypeGuard[InputTextAction]:
+    """
+    Whether the action only types into a plain text field, without any dropdown, auto-completion or navigation
+    involved, based on the scraped element. Those actions don't need the dropdown detection of
+    handle_input_text_action and can be filled together.
+    """
+    if not isinstance(action, InputTextAction) or not action.element_id:
+        return False
+
+    element = scraped_page.id_to_element_dict.get(action.element_id)
+    if not element or element.get("isSelectable"):
+        return False
+
+    attributes: dict = element.get("attributes") or {}
+    tag_name = element.get("tagName", "").lower()
+    if tag_name == "input":
+        if str(attributes.get("type") or "").lower() not in BATCH_INPUT_TYPES:
+            return False
+    elif tag_name != "textarea":
+        return False
+
+    if attributes.get("disabled") or attributes.get("aria-disabled"):
+        return False
+    if any(attributes.get(attr) not in (None, False, "false") for attr in BLOCKING_ATTRIBUTES):
+        return False
+    if str(attributes.get("role") or "").lower() in BLOCKING_ROLES:
+        return False
+    for attr in AUTO_COMPLETION_HINT_ATTRIBUTES:
+        value = attributes.get(attr)
+        if isinstance(value, str) and AUTO_COMPLETION_HINT_PATTERN.search(value):
+            return False
+
+    return True
+
+
+def find_input_action_batches(actions: list[Action], scraped_page: ScrapedPage) -> dict[int, int]:
+    """
+    Find the runs of consecutive batchable input actions on distinct elements.
+    Returns the start index -> the end index (exclusive) of each run with at least MIN_BATCH_SIZE actions.
+    """
+    batches: dict[int, int] = {}
+    start = 0
+    while start < len(actions):
+        end = start
+        element_ids: set[str] = set()
+        while end < len(actions):
+            action = actions[end]
+            if not is_batchable_input_action(action, scraped_page) or action.element_id in element_ids:
+                break
+            element_ids.add(action.element_id)
+            end += 1
+
+        if end - start >= MIN_BATCH_SIZE:
+            batches[start] = end
+        start = max(end, start + 1)
+    return batches
+
+
+async def _prepare_batch_input_field(
+    action: InputTextAction, dom: DomUtil, task: Task, step: Step
+) -> _BatchInputField | None:
+    try:
+        text: str | None = await get_actual_value_of_parameter_if_secret(task, action.text)
+        if text is None:
+            return None
+        skyvern_element = await dom.get_skyvern_element_by_id(action.element_id)
+        # dynamically validate the attr, since it could change into disabled after the scraping
+        if await skyvern_element.is_disabled(dynamic=True) or await skyvern_element.has_hidden_attr():
+            return None
+        return _BatchInputField(action=action, skyvern_element=skyvern_element, text=text)
+    except Exception:
+        LOG.info(
+            "Failed to prepare the input for the batch fill, going to input it separately",
+            task_id=task.task_id,
+            step_id=step.step_id,
+            element_id=action.element_id,
+            exc_info=True,
+        )
+        return None
+
+
+async def _fill_frame_in_batch(frame: Page | Frame, fields: list[_BatchInputField]) -> list[bool]:
+    """
+    Fill the fields of the frame with one script, then read all the values back to verify them.
+    """
+    skyvern_frame = await SkyvernFrame.create_instance(frame=frame)
+    elements = [await field.skyvern_element.get_element_handler() for field in fields]
+    await skyvern_frame.fill_inputs_in_batch(elements, [field.text for field in fields])
+    values = await skyvern_frame.get_input_values(elements)
+    return [value == field.text for value, field in zip(values, fields)]
+
+
+async def fill_input_text_actions_in_batch(
+    actions: list[InputTextAction],
+    page: Page,
+    scraped_page: ScrapedPage,
+    task: Task,
+    step: Step,
+) -> list[bool]:
+    """
+    Fill the plain text fields found by find_input_action_batches with one script per frame and a single
+    verification pass, instead of typing into them one by one.
+    Returns whether each field is verified, in the order of the actions. The actions still go through
+    ActionHandler.handle_action in order: the verified ones with handle_batch_filled_input_action, the other ones with
+    their usual handler.
+    """
+    dom = DomUtil(scraped_page, page)
+    fields: list[_BatchInputField | None] = [
+        await _prepare_batch_input_field(action, dom, task, step) for action in actions
+    ]
+
+    frame_to_fields: dict[str, list[tuple[int, _BatchInputField]]] = {}
+    for idx, field in enumerate(fields):
+        if field is not None:
+            frame_to_fields.setdefault(field.skyvern_element.get_frame_id(), []).append((idx, field))
+
+    verified = [False] * len(actions)
+    for frame_id, indexed_fields in frame_to_fields.items():
+        frame_fields = [field for _, field in indexed_fields]
+        try:
+            frame_verified = await _fill_frame_in_batch(frame_fields[0].skyvern_element.get_frame(), frame_fields)
+        except Exception:
+            LOG.warning(
+                "Failed to fill the inputs in batch, going to input them separately",
+                task_id=task.task_id,
+                step_id=step.step_id,
+                frame_id=frame_id,
+                exc_info=True,
+            )
+            continue
+        for (idx, _), is_verified in zip(indexed_fields, frame_verified):
+            verified[idx] = is_verified
+
+    LOG.info(
+        "Filled the inputs in batch",
+        task_id=task.task_id,
+        step_id=step.step_id,
+        num_actions=len(actions),
+        num_verified=sum(verified),
+    )
+    return verified
+
+
+async def handle_batch_filled_input_action(
+    action: Action,
+    page: Page,
+    scraped_page: ScrapedPage,
+    task: Task,
+    step: Step,
+) -> list[ActionResult]:
+    """
+    The handler of the input actions whose value is already filled and verified by fill_input_text_actions_in_batch.
+    """
+    return [ActionSuccess()]
@@ -85,7 +85,7 @@ async def _retrieve_action_plan(task: Task, step: Step, scraped_page: ScrapedPag
             found_element_with_no_hash = True
             continue
 
-        matching_element_ids = scraped_page.hash_to_element_ids.get(cached_action.skyvern_element_hash)
+        matching_element_ids = scraped_page.get_element_ids_by_hash(cached_action.skyvern_element_hash)
         if matching_element_ids and len(matching_element_ids) == 1:
             cached_actions_to_execute.append(cached_action)
             continue
@@ -125,7 +125,7 @@ async def _retrieve_action_plan(task: Task, step: Step, scraped_page: ScrapedPag
 
         # Update the element id with the element id from the current scraped page, matched by element hash
         if cached_action.skyvern_element_hash:
-            matching_element_ids = scraped_page.hash_to_element_ids.get(cached_action.skyvern_element_hash)
+            matching_element_ids = scraped_page.get_element_ids_by_hash(cached_action.skyvern_element_hash)
             if matching_element_ids and len(matching_element_ids) == 1:
                 matching_element_id = matching_element_ids[0]
                 updated_action.element_id = matching_element_id
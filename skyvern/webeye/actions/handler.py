@@ -344,7 +344,11 @@ class ActionHandler:
         step: Step,
         page: Page,
         action: Action,
+        handler: Callable[[Action, Page, ScrapedPage, Task, Step], Awaitable[list[ActionResult]]] | None = None,
     ) -> list[ActionResult]:
+        """
+        handler is used instead of the registered handler of the action type, e.g. for the inputs filled in batch.
+        """
         LOG.info("Handling action", action=action)
         actions_result: list[ActionResult] = []
         try:
@@ -362,7 +366,8 @@ class ActionHandler:
                         return actions_result
 
                 # do the handler
-                handler = ActionHandler._handled_action_types[action.action_type]
+                if handler is None:
+                    handler = ActionHandler._handled_action_types[action.action_type]
                 results = await handler(action, page, scraped_page, task, step)
                 actions_result.extend(results)
                 llm_caller = LLMCallerManager.get_llm_caller(task.task_id)
@@ -4,10 +4,13 @@ import asyncio
 import os
 import random
 import re
+import shutil
 import socket
 import subprocess
 import time
 import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Protocol
@@ -16,7 +19,16 @@ from urllib.parse import urlparse
 import aiofiles
 import psutil
 import structlog
-from playwright.async_api import BrowserContext, ConsoleMessage, Download, Page, Playwright
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    ConsoleMessage,
+    Download,
+    Frame,
+    Page,
+    Playwright,
+    async_playwright,
+)
 from pydantic import BaseModel, PrivateAttr
 
 from skyvern.config import settings
@@ -39,8 +51,13 @@ LOG = structlog.get_logger()
 
 BrowserCleanupFunc = Callable[[], None] | None
 
+# the browser types whose chromium processes are shared by runs
+SHARED_BROWSER_TYPES = ("chromium-headless-shared",)
+
 
-def set_browser_console_log(browser_context: BrowserContext, browser_artifacts: BrowserArtifacts) -> None:
+def set_browser_console_log(
+    browser_context: BrowserContext, browser_artifacts: BrowserArtifacts
+) -> Callable[[], None] | None:
     if browser_artifacts.browser_console_log_path is None:
         log_path = f"{settings.LOG_PATH}/{datetime.utcnow().strftime('%Y-%m-%d')}/{uuid.uuid4()}.log"
         try:
@@ -54,7 +71,7 @@ def set_browser_console_log(browser_context: BrowserContext, browser_artifacts:
                 log_path=log_path,
                 exc_info=True,
             )
-            return
+            return None
         browser_artifacts.browser_console_log_path = log_path
 
     async def browser_console_log(msg: ConsoleMessage) -> None:
@@ -65,6 +82,7 @@ def set_browser_console_log(browser_context: BrowserContext, browser_artifacts:
 
     LOG.info("browser console log is saved", log_path=browser_artifacts.browser_console_log_path)
     browser_context.on("console", browser_console_log)
+    return lambda: browser_context.remove_listener("console", browser_console_log)
 
 
 def set_download_file_listener(browser_context: BrowserContext, **kwargs: Any) -> None:
@@ -126,6 +144,43 @@ def set_download_file_listener(browser_context: BrowserContext, **kwargs: Any) -
     browser_context.on("page", listen_to_new_page)
 
 
+def set_download_file_saver(browser_context: BrowserContext, download_dir: str, **kwargs: Any) -> Callable[[], None]:
+    """
+    Save the downloaded files into the download dir of the run. It's used by the browser contexts shared by runs,
+    whose downloads_path can't be changed after the launch.
+    """
+
+    async def save_download(download: Download) -> None:
+        workflow_run_id = kwargs.get("workflow_run_id")
+        task_id = kwargs.get("task_id")
+        try:
+            async with asyncio.timeout(BROWSER_DOWNLOAD_TIMEOUT):
+                filename = download.suggested_filename or f"{uuid.uuid4()}{Path(download.url).suffix}"
+                file_path = Path(download_dir) / filename
+                if file_path.exists():
+                    file_path = Path(download_dir) / f"{uuid.uuid4()}_{filename}"
+                await download.save_as(file_path)
+        except asyncio.TimeoutError:
+            LOG.error(
+                "timeout to download file, going to cancel the download",
+                workflow_run_id=workflow_run_id,
+                task_id=task_id,
+            )
+            await download.cancel()
+        except Exception:
+            LOG.exception(
+                "Failed to save the downloaded file",
+                workflow_run_id=workflow_run_id,
+                task_id=task_id,
+            )
+
+    def listen_to_new_page(page: Page) -> None:
+        page.on("download", save_download)
+
+    browser_context.on("page", listen_to_new_page)
+    return lambda: browser_context.remove_listener("page", listen_to_new_page)
+
+
 def initialize_download_dir() -> str:
     context = ensure_context()
     return get_download_dir(context.workflow_run_id, context.task_id)
@@ -250,12 +305,22 @@ class BrowserContextFactory:
         browser_type = settings.BROWSER_TYPE
         browser_context: BrowserContext | None = None
         try:
-            creator = cls._creators.get(browser_type)
-            if not creator:
-                raise UnknownBrowserType(browser_type)
-            browser_context, browser_artifacts, cleanup_func = await creator(playwright, **kwargs)
-            set_browser_console_log(browser_context=browser_context, browser_artifacts=browser_artifacts)
-            set_download_file_listener(browser_context=browser_context, **kwargs)
+            # the pooled contexts are launched ahead of the run, so a run asking for a cdp port gets its own browser
+            if BrowserContextPool.is_enabled() and _get_cdp_port(kwargs) is None:
+                browser_context, browser_artifacts = await BrowserContextPool.acquire(**kwargs)
+                cleanup_func = None
+            else:
+                creator = cls._creators.get(browser_type)
+                if not creator:
+                    raise UnknownBrowserType(browser_type)
+                browser_context, browser_artifacts, cleanup_func = await creator(playwright, **kwargs)
+                set_browser_console_log(browser_context=browser_context, browser_artifacts=browser_artifacts)
+                if browser_type in SHARED_BROWSER_TYPES:
+                    set_download_file_saver(
+                        browser_context=browser_context, download_dir=initialize_download_dir(), **kwargs
+                    )
+                else:
+                    set_download_file_listener(browser_context=browser_context, **kwargs)
 
             proxy_location: ProxyLocation | None = kwargs.get("proxy_location")
             if proxy_location is not None:
@@ -267,7 +332,10 @@ class BrowserContextFactory:
             if browser_context is not None:
                 # FIXME: sometimes it can't close the browser context?
                 LOG.error("unexpected error happens after created browser context, going to close the context")
-                await browser_context.close()
+                if BrowserContextPool.owns(browser_context):
+                    await BrowserContextPool.release(browser_context, reusable=False)
+                else:
+                    await browser_context.close()
 
             if isinstance(e, UnknownBrowserType):
                 raise e
@@ -309,6 +377,302 @@ class BrowserArtifacts(BaseModel):
                 return await f.read()
 
 
+class SharedPlaywright:
+    """
+    One playwright driver per process, shared by the browser context pool and the shared chromium browsers.
+    """
+
+    _playwright: Playwright | None = None
+    _lock: asyncio.Lock | None = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return BrowserContextPool.is_enabled() or settings.BROWSER_TYPE in SHARED_BROWSER_TYPES
+
+    @classmethod
+    async def get(cls) -> Playwright:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if cls._playwright is None:
+                cls._playwright = await async_playwright().start()
+            return cls._playwright
+
+    @classmethod
+    def is_shared(cls, playwright: Playwright) -> bool:
+        return cls._playwright is not None and playwright is cls._playwright
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._playwright is not None:
+            await cls._playwright.stop()
+            cls._playwright = None
+
+
+@dataclass
+class PooledBrowserContext:
+    browser_context: BrowserContext
+    pool_key: str
+    user_data_dir: str
+    download_dir: str
+    uses: int = 0
+    # the storage of these origins is cleared before the context is handed to the next run
+    visited_origins: set[str] = field(default_factory=set)
+    listener_removers: list[Callable[[], None]] = field(default_factory=list)
+
+
+class BrowserContextPool:
+    """
+    A pool of pre-launched persistent chromium contexts, grouped by proxy location and sharing one playwright driver.
+    A released context is scrubbed (pages, cookies, permissions, cache and storage) before it's reused, and it's
+    closed after BROWSER_POOL_MAX_USES_PER_CONTEXT runs.
+    """
+
+    _idle_contexts: dict[str, list[PooledBrowserContext]] = defaultdict(list)
+    _in_use_contexts: dict[int, PooledBrowserContext] = dict()
+    _launching_count: dict[str, int] = defaultdict(int)
+    _refill_aiotasks: set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.ENABLE_BROWSER_POOL and settings.BROWSER_TYPE in ("chromium-headless", "chromium-headful")
+
+    @staticmethod
+    def get_pool_key(proxy_location: ProxyLocation | None) -> str:
+        return proxy_location.value if proxy_location else "NONE"
+
+    @classmethod
+    def owns(cls, browser_context: BrowserContext) -> bool:
+        return id(browser_context) in cls._in_use_contexts
+
+    @classmethod
+    async def _launch(cls, proxy_location: ProxyLocation | None) -> PooledBrowserContext:
+        playwright = await SharedPlaywright.get()
+        user_data_dir = make_temp_directory(prefix="skyvern_browser_")
+        # the files are moved to the download dir of the run by set_download_file_saver
+        download_dir = make_temp_directory(prefix="skyvern_downloads_")
+        BrowserContextFactory.update_chromium_browser_preferences(
+            user_data_dir=user_data_dir,
+            download_dir=download_dir,
+        )
+        browser_args = BrowserContextFactory.build_browser_args(proxy_location=proxy_location)
+        # the har path can't be changed after the launch, so the pooled contexts don't record har
+        browser_args.pop("record_har_path", None)
+        browser_args.update(
+            {
+                "user_data_dir": user_data_dir,
+                "downloads_path": download_dir,
+                "headless": settings.BROWSER_TYPE == "chromium-headless",
+            }
+        )
+        browser_context = await playwright.chromium.launch_persistent_context(**browser_args)
+        pooled_context = PooledBrowserContext(
+            browser_context=browser_context,
+            pool_key=cls.get_pool_key(proxy_location),
+            user_data_dir=user_data_dir,
+            download_dir=download_dir,
+        )
+
+        def track_origin(frame: Frame) -> None:
+            origin = urlparse(frame.url)
+            if origin.scheme in ("http", "https"):
+                pooled_context.visited_origins.add(f"{origin.scheme}://{origin.netloc}")
+
+        def track_page(page: Page) -> None:
+            page.on("framenavigated", track_origin)
+
+        for page in browser_context.pages:
+            track_page(page)
+        browser_context.on("page", track_page)
+        return pooled_context
+
+    @classmethod
+    async def _close(cls, pooled_context: PooledBrowserContext) -> None:
+        try:
+            async with asyncio.timeout(BROWSER_CLOSE_TIMEOUT):
+                await pooled_context.browser_context.close()
+        except Exception:
+            LOG.warning("Failed to close the pooled browser context", exc_info=True)
+        shutil.rmtree(pooled_context.user_data_dir, ignore_errors=True)
+        shutil.rmtree(pooled_context.download_dir, ignore_errors=True)
+
+    @staticmethod
+    async def _is_healthy(pooled_context: PooledBrowserContext) -> bool:
+        try:
+            async with asyncio.timeout(settings.BROWSER_ACTION_TIMEOUT_MS / 1000):
+                pages = pooled_context.browser_context.pages
+                page = pages[0] if pages else await pooled_context.browser_context.new_page()
+                await page.evaluate("1")
+            return True
+        except Exception:
+            LOG.warning("Pooled browser context failed the health check", exc_info=True)
+            return False
+
+    @classmethod
+    async def _scrub(cls, pooled_context: PooledBrowserContext) -> None:
+        browser_context = pooled_context.browser_context
+        # keep a blank page, otherwise the persistent context is closed with its last page
+        blank_page = await browser_context.new_page()
+        for page in browser_context.pages:
+            if page != blank_page:
+                await page.close()
+        await browser_context.clear_cookies()
+        await browser_context.clear_permissions()
+        cdp_session = await browser_context.new_cdp_session(blank_page)
+        try:
+            await cdp_session.send("Network.clearBrowserCache")
+            for origin in pooled_context.visited_origins:
+                await cdp_session.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        finally:
+            await cdp_session.detach()
+        pooled_context.visited_origins.clear()
+
+    @classmethod
+    async def _refill(cls, proxy_location: ProxyLocation | None) -> None:
+        pool_key = cls.get_pool_key(proxy_location)
+        while (
+            len(cls._idle_contexts[pool_key]) + cls._launching_count[pool_key] < settings.BROWSER_POOL_MIN_IDLE_CONTEXTS
+        ):
+            cls._launching_count[pool_key] += 1
+            try:
+                pooled_context = await cls._launch(proxy_location)
+            except Exception:
+                LOG.exception("Failed to pre-launch a browser context", pool_key=pool_key)
+                return
+            finally:
+                cls._launching_count[pool_key] -= 1
+            cls._idle_contexts[pool_key].append(pooled_context)
+
+    @classmethod
+    def warm_up(cls, proxy_location: ProxyLocation | None = None) -> None:
+        aio_task = asyncio.create_task(cls._refill(proxy_location))
+        cls._refill_aiotasks.add(aio_task)
+        aio_task.add_done_callback(cls._refill_aiotasks.discard)
+
+    @classmethod
+    async def acquire(
+        cls, proxy_location: ProxyLocation | None = None, **kwargs: Any
+    ) -> tuple[BrowserContext, BrowserArtifacts]:
+        pool_key = cls.get_pool_key(proxy_location)
+        pooled_context: PooledBrowserContext | None = None
+        while cls._idle_contexts[pool_key]:
+            candidate = cls._idle_contexts[pool_key].pop()
+            if await cls._is_healthy(candidate):
+                pooled_context = candidate
+                break
+            await cls._close(candidate)
+        if pooled_context is None:
+            LOG.info("No idle browser context in the pool, launching a new one", pool_key=pool_key)
+            pooled_context = await cls._launch(proxy_location)
+        cls.warm_up(proxy_location)
+
+        pooled_context.uses += 1
+        browser_context = pooled_context.browser_context
+        cls._in_use_contexts[id(browser_context)] = pooled_context
+
+        browser_artifacts = BrowserContextFactory.build_browser_artifacts()
+        remove_console_log_listener = set_browser_console_log(
+            browser_context=browser_context, browser_artifacts=browser_artifacts
+        )
+        if remove_console_log_listener:
+            pooled_context.listener_removers.append(remove_console_log_listener)
+        pooled_context.listener_removers.append(
+            set_download_file_saver(browser_context=browser_context, download_dir=initialize_download_dir(), **kwargs)
+        )
+        LOG.info("Acquired a browser context from the pool", pool_key=pool_key, uses=pooled_context.uses)
+        return browser_context, browser_artifacts
+
+    @classmethod
+    async def release(cls, browser_context: BrowserContext, reusable: bool = True) -> None:
+        pooled_context = cls._in_use_contexts.pop(id(browser_context), None)
+        if pooled_context is None:
+            return
+
+        for remove_listener in pooled_context.listener_removers:
+            remove_listener()
+        pooled_context.listener_removers.clear()
+
+        if (
+            reusable
+            and pooled_context.uses < settings.BROWSER_POOL_MAX_USES_PER_CONTEXT
+            and len(cls._idle_contexts[pooled_context.pool_key]) < settings.BROWSER_POOL_MAX_IDLE_CONTEXTS
+        ):
+            try:
+                async with asyncio.timeout(BROWSER_CLOSE_TIMEOUT):
+                    await cls._scrub(pooled_context)
+                cls._idle_contexts[pooled_context.pool_key].append(pooled_context)
+                return
+            except Exception:
+                LOG.warning("Failed to scrub the browser context, going to close it", exc_info=True)
+        await cls._close(pooled_context)
+
+    @classmethod
+    async def close(cls) -> None:
+        for pooled_contexts in cls._idle_contexts.values():
+            for pooled_context in pooled_contexts:
+                await cls._close(pooled_context)
+        cls._idle_contexts = defaultdict(list)
+        for pooled_context in cls._in_use_contexts.values():
+            await cls._close(pooled_context)
+        cls._in_use_contexts = dict()
+
+
+class SharedChromiumBrowsers:
+    """
+    A few chromium processes, each hosting many isolated browser contexts, one per run.
+    A new process is launched only when every running process already hosts SHARED_BROWSER_MAX_CONTEXTS_PER_PROCESS
+    contexts and there are fewer than SHARED_BROWSER_MAX_PROCESSES processes.
+    """
+
+    _browsers: list[Browser] = []
+    _lock: asyncio.Lock | None = None
+    _download_dir: str | None = None
+
+    @classmethod
+    async def _launch(cls) -> Browser:
+        playwright = await SharedPlaywright.get()
+        if cls._download_dir is None:
+            # the files are moved to the download dir of the run by set_download_file_saver
+            cls._download_dir = make_temp_directory(prefix="skyvern_downloads_")
+        browser_args = BrowserContextFactory.build_browser_args()
+        browser = await playwright.chromium.launch(
+            headless=True,
+            args=browser_args["args"],
+            ignore_default_args=browser_args["ignore_default_args"],
+            downloads_path=cls._download_dir,
+        )
+        LOG.info("Launched a shared chromium process", num_processes=len(cls._browsers) + 1)
+        return browser
+
+    @classmethod
+    async def get_browser(cls) -> Browser:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            cls._browsers = [browser for browser in cls._browsers if browser.is_connected()]
+            least_loaded = min(cls._browsers, key=lambda browser: len(browser.contexts), default=None)
+            if least_loaded is not None and (
+                len(least_loaded.contexts) < settings.SHARED_BROWSER_MAX_CONTEXTS_PER_PROCESS
+                or len(cls._browsers) >= settings.SHARED_BROWSER_MAX_PROCESSES
+            ):
+                return least_loaded
+            browser = await cls._launch()
+            cls._browsers.append(browser)
+            return browser
+
+    @classmethod
+    async def close(cls) -> None:
+        for browser in cls._browsers:
+            try:
+                await browser.close()
+            except Exception:
+                LOG.warning("Failed to close the shared chromium process", exc_info=True)
+        cls._browsers = []
+        if cls._download_dir:
+            shutil.rmtree(cls._download_dir, ignore_errors=True)
+            cls._download_dir = None
+
+
 def setup_proxy() -> dict | None:
     if not settings.HOSTED_PROXY_POOL or settings.HOSTED_PROXY_POOL.strip() == "":
         LOG.warning("No proxy server value found. Continuing without using proxy...")
@@ -509,9 +873,25 @@ async def _create_cdp_connection_browser(
     return browser_context, browser_artifacts, None
 
 
+async def _create_shared_chromium_context(
+    playwright: Playwright, proxy_location: ProxyLocation | None = None, **kwargs: dict
+) -> tuple[BrowserContext, BrowserArtifacts, BrowserCleanupFunc]:
+    browser = await SharedChromiumBrowsers.get_browser()
+    browser_args = BrowserContextFactory.build_browser_args(proxy_location=proxy_location)
+    context_args = {
+        key: browser_args[key]
+        for key in ("locale", "color_scheme", "record_har_path", "record_video_dir", "viewport", "proxy", "timezone_id")
+        if key in browser_args
+    }
+    browser_artifacts = BrowserContextFactory.build_browser_artifacts(har_path=browser_args["record_har_path"])
+    browser_context = await browser.new_context(accept_downloads=True, **context_args)
+    return browser_context, browser_artifacts, None
+
+
 BrowserContextFactory.register_type("chromium-headless", _create_headless_chromium)
 BrowserContextFactory.register_type("chromium-headful", _create_headful_chromium)
 BrowserContextFactory.register_type("cdp-connect", _create_cdp_connection_browser)
+BrowserContextFactory.register_type("chromium-headless-shared", _create_shared_chromium_context)
 
 
 class BrowserState:
@@ -752,7 +1132,11 @@ class BrowserState:
             async with asyncio.timeout(BROWSER_CLOSE_TIMEOUT):
                 await self._close_all_other_pages()
                 if self.browser_context is not None:
-                    await self.browser_context.close()
+                    if BrowserContextPool.owns(self.browser_context):
+                        # the context failed the validation, don't hand it to another run
+                        await BrowserContextPool.release(self.browser_context, reusable=False)
+                    else:
+                        await self.browser_context.close()
                 self.browser_context = None
                 await self.set_working_page(None)
                 return True
@@ -792,7 +1176,10 @@ class BrowserState:
                 if self.browser_context and close_browser_on_completion:
                     LOG.info("Closing browser context and its pages")
                     try:
-                        await self.browser_context.close()
+                        if BrowserContextPool.owns(self.browser_context):
+                            await BrowserContextPool.release(self.browser_context)
+                        else:
+                            await self.browser_context.close()
                     except Exception:
                         LOG.warning("Failed to close browser context", exc_info=True)
                     LOG.info("Main browser context and all its pages are closed")
@@ -807,7 +1194,8 @@ class BrowserState:
 
         try:
             async with asyncio.timeout(BROWSER_CLOSE_TIMEOUT):
-                if self.pw and close_browser_on_completion:
+                # the shared playwright driver is stopped by the browser manager
+                if self.pw and close_browser_on_completion and not SharedPlaywright.is_shared(self.pw):
                     try:
                         LOG.info("Stopping playwright")
                         await self.pw.stop()
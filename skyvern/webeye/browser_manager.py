@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 
 import structlog
@@ -7,14 +8,27 @@ from playwright.async_api import async_playwright
 
 from skyvern.exceptions import MissingBrowserState
 from skyvern.forge import app
+from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.schemas.tasks import Task
 from skyvern.forge.sdk.workflow.models.workflow import WorkflowRun
 from skyvern.schemas.runs import ProxyLocation
-from skyvern.webeye.browser_factory import BrowserContextFactory, BrowserState, VideoArtifact
+from skyvern.webeye.browser_factory import (
+    BrowserContextFactory,
+    BrowserContextPool,
+    BrowserState,
+    SharedChromiumBrowsers,
+    SharedPlaywright,
+    VideoArtifact,
+)
 
 LOG = structlog.get_logger()
 
 
+def _read_video_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
 class BrowserManager:
     instance = None
     pages: dict[str, BrowserState] = dict()
@@ -32,7 +46,10 @@ class BrowserManager:
         workflow_run_id: str | None = None,
         organization_id: str | None = None,
     ) -> BrowserState:
-        pw = await async_playwright().start()
+        if SharedPlaywright.is_enabled():
+            pw = await SharedPlaywright.get()
+        else:
+            pw = await async_playwright().start()
         (
             browser_context,
             browser_artifacts,
@@ -53,17 +70,30 @@ class BrowserManager:
             browser_cleanup=browser_cleanup,
         )
 
+    @staticmethod
+    def get_browser_state_key(workflow_run_id: str) -> str:
+        """
+        The key of the browser state of the workflow run. It's overridden by the context when a part of the workflow
+        run uses its own browser state, e.g. an iteration of a concurrent loop.
+        """
+        context = skyvern_context.current()
+        if context and context.browser_state_key:
+            return context.browser_state_key
+        return workflow_run_id
+
     def get_for_task(self, task_id: str, workflow_run_id: str | None = None) -> BrowserState | None:
         if task_id in self.pages:
             return self.pages[task_id]
 
-        if workflow_run_id and workflow_run_id in self.pages:
+        browser_state_key = self.get_browser_state_key(workflow_run_id) if workflow_run_id else None
+        if browser_state_key and browser_state_key in self.pages:
             LOG.info(
                 "Browser state for task not found. Using browser state for workflow run",
                 task_id=task_id,
                 workflow_run_id=workflow_run_id,
+                browser_state_key=browser_state_key,
             )
-            self.pages[task_id] = self.pages[workflow_run_id]
+            self.pages[task_id] = self.pages[browser_state_key]
             return self.pages[task_id]
 
         return None
@@ -118,7 +148,7 @@ class BrowserManager:
 
         self.pages[task.task_id] = browser_state
         if task.workflow_run_id:
-            self.pages[task.workflow_run_id] = browser_state
+            self.pages[self.get_browser_state_key(task.workflow_run_id)] = browser_state
 
         # The URL here is only used when creating a new page, and not when using an existing page.
         # This will make sure browser_state.page is not None.
@@ -135,12 +165,16 @@ class BrowserManager:
     ) -> BrowserState:
         parent_workflow_run_id = workflow_run.parent_workflow_run_id
         workflow_run_id = workflow_run.workflow_run_id
+        browser_state_key = self.get_browser_state_key(workflow_run_id)
+        if browser_state_key != workflow_run_id:
+            # the browser state isn't shared with the parent workflow run
+            parent_workflow_run_id = None
         browser_state = self.get_for_workflow_run(
             workflow_run_id=workflow_run_id, parent_workflow_run_id=parent_workflow_run_id
         )
         if browser_state:
             # always keep the browser state for the workflow run and the parent workflow run synced
-            self.pages[workflow_run_id] = browser_state
+            self.pages[browser_state_key] = browser_state
             if parent_workflow_run_id:
                 self.pages[parent_workflow_run_id] = browser_state
             return browser_state
@@ -185,7 +219,7 @@ class BrowserManager:
                 organization_id=workflow_run.organization_id,
             )
 
-        self.pages[workflow_run_id] = browser_state
+        self.pages[browser_state_key] = browser_state
         if parent_workflow_run_id:
             self.pages[parent_workflow_run_id] = browser_state
 
@@ -202,6 +236,10 @@ class BrowserManager:
     def get_for_workflow_run(
         self, workflow_run_id: str, parent_workflow_run_id: str | None = None
     ) -> BrowserState | None:
+        browser_state_key = self.get_browser_state_key(workflow_run_id)
+        if browser_state_key != workflow_run_id:
+            return self.pages.get(browser_state_key)
+
         if parent_workflow_run_id and parent_workflow_run_id in self.pages:
             return self.pages[parent_workflow_run_id]
 
@@ -211,9 +249,11 @@ class BrowserManager:
         return None
 
     def set_video_artifact_for_task(self, task: Task, artifacts: list[VideoArtifact]) -> None:
-        if task.workflow_run_id and task.workflow_run_id in self.pages:
-            self.pages[task.workflow_run_id].browser_artifacts.video_artifacts = artifacts
-            return
+        if task.workflow_run_id:
+            browser_state_key = self.get_browser_state_key(task.workflow_run_id)
+            if browser_state_key in self.pages:
+                self.pages[browser_state_key].browser_artifacts.video_artifacts = artifacts
+                return
         if task.task_id in self.pages:
             self.pages[task.task_id].browser_artifacts.video_artifacts = artifacts
             return
@@ -239,8 +279,10 @@ class BrowserManager:
         for i, video_artifact in enumerate(browser_state.browser_artifacts.video_artifacts):
             path = video_artifact.video_path
             if path and os.path.exists(path=path):
-                with open(path, "rb") as f:
-                    browser_state.browser_artifacts.video_artifacts[i].video_data = f.read()
+                # the recording can be large, don't block the event loop while reading it
+                browser_state.browser_artifacts.video_artifacts[i].video_data = await asyncio.to_thread(
+                    _read_video_file, path
+                )
 
         return browser_state.browser_artifacts.video_artifacts
 
@@ -288,6 +330,9 @@ class BrowserManager:
         for browser_state in cls.pages.values():
             await browser_state.close()
         cls.pages = dict()
+        await BrowserContextPool.close()
+        await SharedChromiumBrowsers.close()
+        await SharedPlaywright.stop()
         LOG.info("BrowserManger is closed")
 
     async def cleanup_for_task(
@@ -323,6 +368,24 @@ class BrowserManager:
 
         return browser_state_to_close
 
+    async def cleanup_for_browser_state_key(self, browser_state_key: str) -> tuple[BrowserState | None, list[str]]:
+        """
+        Close the browser state created under an overridden key, see get_browser_state_key.
+        Returns the closed browser state and the ids of the tasks that used it, in the order they got it.
+        """
+        browser_state_to_close = self.pages.pop(browser_state_key, None)
+        if browser_state_to_close is None:
+            return None, []
+
+        task_ids = [key for key, browser_state in self.pages.items() if browser_state is browser_state_to_close]
+        for task_id in task_ids:
+            self.pages.pop(task_id, None)
+        try:
+            await browser_state_to_close.close()
+        except Exception:
+            LOG.warning("Failed to close the browser state", browser_state_key=browser_state_key, exc_info=True)
+        return browser_state_to_close, task_ids
+
     async def cleanup_for_workflow_run(
         self,
         workflow_run_id: str,
@@ -1386,9 +1386,11 @@ async function buildElementObject(
 }
 
 // build the element tree for the body
+// if use_diff is true, the subtrees unchanged since the last diff build are restored from the snapshots
 async function buildTreeFromBody(
   frame = "main.frame",
   frame_index = undefined,
+  use_diff = false,
 ) {
   if (
     window.GlobalSkyvernFrameIndex === undefined &&
@@ -1396,7 +1398,15 @@ async function buildTreeFromBody(
   ) {
     window.GlobalSkyvernFrameIndex = frame_index;
   }
-  return await buildElementTree(document.body, frame);
+  const diffState = use_diff ? takeDiffScrapeDirtyState() : undefined;
+  return await buildElementTree(
+    document.body,
+    frame,
+    false,
+    true,
+    undefined,
+    diffState,
+  );
 }
 
 async function buildElementTree(
@@ -1405,6 +1415,7 @@ async function buildElementTree(
   full_tree = false,
   needContext = true,
   hoverStylesMap = undefined,
+  diffState = undefined,
 ) {
   // Generate hover styles map at the start
   if (hoverStylesMap === undefined) {
@@ -1413,6 +1424,24 @@ async function buildElementTree(
 
   var elements = [];
   var resultArray = [];
+  const idToElementObj = new Map();
+  // only used by the diff build to snapshot the new elements
+  const idToDomElement = new Map();
+  const reusedSnapshots = new Map();
+
+  function attachElementObj(elementObj, parentId) {
+    idToElementObj.set(elementObj.id, elementObj);
+    // If the element is interactable but has no interactable parent,
+    // then it starts a new tree, so add it to the result array
+    if (parentId === null) {
+      resultArray.push(elementObj);
+    }
+    // If the element is interactable and has an interactable parent,
+    // then add it to the children of the parent
+    else {
+      idToElementObj.get(parentId).children.push(elementObj);
+    }
+  }
 
   function getChildElements(element) {
     if (element.childElementCount !== 0) {
@@ -1446,6 +1475,17 @@ async function buildElementTree(
       }
     }
 
+    if (diffState) {
+      const snapshot = getReusableDiffSnapshot(element, diffState);
+      if (snapshot) {
+        const elementObj = restoreDiffSnapshot(snapshot, elements);
+        reusedSnapshots.set(elementObj, snapshot);
+        attachElementObj(elementObj, parentId);
+        return;
+      }
+      window.globalDiffScrapeState.snapshots.delete(element);
+    }
+
     let children = [];
     // sometimes the shadowRoot is not visible, but the elemnets in the shadowRoot are visible
     if (element.shadowRoot) {
@@ -1501,21 +1541,11 @@ async function buildElementTree(
 
       if (elementObj) {
         elements.push(elementObj);
-        // If the element is interactable but has no interactable parent,
-        // then it starts a new tree, so add it to the result array
-        // and set its id as the interactable parent id for the next elements
-        // under it
-        if (parentId === null) {
-          resultArray.push(elementObj);
-        }
-        // If the element is interactable and has an interactable parent,
-        // then add it to the children of the parent
-        else {
-          // TODO: use dict/object so that we access these in O(1) instead
-          elements
-            .find((element) => element.id === parentId)
-            .children.push(elementObj);
+        if (diffState) {
+          idToDomElement.set(elementObj.id, element);
         }
+        attachElementObj(elementObj, parentId);
+        // set its id as the interactable parent id for the next elements under it
         parentId = elementObj.id;
       }
     }
@@ -1735,6 +1765,11 @@ async function buildElementTree(
   // setup before parsing the dom
   await processElement(starter, null);
 
+  // snapshot before the context and text trimming below, which mutate the element objects
+  if (diffState) {
+    storeDiffSnapshots(resultArray, idToDomElement, reusedSnapshots);
+  }
+
   for (var element of elements) {
     if (
       ((element.tagName === "input" && element.attributes["type"] === "text") ||
@@ -2403,6 +2438,155 @@ if (window.globalObserverForDOMIncrement === undefined) {
   });
 }
 
+// DOM diff scraping: a persistent observer marks the nodes changed since the last diff build,
+// so the untouched subtrees can be restored from the snapshots instead of being re-walked.
+if (window.globalDiffScrapeState === undefined) {
+  window.globalDiffScrapeState = {
+    observer: null,
+    // DOM element -> element object snapshot (shared by the parent snapshots, never mutated)
+    snapshots: new WeakMap(),
+    // the changed nodes and all their ancestors
+    dirtyNodes: new Set(),
+    // the nodes whose attributes changed, which might affect the whole subtree (visibility, etc)
+    subtreeDirtyNodes: new Set(),
+  };
+}
+
+function markDiffNodeDirty(node, subtree = false) {
+  const state = window.globalDiffScrapeState;
+  let current =
+    node?.nodeType === Node.ELEMENT_NODE ? node : node?.parentElement;
+  if (!current) return;
+  if (subtree) {
+    state.subtreeDirtyNodes.add(current);
+  }
+  // ancestors of a dirty node are always dirty, so we can stop early
+  while (current && !state.dirtyNodes.has(current)) {
+    state.dirtyNodes.add(current);
+    current = parentElementOrShadowHost(current);
+  }
+}
+
+function handleDiffMutations(mutationsList) {
+  for (const mutation of mutationsList) {
+    switch (mutation.type) {
+      case "attributes": {
+        // skip the attributes updated by the scraper itself
+        if (mutation.attributeName === "unique_id") continue;
+        if (
+          mutation.attributeName === "target" &&
+          mutation.target.tagName?.toLowerCase() === "a"
+        )
+          continue;
+        markDiffNodeDirty(mutation.target, true);
+        break;
+      }
+      case "childList": {
+        markDiffNodeDirty(mutation.target);
+        // the moved nodes could be rendered differently under the new parent
+        for (const node of mutation.addedNodes) {
+          if (node.nodeType === Node.ELEMENT_NODE) {
+            window.globalDiffScrapeState.subtreeDirtyNodes.add(node);
+          }
+        }
+        break;
+      }
+      case "characterData": {
+        markDiffNodeDirty(mutation.target);
+        break;
+      }
+    }
+  }
+}
+
+function startGlobalDiffObserver() {
+  const state = window.globalDiffScrapeState;
+  if (state.observer) return;
+  state.observer = new MutationObserver(handleDiffMutations);
+  state.observer.observe(document.documentElement, {
+    attributes: true,
+    childList: true,
+    subtree: true,
+    characterData: true,
+  });
+  // typing or selecting updates the value property without any DOM mutation
+  const onUserInput = (event) =>
+    markDiffNodeDirty(event.composedPath()[0], true);
+  document.addEventListener("input", onUserInput, true);
+  document.addEventListener("change", onUserInput, true);
+}
+
+function takeDiffScrapeDirtyState() {
+  const state = window.globalDiffScrapeState;
+  startGlobalDiffObserver();
+  handleDiffMutations(state.observer.takeRecords());
+  // the mutations happening during the build will be handled by the next build
+  const diffState = {
+    dirtyNodes: state.dirtyNodes,
+    subtreeDirtyNodes: state.subtreeDirtyNodes,
+  };
+  state.dirtyNodes = new Set();
+  state.subtreeDirtyNodes = new Set();
+  return diffState;
+}
+
+function getReusableDiffSnapshot(element, diffState) {
+  const snapshot = window.globalDiffScrapeState.snapshots.get(element);
+  if (!snapshot || diffState.dirtyNodes.has(element)) {
+    return null;
+  }
+  if (diffState.subtreeDirtyNodes.size > 0) {
+    for (let node = element; node; node = parentElementOrShadowHost(node)) {
+      if (diffState.subtreeDirtyNodes.has(node)) {
+        return null;
+      }
+    }
+  }
+  return snapshot;
+}
+
+function restoreDiffSnapshot(snapshot, elements) {
+  const elementObj = {
+    ...snapshot,
+    attributes: { ...snapshot.attributes },
+    children: [],
+  };
+  elements.push(elementObj);
+  for (const child of snapshot.children) {
+    elementObj.children.push(restoreDiffSnapshot(child, elements));
+  }
+  return elementObj;
+}
+
+function storeDiffSnapshots(resultArray, idToDomElement, reusedSnapshots) {
+  const snapshots = window.globalDiffScrapeState.snapshots;
+  // post-order, so the snapshots of the children are shared with the parent snapshot
+  const snapshotOf = (elementObj) => {
+    if (reusedSnapshots.has(elementObj)) {
+      return reusedSnapshots.get(elementObj);
+    }
+    const children = elementObj.children.map(snapshotOf);
+    const domElement = idToDomElement.get(elementObj.id);
+    // shadow DOM is not observed, so the elements in it can't be reused
+    if (
+      !domElement ||
+      elementObj.shadowHost ||
+      domElement.shadowRoot ||
+      children.includes(null)
+    ) {
+      return null;
+    }
+    const snapshot = {
+      ...elementObj,
+      attributes: { ...elementObj.attributes },
+      children: children,
+    };
+    snapshots.set(domElement, snapshot);
+    return snapshot;
+  };
+  resultArray.forEach(snapshotOf);
+}
+
 function startGlobalIncrementalObserver(element = null) {
   window.globalListnerFlag = true;
   window.globalDomDepthMap = new Map();
@@ -2539,6 +2723,204 @@ async function getIncrementElements(wait_until_finished = true) {
   return [Array.from(idToElement.values()), cleanedTreeList];
 }
 
+// network activity tracking for the page settle detection.
+// it's installed by the first waitForPageSettled call, so the pages are left untouched when the settle detection is
+// disabled. only the requests sent after that can be counted as pending, the earlier ones are covered by the resource
+// timing entries.
+function instrumentNetworkActivity() {
+  if (window.globalSkyvernNetworkActivity !== undefined) {
+    return window.globalSkyvernNetworkActivity;
+  }
+  window.globalSkyvernNetworkActivity = {
+    pendingRequests: 0,
+    lastActivityTime: performance.now(),
+  };
+
+  const onRequestStart = () => {
+    window.globalSkyvernNetworkActivity.pendingRequests++;
+    window.globalSkyvernNetworkActivity.lastActivityTime = performance.now();
+  };
+  const onRequestEnd = () => {
+    const activity = window.globalSkyvernNetworkActivity;
+    activity.pendingRequests = Math.max(0, activity.pendingRequests - 1);
+    activity.lastActivityTime = performance.now();
+  };
+
+  try {
+    const originalFetch = window.fetch;
+    if (typeof originalFetch === "function") {
+      window.fetch = function (...args) {
+        onRequestStart();
+        return originalFetch.apply(this, args).finally(onRequestEnd);
+      };
+    }
+
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+      onRequestStart();
+      this.addEventListener("loadend", onRequestEnd, { once: true });
+      return originalSend.apply(this, args);
+    };
+  } catch (e) {
+    _jsConsoleWarn("failed to instrument the network requests: ", e);
+  }
+
+  try {
+    new PerformanceObserver(() => {
+      window.globalSkyvernNetworkActivity.lastActivityTime = performance.now();
+    }).observe({ type: "resource", buffered: false });
+  } catch (e) {
+    _jsConsoleWarn("failed to observe the resource timing: ", e);
+  }
+  return window.globalSkyvernNetworkActivity;
+}
+
+function countRunningFiniteAnimations() {
+  if (typeof document.getAnimations !== "function") {
+    return 0;
+  }
+  // infinite animations (spinners, carousels, etc) will never end, so we don't wait for them
+  return document
+    .getAnimations()
+    .filter(
+      (animation) =>
+        animation.playState === "running" &&
+        animation.effect?.getComputedTiming().endTime !== Infinity,
+    ).length;
+}
+
+// wait until there's no pending request, no DOM mutation and no running animation for quiet_ms,
+// or max_wait_ms has passed. return the timings of the settle detection
+async function waitForPageSettled(quiet_ms = 500, max_wait_ms = 3000) {
+  const startTime = performance.now();
+  let lastMutationTime = startTime;
+  let mutationCount = 0;
+  const observer = new MutationObserver((mutationsList) => {
+    mutationCount += mutationsList.length;
+    lastMutationTime = performance.now();
+  });
+  observer.observe(document.documentElement, {
+    attributes: true,
+    childList: true,
+    subtree: true,
+    characterData: true,
+  });
+
+  const activity = instrumentNetworkActivity();
+  let settled = false;
+  let frameCount = 0;
+  let now = startTime;
+  let runningAnimations = 0;
+  try {
+    while (now - startTime < max_wait_ms) {
+      // requestAnimationFrame is paused in the background tabs
+      await Promise.race([waitForNextFrame(), asyncSleepFor(100)]);
+      frameCount++;
+      now = performance.now();
+      runningAnimations = countRunningFiniteAnimations();
+      if (
+        document.readyState === "complete" &&
+        activity.pendingRequests === 0 &&
+        now - activity.lastActivityTime >= quiet_ms &&
+        now - lastMutationTime >= quiet_ms &&
+        runningAnimations === 0
+      ) {
+        settled = true;
+        break;
+      }
+    }
+  } finally {
+    observer.disconnect();
+  }
+
+  return {
+    settled: settled,
+    elapsed_ms: Math.round(now - startTime),
+    frame_count: frameCount,
+    mutation_count: mutationCount,
+    pending_requests: activity.pendingRequests,
+    running_animations: runningAnimations,
+    ms_since_last_network_activity: Math.round(now - activity.lastActivityTime),
+    ms_since_last_mutation: Math.round(now - lastMutationTime),
+  };
+}
+
+// Counts the DOM mutations and the user inputs on the page, so the page capture after an action can be downgraded
+// when nothing changed since the last capture.
+if (window.globalPageChangeState === undefined) {
+  window.globalPageChangeState = {
+    observer: null,
+    changeCount: 0,
+    lastCapturedChangeCount: null,
+    lastCapturedUrl: null,
+  };
+}
+
+function countPageChanges(mutationsList) {
+  const state = window.globalPageChangeState;
+  for (const mutation of mutationsList) {
+    // the unique_id attributes are set by the scraper itself
+    if (
+      mutation.type === "attributes" &&
+      mutation.attributeName === "unique_id"
+    ) {
+      continue;
+    }
+    state.changeCount++;
+  }
+}
+
+function startPageChangeObserver() {
+  const state = window.globalPageChangeState;
+  if (state.observer) return;
+  state.observer = new MutationObserver(countPageChanges);
+  state.observer.observe(document.documentElement, {
+    attributes: true,
+    childList: true,
+    subtree: true,
+    characterData: true,
+  });
+  // typing or selecting updates the value property without any DOM mutation
+  const onUserInput = () => state.changeCount++;
+  document.addEventListener("input", onUserInput, true);
+  document.addEventListener("change", onUserInput, true);
+}
+
+function isPageChangedSinceLastCapture() {
+  const state = window.globalPageChangeState;
+  startPageChangeObserver();
+  countPageChanges(state.observer.takeRecords());
+  const changed =
+    state.lastCapturedChangeCount === null ||
+    state.changeCount !== state.lastCapturedChangeCount ||
+    window.location.href !== state.lastCapturedUrl;
+  state.lastCapturedChangeCount = state.changeCount;
+  state.lastCapturedUrl = window.location.href;
+  return changed;
+}
+
+// Fill the plain text inputs in one go, as if the user typed into each of them and moved on
+function fillInputsInBatch(elements, values) {
+  for (let i = 0; i < elements.length; i++) {
+    const element = elements[i];
+    const prototype =
+      element instanceof HTMLTextAreaElement
+        ? HTMLTextAreaElement.prototype
+        : HTMLInputElement.prototype;
+    // use the native setter, so the frameworks tracking the value (e.g. React) see the change
+    const valueSetter = Object.getOwnPropertyDescriptor(prototype, "value").set;
+    element.focus();
+    valueSetter.call(element, values[i]);
+    element.dispatchEvent(new Event("input", { bubbles: true }));
+    element.dispatchEvent(new Event("change", { bubbles: true }));
+    element.blur();
+  }
+}
+
+function getInputValues(elements) {
+  return elements.map((element) => element.value);
+}
+
 /**
 
 // How to run the code:
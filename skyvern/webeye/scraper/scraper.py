@@ -1,7 +1,9 @@
 import asyncio
 import copy
 import json
+import time
 from collections import defaultdict
+from collections.abc import MutableMapping
 from enum import StrEnum
 from typing import Any, Awaitable, Callable, Self
 
@@ -11,12 +13,12 @@ from playwright.async_api import ElementHandle, Frame, Locator, Page
 from pydantic import BaseModel, PrivateAttr
 
 from skyvern.config import settings
-from skyvern.constants import BUILDING_ELEMENT_TREE_TIMEOUT_MS, DEFAULT_MAX_TOKENS, SKYVERN_DIR, SKYVERN_ID_ATTR
+from skyvern.constants import BUILDING_ELEMENT_TREE_TIMEOUT_MS, DEFAULT_MAX_TOKENS, SKYVERN_ID_ATTR
 from skyvern.exceptions import FailedToTakeScreenshot, ScrapingFailed, UnknownElementTreeFormat
 from skyvern.forge.sdk.api.crypto import calculate_sha256
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.utils.image_resizer import Resolution
-from skyvern.utils.token_counter import count_tokens
+from skyvern.utils.token_counter import count_tokens_of_parts, may_exceed_token_limit
 from skyvern.webeye.browser_factory import BrowserState
 from skyvern.webeye.utils.page import SkyvernFrame
 
@@ -68,21 +70,8 @@ ELEMENT_NODE_ATTRIBUTES = {
     "id",
 }
 
-
-def load_js_script() -> str:
-    # TODO: Handle file location better. This is a hacky way to find the file location.
-    path = f"{SKYVERN_DIR}/webeye/scraper/domUtils.js"
-    try:
-        # TODO: Implement TS of domUtils.js and use the complied JS file instead of the raw JS file.
-        # This will allow our code to be type safe.
-        with open(path, "r") as f:
-            return f.read()
-    except FileNotFoundError as e:
-        LOG.exception("Failed to load the JS script", path=path)
-        raise e
-
-
-JS_FUNCTION_DEFS = load_js_script()
+# the legacy element hashes (before versioning) have no prefix
+ELEMENT_HASH_VERSION_PREFIX = "v2:"
 
 
 # function to convert JSON element to HTML
@@ -98,7 +87,8 @@ def json_to_html(element: dict, need_skyvern_attrs: bool = True) -> str:
     if element is flagged as dropped, the html format is empty
     """
     tag = element["tagName"]
-    attributes: dict[str, Any] = copy.deepcopy(element.get("attributes", {}))
+    # attribute values are plain strings/booleans, a shallow copy is enough to update them without side effects
+    attributes: dict[str, Any] = dict(element.get("attributes", {}))
 
     interactable = element.get("interactable", False)
     if element.get("isDropped", False):
@@ -178,6 +168,11 @@ def clean_element_before_hashing(element: dict) -> dict:
 
 
 def hash_element(element: dict) -> str:
+    """
+    Legacy (unversioned) hash, which serializes the whole subtree of the element.
+    Used to match the action plans cached before the element hash was versioned, and by
+    remove_duplicated_HTML_element to find the elements with the same subtree.
+    """
     hash_ready_element = clean_element_before_hashing(element)
     # Sort the keys to ensure consistent ordering
     element_string = json.dumps(hash_ready_element, sort_keys=True)
@@ -185,24 +180,81 @@ def hash_element(element: dict) -> str:
     return calculate_sha256(element_string)
 
 
+def is_legacy_element_hash(element_hash: str) -> bool:
+    return not element_hash.startswith(ELEMENT_HASH_VERSION_PREFIX)
+
+
+def _element_hash_payload(element: dict) -> dict:
+    payload = {key: value for key, value in element.items() if key not in {"id", "rect", "frame_index", "children"}}
+    if "attributes" in element:
+        payload["attributes"] = {key: value for key, value in element["attributes"].items() if key != SKYVERN_ID_ATTR}
+    return payload
+
+
+def build_element_hashes(
+    elements: list[dict],
+    payload_cache: dict[str, tuple[dict, str]] | None = None,
+) -> dict[str, str]:
+    """
+    Merkle-style hashing: the hash of an element is computed from the digest of its own content and the hashes of its
+    children, so every element is serialized only once instead of once per ancestor.
+    payload_cache: element id -> (content, digest) from the previous scrape. The digest is reused when the content of the
+    element is unchanged, and the cache is updated with the current elements.
+    :return: A map of element ID to element hash.
+    """
+    node_hashes: dict[int, str] = {}
+    new_payload_cache: dict[str, tuple[dict, str]] = {}
+
+    def hash_node(element: dict) -> str:
+        # children could be shared between the elements, hash them only once
+        if (element_hash := node_hashes.get(id(element))) is not None:
+            return element_hash
+
+        element_id = element.get("id", "")
+        payload = _element_hash_payload(element)
+        cached = payload_cache.get(element_id) if payload_cache is not None else None
+        if cached is not None and cached[0] == payload:
+            payload_digest = cached[1]
+        else:
+            # Sort the keys to ensure consistent ordering
+            payload_digest = calculate_sha256(json.dumps(payload, sort_keys=True))
+        if payload_cache is not None:
+            new_payload_cache[element_id] = (payload, payload_digest)
+
+        children_hashes = "".join(hash_node(child) for child in element.get("children", []))
+        element_hash = ELEMENT_HASH_VERSION_PREFIX + calculate_sha256(payload_digest + children_hashes)
+        node_hashes[id(element)] = element_hash
+        return element_hash
+
+    id_to_element_hash = {element.get("id", ""): hash_node(element) for element in elements}
+
+    if payload_cache is not None:
+        payload_cache.clear()
+        payload_cache.update(new_payload_cache)
+
+    return id_to_element_hash
+
+
 def build_element_dict(
     elements: list[dict],
+    hash_cache: dict[str, tuple[dict, str]] | None = None,
 ) -> tuple[dict[str, str], dict[str, dict], dict[str, str], dict[str, str], dict[str, list[str]]]:
+    """
+    hash_cache: the payload cache passed to build_element_hashes
+    """
     id_to_css_dict: dict[str, str] = {}
     id_to_element_dict: dict[str, dict] = {}
     id_to_frame_dict: dict[str, str] = {}
-    id_to_element_hash: dict[str, str] = {}
     hash_to_element_ids: dict[str, list[str]] = {}
 
+    id_to_element_hash = build_element_hashes(elements, payload_cache=hash_cache)
     for element in elements:
         element_id: str = element.get("id", "")
         # get_interactable_element_tree marks each interactable element with a unique_id attribute
         id_to_css_dict[element_id] = f"[{SKYVERN_ID_ATTR}='{element_id}']"
         id_to_element_dict[element_id] = element
         id_to_frame_dict[element_id] = element["frame"]
-        element_hash = hash_element(element)
-        id_to_element_hash[element_id] = element_hash
-        hash_to_element_ids[element_hash] = hash_to_element_ids.get(element_hash, []) + [element_id]
+        hash_to_element_ids.setdefault(id_to_element_hash[element_id], []).append(element_id)
 
     return id_to_css_dict, id_to_element_dict, id_to_frame_dict, id_to_element_hash, hash_to_element_ids
 
@@ -239,9 +291,12 @@ class ScrapedPage(BaseModel):
     html: str
     extracted_text: str | None = None
     window_dimension: dict[str, int] | None = None
+    settle_timing: dict[str, Any] | None = None
+    frame_timings: list[dict[str, Any]] = []
     _browser_state: BrowserState = PrivateAttr()
     _clean_up_func: CleanupElementTreeFunc = PrivateAttr()
     _scrape_exclude: ScrapeExcludeFunc | None = PrivateAttr(default=None)
+    _legacy_hash_to_element_ids: dict[str, list[str]] | None = PrivateAttr(default=None)
 
     def __init__(self, **data: Any) -> None:
         missing_attrs = [attr for attr in ["_browser_state", "_clean_up_func"] if attr not in data]
@@ -259,6 +314,19 @@ class ScrapedPage(BaseModel):
         self._clean_up_func = clean_up_func
         self._scrape_exclude = scrape_exclude
 
+    def get_element_ids_by_hash(self, element_hash: str) -> list[str]:
+        if not is_legacy_element_hash(element_hash):
+            return self.hash_to_element_ids.get(element_hash, [])
+
+        # the action plans cached before the element hash was versioned store the legacy hashes,
+        # build the legacy hash map lazily so it's only paid when such a plan is retrieved
+        if self._legacy_hash_to_element_ids is None:
+            self._legacy_hash_to_element_ids = {}
+            for element in self.elements:
+                legacy_hash = hash_element(element)
+                self._legacy_hash_to_element_ids.setdefault(legacy_hash, []).append(element.get("id", ""))
+        return self._legacy_hash_to_element_ids.get(element_hash, [])
+
     def build_element_tree(
         self, fmt: ElementTreeFormat = ElementTreeFormat.HTML, html_need_skyvern_attrs: bool = True
     ) -> str:
@@ -283,17 +351,8 @@ class ScrapedPage(BaseModel):
         """
         Economy elements tree doesn't include secondary elements like SVG, etc
         """
-        if not self.economy_element_tree:
-            economy_elements = []
-            copied_element_tree_trimmed = copy.deepcopy(self.element_tree_trimmed)
-
-            # Process each root element
-            for root_element in copied_element_tree_trimmed:
-                processed_element = self._process_element_for_economy_tree(root_element)
-                if processed_element:
-                    economy_elements.append(processed_element)
-
-            self.economy_element_tree = economy_elements
+        if self.economy_element_tree is None:
+            self.economy_element_tree = build_economy_element_tree(self.element_tree_trimmed)
 
         final_element_tree = self.economy_element_tree[: int(len(self.economy_element_tree) * percent_to_keep)]
         self.last_used_element_tree = final_element_tree
@@ -308,25 +367,6 @@ class ScrapedPage(BaseModel):
 
         raise UnknownElementTreeFormat(fmt=fmt)
 
-    def _process_element_for_economy_tree(self, element: dict) -> dict | None:
-        """
-        Helper method to process an element for the economy tree using BFS.
-        Removes SVG elements and their children.
-        """
-        # Skip SVG elements entirely
-        if element.get("tagName", "").lower() == "svg":
-            return None
-
-        # Process children using BFS
-        if "children" in element:
-            new_children = []
-            for child in element["children"]:
-                processed_child = self._process_element_for_economy_tree(child)
-                if processed_child:
-                    new_children.append(processed_child)
-            element["children"] = new_children
-        return element
-
     async def refresh(self, draw_boxes: bool = True, scroll: bool = True) -> Self:
         refreshed_page = await scrape_website(
             browser_state=self._browser_state,
@@ -342,12 +382,16 @@ class ScrapedPage(BaseModel):
         self.id_to_frame_dict = refreshed_page.id_to_frame_dict
         self.id_to_element_hash = refreshed_page.id_to_element_hash
         self.hash_to_element_ids = refreshed_page.hash_to_element_ids
+        self._legacy_hash_to_element_ids = None
         self.element_tree = refreshed_page.element_tree
         self.element_tree_trimmed = refreshed_page.element_tree_trimmed
+        self.economy_element_tree = refreshed_page.economy_element_tree
         self.screenshots = refreshed_page.screenshots or self.screenshots
         self.html = refreshed_page.html
         self.extracted_text = refreshed_page.extracted_text
         self.url = refreshed_page.url
+        self.settle_timing = refreshed_page.settle_timing
+        self.frame_timings = refreshed_page.frame_timings
         return self
 
     async def generate_scraped_page(
@@ -477,6 +521,32 @@ async def get_frame_text(iframe: Frame) -> str:
     return text
 
 
+async def wait_for_page_settled(page: Page, url: str) -> dict[str, Any] | None:
+    """
+    Wait before scraping the page. Fall back to the fixed 3-second delay if the settle detection is disabled or fails.
+    :return: The settle timings, None if the fixed delay is used.
+    """
+    if not settings.ENABLE_PAGE_SETTLE_DETECTION:
+        LOG.info("Waiting for 3 seconds before scraping the website.")
+        await asyncio.sleep(3)
+        return None
+
+    try:
+        skyvern_frame = await SkyvernFrame.create_instance(frame=page)
+        settle_timing = await skyvern_frame.wait_for_page_settled()
+    except Exception:
+        LOG.warning(
+            "Failed to detect the page settle, waiting for 3 seconds before scraping the website.",
+            url=url,
+            exc_info=True,
+        )
+        await asyncio.sleep(3)
+        return None
+
+    LOG.info("Page settle detection finished before scraping the website.", url=url, **settle_timing)
+    return settle_timing
+
+
 async def scrape_web_unsafe(
     browser_state: BrowserState,
     url: str,
@@ -507,21 +577,35 @@ async def scrape_web_unsafe(
     # This also solves the issue where we can't scroll due to a popup.(e.g. geico first popup on the homepage after
     # clicking start my quote)
 
-    LOG.info("Waiting for 3 seconds before scraping the website.")
-    await asyncio.sleep(3)
+    settle_timing = await wait_for_page_settled(page, url)
 
-    elements, element_tree = await get_interactable_element_tree(page, scrape_exclude)
+    elements, element_tree, frame_timings = await get_interactable_element_tree(page, scrape_exclude)
+    if frame_timings:
+        LOG.info(
+            "Scraped the child frames",
+            url=url,
+            num_frames=len(frame_timings),
+            total_frame_duration_ms=sum(timing["duration_ms"] for timing in frame_timings),
+        )
+    # the elements are shared with the element tree, so the cleanup has to work on a copy
     element_tree = await cleanup_element_tree(page, url, copy.deepcopy(element_tree))
-    element_tree_trimmed = trim_element_tree(copy.deepcopy(element_tree))
+    # the economy tree is only built if build_economy_elements_tree is called
+    element_tree_trimmed, economy_element_tree = build_trimmed_element_trees(element_tree, need_economy_tree=False)
 
     screenshots = []
     if take_screenshots:
-        element_tree_trimmed_html_str = "".join(
+        element_tree_trimmed_html_parts = [
             json_to_html(element, need_skyvern_attrs=False) for element in element_tree_trimmed
-        )
-        token_count = count_tokens(element_tree_trimmed_html_str)
-        if token_count > DEFAULT_MAX_TOKENS:
-            max_screenshot_number = min(max_screenshot_number, 1)
+        ]
+        if may_exceed_token_limit("".join(element_tree_trimmed_html_parts), DEFAULT_MAX_TOKENS):
+            context = skyvern_context.current()
+            token_count_cache: MutableMapping[str, int] = context.element_token_count_cache if context else {}
+            # the element tree is sent to the main llm, so its tokens are counted with the encoding of that model
+            token_count = count_tokens_of_parts(
+                element_tree_trimmed_html_parts, token_count_cache, llm_key=settings.LLM_KEY
+            )
+            if token_count > DEFAULT_MAX_TOKENS:
+                max_screenshot_number = min(max_screenshot_number, 1)
 
         screenshots = await SkyvernFrame.take_split_screenshots(
             page=page,
@@ -530,8 +614,9 @@ async def scrape_web_unsafe(
             max_number=max_screenshot_number,
             scroll=scroll,
         )
+    hash_cache = skyvern_context.ensure_context().element_hash_cache if settings.ENABLE_DIFF_SCRAPING else None
     id_to_css_dict, id_to_element_dict, id_to_frame_dict, id_to_element_hash, hash_to_element_ids = build_element_dict(
-        elements
+        elements, hash_cache=hash_cache
     )
 
     # if there are no elements, fail the scraping
@@ -562,11 +647,14 @@ async def scrape_web_unsafe(
         hash_to_element_ids=hash_to_element_ids,
         element_tree=element_tree,
         element_tree_trimmed=element_tree_trimmed,
+        economy_element_tree=economy_element_tree,
         screenshots=screenshots,
         url=page.url,
         html=html,
         extracted_text=text_content,
         window_dimension=window_dimension,
+        settle_timing=settle_timing,
+        frame_timings=frame_timings,
         _browser_state=browser_state,
         _clean_up_func=cleanup_element_tree,
         _scrape_exclude=scrape_exclude,
@@ -598,56 +686,49 @@ async def filter_frames(frames: list[Frame], scrape_exclude: ScrapeExcludeFunc |
     return filtered_frames
 
 
-async def add_frame_interactable_elements(
-    frame: Frame,
-    frame_index: int,
-    elements: list[dict],
-    element_tree: list[dict],
-) -> tuple[list[dict], list[dict]]:
+async def get_frame_element_tree(frame: Frame, frame_index: int) -> tuple[str | None, list[dict], list[dict]] | None:
     """
-    Add the interactable element of the frame to the elements and element_tree.
+    Build the element tree of the child frame.
+    :return: Tuple containing the unique_id of the frame element, the frame elements and the frame element tree.
+        None if the frame is invisible or the frame element is not accessible.
     """
     try:
         frame_element = await frame.frame_element()
         # it will get stuck when we `frame.evaluate()` on an invisible iframe
         if not await frame_element.is_visible():
-            return elements, element_tree
+            return None
         unique_id = await frame_element.get_attribute("unique_id")
     except Exception:
         LOG.warning(
             "Unable to get unique_id from frame_element",
             exc_info=True,
         )
-        return elements, element_tree
+        return None
 
-    frame_js_script = f"async () => await buildTreeFromBody('{unique_id}', {frame_index})"
+    use_diff = "true" if settings.ENABLE_DIFF_SCRAPING else "false"
+    frame_js_script = f"async () => await buildTreeFromBody('{unique_id}', {frame_index}, {use_diff})"
 
-    await SkyvernFrame.evaluate(frame=frame, expression=JS_FUNCTION_DEFS)
+    await SkyvernFrame.inject_js_function_defs(frame=frame)
     frame_elements, frame_element_tree = await SkyvernFrame.evaluate(
         frame=frame, expression=frame_js_script, timeout_ms=BUILDING_ELEMENT_TREE_TIMEOUT_MS
     )
-
-    for element in elements:
-        if element["id"] == unique_id:
-            element["children"] = frame_element_tree
-
-    elements = elements + frame_elements
-
-    return elements, element_tree
+    return unique_id, frame_elements, frame_element_tree
 
 
 async def get_interactable_element_tree(
     page: Page,
     scrape_exclude: ScrapeExcludeFunc | None = None,
-) -> tuple[list[dict], list[dict]]:
+) -> tuple[list[dict], list[dict], list[dict[str, Any]]]:
     """
     Get the element tree of the page, including all the elements that are interactable.
+    The child frames are scraped concurrently, up to MAX_CONCURRENT_FRAME_SCRAPES at a time.
     :param page: Page instance to get the element tree from.
-    :return: Tuple containing the element tree and a map of element IDs to elements.
+    :return: Tuple containing the elements, the element tree and the scraping timing of each child frame.
     """
-    await SkyvernFrame.evaluate(frame=page, expression=JS_FUNCTION_DEFS)
+    await SkyvernFrame.inject_js_function_defs(frame=page)
     # main page index is 0
-    main_frame_js_script = "async () => await buildTreeFromBody('main.frame', 0)"
+    use_diff = "true" if settings.ENABLE_DIFF_SCRAPING else "false"
+    main_frame_js_script = f"async () => await buildTreeFromBody('main.frame', 0, {use_diff})"
     elements, element_tree = await SkyvernFrame.evaluate(
         frame=page, expression=main_frame_js_script, timeout_ms=BUILDING_ELEMENT_TREE_TIMEOUT_MS
     )
@@ -662,16 +743,58 @@ async def get_interactable_element_tree(
             frame_index = len(context.frame_index_map) + 1
             context.frame_index_map[frame] = frame_index
 
-    for frame in frames:
+    semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_FRAME_SCRAPES)
+    frame_tasks: dict[Frame, asyncio.Task] = {}
+
+    async def scrape_frame(frame: Frame) -> tuple[tuple[str | None, list[dict], list[dict]] | None, dict[str, Any]]:
+        # the frame element gets its unique_id when the parent frame is scraped, so wait for the parent frame first.
+        # acquire the semaphore after that, otherwise the waiting children could starve their parents
+        parent_task = frame_tasks.get(frame.parent_frame) if frame.parent_frame else None
+        if parent_task is not None:
+            await asyncio.wait([parent_task])
+
         frame_index = context.frame_index_map[frame]
-        elements, element_tree = await add_frame_interactable_elements(
-            frame,
-            frame_index,
-            elements,
-            element_tree,
-        )
+        async with semaphore:
+            start_time = time.perf_counter()
+            result = await get_frame_element_tree(frame, frame_index)
+            duration_ms = int((time.perf_counter() - start_time) * 1000)
+
+        timing = {
+            "frame_index": frame_index,
+            "url": frame.url,
+            "skipped": result is None,
+            "num_elements": len(result[1]) if result else 0,
+            "duration_ms": duration_ms,
+        }
+        return result, timing
+
+    # frames are in BFS order, so the parent frame task is always created before its children
+    for frame in frames:
+        frame_tasks[frame] = asyncio.create_task(scrape_frame(frame))
 
-    return elements, element_tree
+    try:
+        frame_results = await asyncio.gather(*frame_tasks.values())
+    except Exception:
+        for task in frame_tasks.values():
+            task.cancel()
+        raise
+
+    # attach the frame trees in BFS order, so the iframe element has been added before its content
+    id_to_element = {element["id"]: element for element in elements}
+    frame_timings: list[dict[str, Any]] = []
+    for result, timing in frame_results:
+        frame_timings.append(timing)
+        if result is None:
+            continue
+
+        unique_id, frame_elements, frame_element_tree = result
+        if unique_id is not None and unique_id in id_to_element:
+            id_to_element[unique_id]["children"] = frame_element_tree
+
+        elements.extend(frame_elements)
+        id_to_element.update((element["id"], element) for element in frame_elements)
+
+    return elements, element_tree, frame_timings
 
 
 class IncrementalScrapePage:
@@ -716,7 +839,7 @@ class IncrementalScrapePage:
         self.elements = incremental_elements
 
         incremental_tree = await cleanup_element_tree(frame, frame.url, copy.deepcopy(incremental_tree))
-        trimmed_element_tree = trim_element_tree(copy.deepcopy(incremental_tree))
+        trimmed_element_tree, _ = build_trimmed_element_trees(incremental_tree, need_economy_tree=False)
 
         self.element_tree = incremental_tree
         self.element_tree_trimmed = trimmed_element_tree
@@ -873,6 +996,102 @@ def trim_element_tree(elements: list[dict]) -> list[dict]:
     return elements
 
 
+def _trimmed_element_copy(element: dict, trimmed_children: list[dict]) -> dict:
+    """
+    Same as trim_element, but builds a trimmed copy (in the same key order) instead of mutating the element.
+    The trimmed children are built by the caller.
+    """
+    trimmed: dict = {}
+    for key, value in element.items():
+        if key in {"frame", "frame_index", "keepAllAttr"}:
+            continue
+
+        if key == "children":
+            if trimmed_children:
+                trimmed[key] = trimmed_children
+            continue
+
+        if key == "id" and not _should_keep_unique_id(element):
+            continue
+
+        if key == "attributes":
+            attributes = _trimmed_base64_data(value)
+            if attributes and not element.get("keepAllAttr", False):
+                attributes = _trimmed_attributes(attributes)
+            if not attributes:
+                continue
+            if "name" in attributes and len(attributes["name"]) > 500:
+                attributes["name"] = attributes["name"][:500]
+            value = attributes
+
+        if key == "text" and not str(value).strip():
+            continue
+
+        if key in {"beforePseudoText", "afterPseudoText"} and not value:
+            continue
+
+        trimmed[key] = value
+
+    return trimmed
+
+
+def build_trimmed_element_trees(
+    element_tree: list[dict], need_economy_tree: bool = True
+) -> tuple[list[dict], list[dict] | None]:
+    """
+    Build the trimmed element tree and the economy element tree in one traversal, without mutating the element tree.
+    The economy tree shares the trimmed nodes whose subtrees have nothing to drop, so both trees must be treated as
+    read-only.
+    :return: Tuple containing the trimmed element tree and the economy element tree (None if not needed).
+    """
+
+    def process(element: dict) -> tuple[dict, dict | None]:
+        processed_children = [process(child) for child in element.get("children", [])]
+        trimmed = _trimmed_element_copy(element, [trimmed_child for trimmed_child, _ in processed_children])
+
+        if not need_economy_tree or trimmed.get("tagName", "").lower() == "svg":
+            return trimmed, None
+        if not processed_children:
+            return trimmed, trimmed
+
+        economy_children = [economy_child for _, economy_child in processed_children if economy_child is not None]
+        if len(economy_children) == len(processed_children) and all(
+            trimmed_child is economy_child for trimmed_child, economy_child in processed_children
+        ):
+            return trimmed, trimmed
+        return trimmed, {**trimmed, "children": economy_children}
+
+    element_tree_trimmed: list[dict] = []
+    economy_element_tree: list[dict] = []
+    for root in element_tree:
+        trimmed_root, economy_root = process(root)
+        element_tree_trimmed.append(trimmed_root)
+        if economy_root is not None:
+            economy_element_tree.append(economy_root)
+
+    return element_tree_trimmed, economy_element_tree if need_economy_tree else None
+
+
+def build_economy_element_tree(element_tree_trimmed: list[dict]) -> list[dict]:
+    """
+    Economy elements tree doesn't include secondary elements like SVG, etc.
+    Nodes without any SVG in their subtree are shared with the trimmed tree instead of being copied.
+    """
+
+    def process(element: dict) -> dict | None:
+        if element.get("tagName", "").lower() == "svg":
+            return None
+        if "children" not in element:
+            return element
+        children = element["children"]
+        new_children = [processed for child in children if (processed := process(child)) is not None]
+        if len(new_children) == len(children) and all(new is old for new, old in zip(new_children, children)):
+            return element
+        return {**element, "children": new_children}
+
+    return [processed for root in element_tree_trimmed if (processed := process(root)) is not None]
+
+
 def _trimmed_base64_data(attributes: dict) -> dict:
     new_attributes: dict = {}
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import time
+from enum import StrEnum
 from typing import Any, Dict, List
 
 import structlog
@@ -11,10 +12,25 @@ from playwright.async_api import ElementHandle, Frame, Page
 from skyvern.config import settings
 from skyvern.constants import BUILDING_ELEMENT_TREE_TIMEOUT_MS, PAGE_CONTENT_TIMEOUT, SKYVERN_DIR
 from skyvern.exceptions import FailedToTakeScreenshot
+from skyvern.forge.sdk.api.crypto import calculate_sha256
+from skyvern.utils.image_resizer import Resolution, split_screenshot_into_tiles
 
 LOG = structlog.get_logger()
 
 
+# keep it the same as the overlap of scrollToNextPage in domUtils.js
+SCROLLING_SCREENSHOT_OVERLAP_PX = 200
+
+
+class ScreenshotMode(StrEnum):
+    SCROLLING = "scrolling"
+    FULL_PAGE_TILED = "full_page_tiled"
+
+
+def get_screenshot_mode() -> ScreenshotMode:
+    return ScreenshotMode(settings.SCREENSHOT_MODE)
+
+
 def load_js_script() -> str:
     # TODO: Handle file location better. This is a hacky way to find the file location.
     path = f"{SKYVERN_DIR}/webeye/scraper/domUtils.js"
@@ -28,7 +44,34 @@ def load_js_script() -> str:
         raise e
 
 
-JS_FUNCTION_DEFS = load_js_script()
+def minify_js_script(script: str) -> str:
+    """
+    Drop the comments, blank lines and indentation of the script.
+    Line breaks are kept so the automatic semicolon insertion keeps working, and it relies on the script not having
+    any multi-line string literal.
+    """
+    lines: list[str] = []
+    in_block_comment = False
+    for line in script.splitlines():
+        stripped = line.strip()
+        if in_block_comment:
+            in_block_comment = not stripped.endswith("*/")
+            continue
+        if stripped.startswith("/*"):
+            in_block_comment = not stripped.endswith("*/")
+            continue
+        if not stripped or stripped.startswith("//"):
+            continue
+        lines.append(stripped)
+    return "\n".join(lines)
+
+
+JS_FUNCTION_DEFS_VERSION = calculate_sha256(load_js_script())[:16]
+# the version is stamped into the window after the injection, so we don't need to re-send the whole script every time
+JS_FUNCTION_DEFS = (
+    minify_js_script(load_js_script()) + f'\nwindow.__skyvernDomUtilsVersion = "{JS_FUNCTION_DEFS_VERSION}";'
+)
+JS_FUNCTION_DEFS_INJECTED_CHECK = f'() => window.__skyvernDomUtilsVersion === "{JS_FUNCTION_DEFS_VERSION}"'
 
 
 async def _current_viewpoint_screenshot_helper(
@@ -72,6 +115,42 @@ async def _current_viewpoint_screenshot_helper(
         raise FailedToTakeScreenshot(error_message=str(e)) from e
 
 
+async def _full_page_tiled_screenshots_helper(
+    page: Page,
+    url: str | None = None,
+    draw_boxes: bool = False,
+    max_number: int = settings.MAX_NUM_SCREENSHOTS,
+) -> List[bytes]:
+    """
+    Take one full page screenshot and slice it into viewport-sized tiles, instead of scrolling page by page.
+    The bounding boxes are drawn only once since they're positioned relative to the document.
+    The content lazy loaded on scroll isn't triggered, and the sticky elements only show up in the first tile.
+    """
+    skyvern_page = await SkyvernFrame.create_instance(frame=page)
+    # page is the main frame and the index must be 0
+    assert isinstance(skyvern_page.frame, Page)
+    frame = "main.frame"
+    frame_index = 0
+
+    await skyvern_page.scroll_to_top(draw_boxes=draw_boxes, frame=frame, frame_index=frame_index)
+    try:
+        screenshot = await _current_viewpoint_screenshot_helper(page=skyvern_page.frame, full_page=True)
+    finally:
+        if draw_boxes:
+            await skyvern_page.remove_bounding_boxes()
+
+    viewport = page.viewport_size or {"width": settings.BROWSER_WIDTH, "height": settings.BROWSER_HEIGHT}
+    screenshots = await asyncio.to_thread(
+        split_screenshot_into_tiles,
+        screenshot,
+        Resolution(width=viewport["width"], height=viewport["height"]),
+        SCROLLING_SCREENSHOT_OVERLAP_PX,
+        max_number,
+    )
+    LOG.debug("Sliced the full page screenshot", url=url, num_screenshots=len(screenshots))
+    return screenshots
+
+
 async def _scrolling_screenshots_helper(
     page: Page,
     url: str | None = None,
@@ -161,16 +240,35 @@ class SkyvernFrame:
         draw_boxes: bool = False,
         max_number: int = settings.MAX_NUM_SCREENSHOTS,
         scroll: bool = True,
+        mode: ScreenshotMode | None = None,
     ) -> List[bytes]:
         if not scroll:
             return [await _current_viewpoint_screenshot_helper(page=page)]
 
+        if mode is None:
+            mode = get_screenshot_mode()
+        if mode == ScreenshotMode.FULL_PAGE_TILED:
+            return await _full_page_tiled_screenshots_helper(
+                page=page, url=url, max_number=max_number, draw_boxes=draw_boxes
+            )
         return await _scrolling_screenshots_helper(page=page, url=url, max_number=max_number, draw_boxes=draw_boxes)
 
+    @staticmethod
+    async def inject_js_function_defs(frame: Page | Frame) -> None:
+        """
+        Inject domUtils.js into the frame. Skip it if the same version has already been injected into the current
+        document, unless the injection cache is disabled.
+        """
+        if settings.ENABLE_JS_INJECTION_CACHE and await SkyvernFrame.evaluate(
+            frame=frame, expression=JS_FUNCTION_DEFS_INJECTED_CHECK
+        ):
+            return
+        await SkyvernFrame.evaluate(frame=frame, expression=JS_FUNCTION_DEFS)
+
     @classmethod
     async def create_instance(cls, frame: Page | Frame) -> SkyvernFrame:
         instance = cls(frame=frame)
-        await cls.evaluate(frame=instance.frame, expression=JS_FUNCTION_DEFS)
+        await cls.inject_js_function_defs(frame=instance.frame)
         return instance
 
     def __init__(self, frame: Page | Frame) -> None:
@@ -183,6 +281,22 @@ class SkyvernFrame:
         async with asyncio.timeout(timeout):
             return await self.frame.content()
 
+    async def is_page_changed_since_last_capture(self) -> bool:
+        """
+        Whether the DOM or the url changed since the last call, and mark the current page as captured.
+        The first call on a document always returns True.
+        """
+        js_script = "() => isPageChangedSinceLastCapture()"
+        return await self.evaluate(frame=self.frame, expression=js_script)
+
+    async def fill_inputs_in_batch(self, elements: list[ElementHandle], values: list[str]) -> None:
+        js_script = "([elements, values]) => fillInputsInBatch(elements, values)"
+        await self.evaluate(frame=self.frame, expression=js_script, arg=[elements, values])
+
+    async def get_input_values(self, elements: list[ElementHandle]) -> list[str]:
+        js_script = "(elements) => getInputValues(elements)"
+        return await self.evaluate(frame=self.frame, expression=js_script, arg=elements)
+
     async def get_scroll_x_y(self) -> tuple[int, int]:
         js_script = "() => getScrollXY()"
         return await self.evaluate(frame=self.frame, expression=js_script)
@@ -268,6 +382,24 @@ class SkyvernFrame:
             arg=[frame, frame_index],
         )
 
+    async def wait_for_page_settled(
+        self,
+        quiet_ms: int = settings.PAGE_SETTLE_QUIET_MS,
+        max_wait_ms: int = settings.PAGE_SETTLE_MAX_WAIT_MS,
+    ) -> Dict:
+        """
+        Wait until the page has no pending request, DOM mutation or running animation for quiet_ms.
+        :return: The settle timings, including whether the page settled before max_wait_ms.
+        """
+        js_script = "async ([quiet_ms, max_wait_ms]) => await waitForPageSettled(quiet_ms, max_wait_ms)"
+        return await self.evaluate(
+            frame=self.frame,
+            expression=js_script,
+            # give the browser some time to return the result after max_wait_ms
+            timeout_ms=max_wait_ms + settings.BROWSER_ACTION_TIMEOUT_MS,
+            arg=[quiet_ms, max_wait_ms],
+        )
+
     async def is_window_scrollable(self) -> bool:
         js_script = "() => isWindowScrollable()"
         return await self.evaluate(frame=self.frame, expression=js_script)